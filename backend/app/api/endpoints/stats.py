@@ -0,0 +1,37 @@
+# backend/app/api/endpoints/stats.py
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+import logging
+from app.database import get_db
+from app.config import settings
+from app.utils.rtf_stats import get_all_stats, get_model_stats, queue_backlog
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/rtf")
+async def get_rtf_stats(db: Session = Depends(get_db)):
+    """Measured real-time factors per model plus the current backlog"""
+    try:
+        backlog = queue_backlog(db)
+        workers = max(1, settings.CELERY_WORKER_CONCURRENCY)
+        return {
+            "models": get_all_stats(),
+            "queue": {
+                "jobs": backlog["jobs"],
+                "backlog_seconds_p50": round(backlog["seconds_p50"], 1),
+                "backlog_seconds_p95": round(backlog["seconds_p95"], 1),
+                "workers": workers,
+                "drain_seconds_p50": round(backlog["seconds_p50"] / workers, 1),
+            }
+        }
+    except Exception as e:
+        logger.error(f"Error reading RTF stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error reading stats: {str(e)}")
+
+@router.get("/rtf/{model_size}")
+async def get_model_rtf_stats(model_size: str):
+    """Measured real-time factor for a single model"""
+    if model_size not in settings.WHISPER_MODELS:
+        raise HTTPException(status_code=404, detail="Unknown model")
+    return get_model_stats(model_size, use_cache=False)
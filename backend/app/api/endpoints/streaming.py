@@ -0,0 +1,127 @@
+# backend/app/api/endpoints/streaming.py
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Optional
+from app.config import settings
+from app.utils.metrics import STREAM_DECODE_LATENCY, STREAM_SESSIONS, STREAM_SESSIONS_REJECTED
+
+# The streaming helpers pull in numpy and the engine registry; sessions import them on connect
+if TYPE_CHECKING:
+    from app.utils.streaming import StreamingTranscriber
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+ENCODINGS = ("pcm_s16le", "opus")
+
+# Sessions open in this worker process (the event loop is single-threaded)
+_active_sessions = 0
+
+
+def _control_type(text: str) -> Optional[str]:
+    """The "type" of a JSON control message, or None if it isn't one"""
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return None
+    return message.get("type") if isinstance(message, dict) else None
+
+
+async def _run_feed(transcriber: "StreamingTranscriber", samples) -> list:
+    started = time.perf_counter()
+    events = await run_in_threadpool(transcriber.feed, samples)
+    for event in events:
+        STREAM_DECODE_LATENCY.labels(kind=event["type"]).observe(time.perf_counter() - started)
+    return events
+
+
+@router.websocket("/stream")
+async def stream_transcription(
+    websocket: WebSocket,
+    model_size: str = "base",
+    language: str = "en",
+    encoding: str = "pcm_s16le"
+):
+    """Live transcription: binary audio frames in, partial/final JSON events out.
+
+    Send 16 kHz mono little-endian PCM (``encoding=pcm_s16le``) or an Ogg/WebM
+    Opus stream (``encoding=opus``) as binary messages, then ``{"type": "stop"}``.
+    """
+    global _active_sessions
+    await websocket.accept()
+
+    if model_size not in settings.WHISPER_MODELS or encoding not in ENCODINGS \
+            or not settings.validate_language_code(language):
+        await websocket.send_json({"type": "error", "detail": "Invalid model_size, language or encoding"})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if _active_sessions >= settings.STREAM_MAX_SESSIONS:
+        STREAM_SESSIONS_REJECTED.inc()
+        await websocket.send_json({"type": "error", "detail": "Too many streaming sessions, retry later"})
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    _active_sessions += 1
+    STREAM_SESSIONS.inc()
+    decoder: Optional["FFmpegStreamDecoder"] = None
+    try:
+        # The engine registry caches one model per process, shared by all sessions
+        from app.engines import get_engine
+        from app.utils.streaming import FFmpegStreamDecoder, StreamingTranscriber, pcm16_to_float
+        from app.utils.transcription import normalize_language
+        engine = await run_in_threadpool(get_engine, model_size)
+        transcriber = StreamingTranscriber(engine, language=normalize_language(language))
+        if encoding == "opus":
+            decoder = FFmpegStreamDecoder()
+            await decoder.start()
+        await websocket.send_json({"type": "ready", "model_size": model_size, "sample_rate": settings.SAMPLE_RATE})
+
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive(), timeout=settings.STREAM_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                await websocket.send_json({"type": "error", "detail": "Idle timeout"})
+                break
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if message.get("bytes"):
+                pcm = await decoder.write(message["bytes"]) if decoder else message["bytes"]
+                if pcm:
+                    for event in await _run_feed(transcriber, pcm16_to_float(pcm)):
+                        await websocket.send_json(event)
+                if transcriber.offset + transcriber.buffered_seconds > settings.STREAM_MAX_DURATION:
+                    await websocket.send_json({"type": "error", "detail": "Maximum stream duration reached"})
+                    break
+            elif message.get("text"):
+                if _control_type(message["text"]) == "stop":
+                    break
+                await websocket.send_json({"type": "error", "detail": "Unknown control message"})
+
+        if decoder:
+            tail = await decoder.close()
+            if tail:
+                for event in await _run_feed(transcriber, pcm16_to_float(tail)):
+                    await websocket.send_json(event)
+        for event in await run_in_threadpool(transcriber.flush):
+            await websocket.send_json(event)
+        await websocket.send_json({"type": "end", "duration": round(transcriber.offset, 3)})
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("Streaming client disconnected")
+    except Exception as e:
+        logger.error(f"Streaming transcription failed: {str(e)}")
+        try:
+            await websocket.send_json({"type": "error", "detail": f"Streaming failed: {str(e)}"})
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        except Exception:
+            pass
+    finally:
+        if decoder:
+            await decoder.close()
+        _active_sessions -= 1
+        STREAM_SESSIONS.dec()
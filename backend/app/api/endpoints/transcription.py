@@ -1,19 +1,29 @@
 # backend/app/api/endpoints/transcription.py
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Header, Request, status
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
-import shutil
-from pathlib import Path
+import mimetypes
 from datetime import datetime
 import logging
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, List, Tuple, Optional
 import os
+from pathlib import PurePosixPath
+from urllib.parse import quote
+from starlette.concurrency import run_in_threadpool
 from tenacity import retry, stop_after_attempt, wait_exponential
-from app.models import Transcription
+from app.models import Transcription, TranscriptionText
 from app.database import get_db
-from app.celery.tasks import transcribe_audio_task
 from app.config import settings
+from app.utils.transcript_text import CONTENT_ENCODINGS, iter_decompressed, load_text
+from app.utils.metrics import UPLOAD_BYTES
+from app.core.admission import client_identifier
+
+# Imported in the handlers that use them: numpy, celery, ffmpeg helpers and the
+# storage backends would otherwise load in every API worker before it can serve
+if TYPE_CHECKING:
+    from app.utils.ingest import IngestedMedia
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -40,9 +50,99 @@ async def validate_file_size(file: UploadFile) -> int:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
             detail="Error validating file size"
         )
+async def save_file(file: UploadFile, media_format: str) -> Tuple[str, "IngestedMedia"]:
+    """Ingest the upload (audio only) and store it under a new key, off the event loop"""
+    from app.core.tracing import span
+    from app.storage import get_storage, new_object_key
+    from app.utils.ingest import ingest_media, spool_upload
+
+    def _ingest():
+        file.file.seek(0)
+        spooled = spool_upload(file.file, media_format)
+        try:
+            with span("ingest", format=media_format):
+                media = ingest_media(spooled, media_format)
+        except Exception:
+            spooled.unlink(missing_ok=True)
+            raise
+        key = new_object_key(media.path.name)
+        try:
+            with span("storage.write", bytes=media.size):
+                get_storage().put_file(key, media.path)
+        finally:
+            media.path.unlink(missing_ok=True)
+        return key, media
+
+    return await run_in_threadpool(_ingest)
+
+async def discard_file(key: str) -> None:
+    """Best-effort removal of an upload whose job was never recorded"""
+    from app.storage import get_storage
+    try:
+        await run_in_threadpool(get_storage().delete, key)
+    except Exception as e:
+        logger.error(f"Failed to clean up file: {str(e)}")
+
+@router.get("/search")
+async def search(
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """Full-text search across completed transcripts"""
+    from app.utils.search import search_transcriptions, SearchUnavailableError
+    query = q.strip()
+    if not query:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must not be empty"
+        )
+    limit = max(1, min(limit, settings.SEARCH_MAX_RESULTS))
+    offset = max(0, offset)
+
+    try:
+        hits = search_transcriptions(db, query, limit=limit, offset=offset)
+        return {"query": query, "limit": limit, "offset": offset, "results": hits}
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching transcriptions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error searching transcriptions: {str(e)}")
+
+@router.get("/uploads/{name}")
+async def legacy_upload_url(name: str, db: Session = Depends(get_db)):
+    """Redirect an old /uploads/<file> link to the job's audio route.
+
+    Uploads used to be served straight from the uploads volume. The name is
+    matched exactly, on indexed columns: the key the upload was stored under
+    (kept in upload_key once archiving renames it), or a legacy absolute path.
+    """
+    if PurePosixPath(name).name != name:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    row = db.query(Transcription.id).filter(or_(
+        Transcription.upload_key == name,
+        Transcription.filename.in_([name, str(settings.UPLOAD_DIR / name)])
+    )).order_by(Transcription.id.desc()).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    return RedirectResponse(f"/transcription/{row.id}/audio", status_code=status.HTTP_301_MOVED_PERMANENTLY)
+
+def text_available(transcription: Transcription) -> bool:
+    """A final transcript, or a draft while the final pass is still running; a failed job's draft is stale"""
+    return transcription.status == "completed" or (
+        transcription.quality == "draft" and transcription.status != "failed"
+    )
+
 @router.get("/{transcription_id}")
-async def get_transcription_status(transcription_id: int, db: Session = Depends(get_db)):
-    """Get transcription status and result"""
+async def get_transcription_status(
+    transcription_id: int,
+    include_text: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Get transcription status with a preview of the result; the full text is at /{id}/text"""
+    from app.core.tracing import trace_id
+    from app.utils.rtf_stats import estimate_completion
     logger.info(f"Getting status for transcription ID: {transcription_id}")
     
     try:
@@ -56,43 +156,288 @@ async def get_transcription_status(transcription_id: int, db: Session = Depends(
         
         logger.info(f"Found transcription with status: {transcription.status}")
         
-        return {
+        has_text = text_available(transcription)
+        response = {
             "id": transcription.id,
             "status": transcription.status,
-            "text": transcription.text if transcription.status == "completed" else None,
+            "text_preview": transcription.text_preview if has_text else None,
+            "text_length": transcription.text_length if has_text else None,
+            "quality": transcription.quality,
+            "decoding_profile": transcription.decoding_profile,
+            "client_preprocessing": transcription.client_preprocessing,
+            "media_format": transcription.media_format,
+            "audio_codec": transcription.audio_codec,
+            "trace_id": trace_id(transcription.trace_context),
             "error": transcription.error if transcription.status == "failed" else None,
             "file_size": transcription.file_size,
             "original_filename": transcription.original_filename,
+            "audio_duration": transcription.audio_duration,
+            "processing_time": transcription.processing_time,
+            "stage_timings": transcription.stage_timings,
             "created_at": transcription.created_at,
             "completed_at": transcription.completed_at
         }
+        if include_text:
+            response["text"] = load_text(db, transcription.id) if has_text else None
+        if has_text and response["text_length"] is None:
+            # Written before text_preview existed
+            text = response.get("text") or load_text(db, transcription.id) or ""
+            response["text_preview"] = text[:settings.TEXT_PREVIEW_CHARS]
+            response["text_length"] = len(text)
+        if transcription.status in ("pending", "processing"):
+            response.update(estimate_completion(db, transcription))
+        return response
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error getting transcription status: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error checking status: {str(e)}")
+
+def accepts_encoding(header: Optional[str], encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows ``encoding`` (explicitly; ``*`` is ignored)"""
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() != encoding:
+            continue
+        quality = params.strip()
+        try:
+            return not quality.startswith("q=") or float(quality[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+@router.get("/{transcription_id}/text")
+async def get_transcription_text(
+    transcription_id: int,
+    accept_encoding: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Full transcript as UTF-8 text.
+
+    Sent exactly as stored, with Content-Encoding zstd or deflate, when the
+    client accepts it; streamed decompressed otherwise.
+    """
+    try:
+        transcription = db.query(Transcription).filter(Transcription.id == transcription_id).first()
+        if not transcription:
+            raise HTTPException(status_code=404, detail="Transcription not found")
+        if not text_available(transcription):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Transcription failed" if transcription.status == "failed" else "Transcript is not available yet"
+            )
+
+        media_type = "text/plain; charset=utf-8"
+        stored = db.query(TranscriptionText).filter(
+            TranscriptionText.transcription_id == transcription_id
+        ).first()
+        if stored is None:
+            # Written before transcription_texts existed
+            return Response(content=transcription.text or "", media_type=media_type)
+
+        headers = {"Vary": "Accept-Encoding"}
+        encoding = CONTENT_ENCODINGS.get(stored.codec)
+        if encoding and accepts_encoding(accept_encoding, encoding):
+            headers["Content-Encoding"] = encoding
+            return Response(content=stored.data, media_type=media_type, headers=headers)
+        return StreamingResponse(
+            iter_decompressed(stored.codec, stored.data),
+            media_type=media_type,
+            headers={**headers, "Content-Length": str(stored.raw_size)}
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reading transcript: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error reading transcript: {str(e)}")
+
+@router.get("/{transcription_id}/segments")
+async def get_transcription_segments(
+    transcription_id: int,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    include_text: bool = True,
+    db: Session = Depends(get_db)
+):
+    """Get timed segments, optionally restricted to a time range in seconds"""
+    from app.utils.segments import PackedSegments
+    if start is not None and end is not None and end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end must be greater than or equal to start"
+        )
+
+    try:
+        row = db.query(
+            Transcription.status,
+            Transcription.segments
+        ).filter(Transcription.id == transcription_id).first()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="Transcription not found")
+        if row[0] != "completed" or not row[1]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Segments are not available for this transcription"
+            )
+
+        packed = PackedSegments(row[1])
+        return {
+            "id": transcription_id,
+            "duration": packed.duration,
+            "total_segments": len(packed),
+            "segments": packed.slice(start, end, load_text(db, transcription_id) if include_text else None)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reading segments: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error reading segments: {str(e)}")
     
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive byte offsets of a single-range ``bytes=`` header; None serves the whole object"""
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None  # multipart ranges aren't supported; a full response is valid
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first:
+            start, end = max(0, size - int(last)), size - 1
+        else:
+            start, end = int(first), min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+@router.get("/{transcription_id}/audio")
+async def get_transcription_audio(
+    transcription_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: Session = Depends(get_db)
+):
+    """Stream the stored audio, honouring Range requests so players can seek"""
+    from app.storage import get_storage
+    try:
+        row = db.query(
+            Transcription.filename,
+            Transcription.original_filename,
+            Transcription.audio_purged_at
+        ).filter(Transcription.id == transcription_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Transcription not found")
+        if row.audio_purged_at is not None:
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail="Audio has been removed")
+
+        storage = get_storage()
+        size = await run_in_threadpool(storage.size, row.filename)
+        if size is None:
+            raise HTTPException(status_code=404, detail="Audio file not found")
+
+        byte_range = parse_range(range_header, size)
+        start, end = byte_range or (0, size - 1)
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Length": str(end - start + 1),
+            "Content-Disposition": f"inline; filename*=UTF-8''{quote(row.original_filename or row.filename)}",
+        }
+        if byte_range is not None:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return StreamingResponse(
+            storage.read_range(row.filename, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+            media_type=mimetypes.guess_type(row.filename)[0] or "application/octet-stream",
+            headers=headers
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error streaming audio: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error streaming audio: {str(e)}")
+
+def audio_duration_hint(
+    client_preprocessing: Optional[str],
+    media: Optional["IngestedMedia"]
+) -> Optional[float]:
+    """Duration known before decoding: probed at ingest, else from a preprocessed upload's byte rate.
+
+    The preprocessing is the client's claim, so its byte rate is only used
+    when the probed codec is the one that preprocessing produces; otherwise
+    the duration stays unknown and the worker probes and windows the file.
+    """
+    if media is None:
+        return None
+    if media.duration:
+        return media.duration
+    if client_preprocessing:
+        if media.audio_codec != settings.CLIENT_PREPROCESSING_CODECS.get(client_preprocessing):
+            logger.warning(
+                f"Ignoring declared preprocessing {client_preprocessing}: upload holds {media.audio_codec}"
+            )
+            return None
+        return media.size / settings.CLIENT_PREPROCESSING[client_preprocessing]
+    return None
+
 def create_transcription_record(
     db: Session,
     file_path: str,
     filename: str,
     file_size: int,
     model_size: str,
-    language: str
+    language: str,
+    owner: Optional[str] = None,
+    preview: bool = False,
+    decoding_profile: Optional[str] = None,
+    client_preprocessing: Optional[str] = None,
+    media: Optional["IngestedMedia"] = None
 ) -> Transcription:
-    """Create transcription record with retry logic"""
+    """Create the transcription record and its task messages in one transaction"""
+    from app.celery.client import PREVIEW_TASK, TRANSCRIBE_TASK
+    from app.core.tracing import current_carrier, span
+    from app.utils.fair_share import new_task_id
+    from app.utils.outbox import stage_task
     try:
         transcription = Transcription(
             filename=str(file_path),
+            upload_key=PurePosixPath(file_path).name,
             original_filename=filename,
             file_size=file_size,
             status="pending",
             model_size=model_size,
             language=language,
+            decoding_profile=decoding_profile,
+            client_preprocessing=client_preprocessing,
+            media_format=media.format if media else None,
+            audio_codec=media.audio_codec if media else None,
+            stored_size=media.size if media else None,
+            audio_duration=audio_duration_hint(client_preprocessing, media),
+            owner=owner,
+            task_id=new_task_id(),
+            trace_context=current_carrier(),
             created_at=datetime.utcnow()
         )
         db.add(transcription)
-        db.commit()
+        db.flush()  # assigns the id the messages refer to
+
+        # Draft first, so the preview workers pick it up while the final job waits
+        if preview:
+            transcription.preview_task_id = new_task_id()
+            stage_task(db, PREVIEW_TASK, [transcription.id], queue=settings.PREVIEW_QUEUE,
+                       task_id=transcription.preview_task_id, transcription_id=transcription.id)
+        # With fair share on, the dispatcher stages the job when it is this owner's turn
+        if not settings.FAIR_SHARE_ENABLED:
+            transcription.dispatched_at = datetime.utcnow()
+            stage_task(db, TRANSCRIBE_TASK, [transcription.id],
+                       task_id=transcription.task_id, transcription_id=transcription.id)
+        with span("db.commit", transcription_id=transcription.id):
+            db.commit()
         db.refresh(transcription)
         return transcription
     except SQLAlchemyError as e:
@@ -100,33 +445,24 @@ def create_transcription_record(
         logger.error(f"Database error during transcription creation: {str(e)}")
         raise
 
-def get_estimated_time(file_size: int, model_size: str) -> str:
-    """Calculate estimated processing time based on file size and model"""
-    # Basic estimation logic - can be refined based on actual performance data
-    base_time = file_size / (1024 * 1024 * 5)  # 5MB per minute as base rate
-    model_multipliers = {
-        "tiny": 0.5,
-        "base": 1,
-        "small": 1.5,
-        "medium": 2,
-        "large": 3
-    }
-    estimated_minutes = base_time * model_multipliers.get(model_size, 1)
-    
-    if estimated_minutes < 1:
-        return "less than a minute"
-    elif estimated_minutes < 5:
-        return "about 5 minutes"
-    else:
-        return f"about {int(estimated_minutes)} minutes"
 @router.post("/upload", status_code=status.HTTP_202_ACCEPTED)
 async def upload_file(
+    request: Request,
     file: UploadFile = File(...),
     language: str = "en",
     model_size: str = "base",
+    preview: bool = False,
+    profile: Optional[str] = None,
+    preprocessing: Optional[str] = None,
+    x_client_id: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """Upload and transcribe file"""
+    from app.core.tracing import trace_id
+    from app.utils.fair_share import request_owner
+    from app.utils.ingest import MediaRejected
+    from app.utils.media import MediaProbeError, sniff_format
+    from app.utils.rtf_stats import estimate_completion, format_eta
     logger.info(f"Received upload request for file: {file.filename}")
     file_path = None
     
@@ -139,6 +475,21 @@ async def upload_file(
                 detail=f"Invalid model size. Allowed models: {list(settings.WHISPER_MODELS.keys())}"
             )
         
+        # Validate decoding profile
+        profile = profile or settings.DECODING_PROFILE
+        if profile not in settings.DECODING_PROFILES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid decoding profile. Allowed profiles: {list(settings.DECODING_PROFILES.keys())}"
+            )
+        
+        # Validate client-side preprocessing
+        if preprocessing is not None and preprocessing not in settings.CLIENT_PREPROCESSING:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid preprocessing. Allowed values: {list(settings.CLIENT_PREPROCESSING.keys())}"
+            )
+        
         # Validate language
         logger.info(f"Validating language: {language}")
         if language not in settings.SUPPORTED_LANGUAGES:
@@ -152,24 +503,35 @@ async def upload_file(
         file_size = await validate_file_size(file)
         logger.info(f"File size validated: {file_size} bytes")
         
-        # Validate file type
+        # Validate file type from the content; the name is the client's claim
         logger.info("Validating file type")
-        if not file.filename.lower().endswith(tuple(settings.ALLOWED_EXTENSIONS)):
+        media_format = sniff_format(file.file.read(16))
+        file.file.seek(0)
+        if media_format not in settings.ALLOWED_CONTAINERS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File type not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
+                detail=f"File type not allowed. Allowed types: {sorted(settings.ALLOWED_CONTAINERS)}"
             )
         
-        # Create upload directory if it doesn't exist
-        upload_dir = Path(settings.UPLOAD_DIR)
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Upload directory created/verified: {upload_dir}")
-
-        # Changed this part to use the correct async function
         try:
-            # Save file using the async function defined above
-            file_path = await save_file(file, upload_dir)
-            logger.info(f"File saved successfully at: {file_path}")
+            # Keep only the audio and store it
+            file_path, media = await save_file(file, media_format)
+            logger.info(f"File saved successfully at: {file_path} ({media.format}, {media.audio_codec}, {media.action})")
+        except MediaRejected as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except MediaProbeError as e:
+            logger.error(f"Error reading media: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Could not read the audio in this file"
+            )
+        except FileNotFoundError as e:
+            # subprocess raises this when ffmpeg itself is missing
+            logger.error(f"Media tools unavailable: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Media processing is temporarily unavailable"
+            )
         except Exception as e:
             logger.error(f"Error saving file: {str(e)}")
             raise HTTPException(
@@ -181,17 +543,20 @@ async def upload_file(
             # Create transcription record
             transcription = create_transcription_record(
                 db=db,
-                file_path=str(file_path),
+                file_path=file_path,
                 filename=file.filename,
                 file_size=file_size,
                 model_size=model_size,
-                language=language
+                language=language,
+                owner=request_owner(x_client_id, client_identifier(request.scope)),
+                preview=preview and settings.PREVIEW_ENABLED and model_size != settings.PREVIEW_MODEL,
+                decoding_profile=profile,
+                client_preprocessing=preprocessing,
+                media=media
             )
+            UPLOAD_BYTES.labels(preprocessing=preprocessing or "none").inc(file_size)
             
-            # Start Celery task
-            task = transcribe_audio_task.delay(transcription.id)
-            
-            estimated_time = get_estimated_time(file_size, model_size)
+            estimate = estimate_completion(db, transcription)
             
             return JSONResponse(
                 content={
@@ -199,9 +564,17 @@ async def upload_file(
                     "status": "pending",
                     "message": "File uploaded successfully. Transcription started.",
                     "file_size": file_size,
-                    "estimated_time": estimated_time,
-                    "task_id": task.id,
+                    "estimated_time": format_eta(estimate["estimated_seconds"]),
+                    **estimate,
+                    "task_id": transcription.task_id,
+                    "preview_task_id": transcription.preview_task_id,
                     "model": model_size,
+                    "profile": profile,
+                    "preprocessing": preprocessing,
+                    "media_format": media.format,
+                    "audio_codec": media.audio_codec,
+                    "audio_duration": transcription.audio_duration,
+                    "trace_id": trace_id(transcription.trace_context),
                     "language": language
                 },
                 status_code=status.HTTP_202_ACCEPTED
@@ -210,11 +583,8 @@ async def upload_file(
         except Exception as e:
             logger.error(f"Error in database operation: {str(e)}")
             # Clean up file if database operation fails
-            if file_path and Path(file_path).exists():
-                try:
-                    Path(file_path).unlink()
-                except Exception as cleanup_error:
-                    logger.error(f"Failed to clean up file: {str(cleanup_error)}")
+            if file_path:
+                await discard_file(file_path)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Database error: {str(e)}"
@@ -224,11 +594,8 @@ async def upload_file(
         raise he
     except Exception as e:
         logger.error(f"Unexpected error during upload: {str(e)}")
-        if file_path and Path(file_path).exists():
-            try:
-                Path(file_path).unlink()
-            except Exception as cleanup_error:
-                logger.error(f"Failed to clean up file: {str(cleanup_error)}")
+        if file_path:
+            await discard_file(file_path)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error - Please try again later"
@@ -1,13 +1,17 @@
 # backend/app/celery/__init__.py
 from celery import Celery
+from ..config import settings
 
-celery_app = Celery('tasks')
+# Task modules (and the worker's signal handlers) are imported by the worker only;
+# the API enqueues by name through app.celery.client
+celery_app = Celery(
+    'tasks',
+    include=['app.celery.tasks', 'app.celery.monitoring', 'app.celery.preload']
+)
 celery_app.config_from_object('app.celery.celeryconfig')
 
-# Import tasks here
-from .tasks import *  # Add this line
-
 # Configure routes
 celery_app.conf.task_routes = {
-    'app.celery.tasks.*': {'queue': 'celery'}
+    'app.celery.tasks.*': {'queue': 'celery'},
+    'preview_transcription_task': {'queue': settings.PREVIEW_QUEUE}
 }
\ No newline at end of file
@@ -1,5 +1,6 @@
 # backend/app/celery/celeryconfig.py
 import os
+from datetime import timedelta
 
 # Broker and Backend URLs
 broker_url = os.environ.get('CELERY_BROKER_URL', 'redis://redis:6379/0')
@@ -39,4 +40,16 @@ worker_lost_wait = 60
 task_ignore_result = False
 task_track_started = True
 task_reject_on_worker_lost = True
-task_acks_late = True
\ No newline at end of file
+task_acks_late = True
+
+# Periodic tasks (run `celery -A app.celery.celery_app beat`)
+beat_schedule = {
+    'cleanup-uploads': {
+        'task': 'cleanup_uploads_task',
+        'schedule': timedelta(hours=int(os.environ.get('CLEANUP_INTERVAL_HOURS', '24'))),
+    },
+    'enforce-disk-quota': {
+        'task': 'enforce_disk_quota_task',
+        'schedule': timedelta(minutes=int(os.environ.get('DISK_CHECK_INTERVAL_MINUTES', '5'))),
+    },
+}
\ No newline at end of file
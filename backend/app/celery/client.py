@@ -0,0 +1,28 @@
+# backend/app/celery/client.py
+"""Send worker tasks by name.
+
+Only the outbox dispatcher publishes (the API stages messages through
+app.utils.outbox); neither imports app.celery.tasks, so they don't load the
+engines, media decoding or the worker's signal handlers. Names match
+``name=`` in app/celery/tasks.py.
+"""
+from typing import Any, Optional, Sequence
+
+from celery.result import AsyncResult
+
+from . import celery_app
+
+TRANSCRIBE_TASK = "transcribe_audio_task"
+PREVIEW_TASK = "preview_transcription_task"
+
+
+def send_task(name: str, args: Sequence[Any] = (), queue: Optional[str] = None, **options: Any) -> AsyncResult:
+    """Send a task by name; routing comes from celery_app.conf.task_routes unless queue is given"""
+    if celery_app.conf.task_always_eager:
+        # send_task ignores eager mode, so run in-process (benchmarks, local debugging)
+        celery_app.loader.import_default_modules()
+        return celery_app.tasks[name].apply(args=list(args), **options)
+    if queue is not None:
+        options["queue"] = queue
+    return celery_app.send_task(name, args=list(args), **options)
+
@@ -0,0 +1,58 @@
+# backend/app/celery/monitoring.py
+import logging
+import os
+from celery.signals import worker_init, worker_process_init, task_prerun, task_postrun, worker_process_shutdown
+from ..config import settings
+from ..core.tracing import init_tracing, shutdown_tracing
+from ..utils.autoscaler import report_worker_memory
+from ..utils.metrics import (
+    TASKS_IN_PROGRESS, build_registry, format_memory, mark_process_dead, update_process_rss
+)
+
+logger = logging.getLogger(__name__)
+
+
+@worker_init.connect
+def start_metrics_exporter(**kwargs):
+    """Serve metrics for the parent and all pool children from the parent process"""
+    if not settings.WORKER_METRICS_PORT:
+        return
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        logger.warning("PROMETHEUS_MULTIPROC_DIR not set; prefork children metrics will be missing")
+    from prometheus_client import start_http_server
+    try:
+        start_http_server(settings.WORKER_METRICS_PORT, registry=build_registry(include_queue_depth=True))
+        logger.info(f"Worker metrics exporter listening on :{settings.WORKER_METRICS_PORT}")
+    except OSError as e:
+        logger.error(f"Could not start worker metrics exporter: {str(e)}")
+
+
+@worker_process_init.connect
+def start_tracing(**kwargs):
+    """Per pool child: the span exporter's background thread doesn't survive fork()"""
+    init_tracing("worker")
+
+
+@task_prerun.connect
+def on_task_prerun(**kwargs):
+    TASKS_IN_PROGRESS.inc()
+
+
+@task_postrun.connect
+def on_task_postrun(sender=None, **kwargs):
+    TASKS_IN_PROGRESS.dec()
+    breakdown = update_process_rss("worker")
+    # Shared stays flat as concurrency grows when weights are preloaded; private is per-task activations
+    logger.info(f"Worker {os.getpid()} memory after task: {format_memory(breakdown)}")
+    hostname = getattr(getattr(sender, "request", None), "hostname", None)
+    if hostname:
+        try:
+            report_worker_memory(hostname, breakdown.get("private"))
+        except Exception as e:
+            logger.error(f"Error reporting worker memory: {str(e)}")
+
+
+@worker_process_shutdown.connect
+def on_worker_process_shutdown(pid=None, **kwargs):
+    mark_process_dead(pid)
+    shutdown_tracing()
@@ -0,0 +1,35 @@
+# backend/app/celery/preload.py
+import gc
+import logging
+import os
+from celery.signals import worker_init, worker_process_init
+from ..config import settings
+from ..engines import preload_engines
+from ..utils.metrics import format_memory, memory_breakdown, update_process_rss
+
+logger = logging.getLogger(__name__)
+
+
+@worker_init.connect
+def preload_models(**kwargs):
+    """Load PRELOAD_MODELS in the parent so prefork children share the weights copy-on-write"""
+    models = [m.strip() for m in settings.PRELOAD_MODELS.split(",") if m.strip()]
+    if not models:
+        return
+    try:
+        preloaded = preload_engines(models)
+    except Exception as e:
+        # Children fall back to loading lazily, as without preloading
+        logger.error(f"Error preloading models {models}: {str(e)}")
+        return
+    # Move everything allocated so far out of the collector's reach, so GC passes
+    # in the children don't write to (and thereby copy) the parent's object pages
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Preloaded {preloaded} in worker parent {os.getpid()}: {format_memory(memory_breakdown())}")
+
+
+@worker_process_init.connect
+def report_child_memory(**kwargs):
+    breakdown = update_process_rss("worker")
+    logger.info(f"Worker child {os.getpid()} started: {format_memory(breakdown)}")
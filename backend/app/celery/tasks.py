@@ -1,13 +1,28 @@
 # backend/app/celery/tasks.py
 from . import celery_app
 from typing import Dict, Any
-import whisper
 import logging
-from pathlib import Path
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, or_, update
 from ..database import SessionLocal
 from ..models import Transcription
 from ..config import settings
+from ..utils.segments import pack_segments
+from ..utils.search import index_transcription
+from ..utils.transcript_text import save_text, text_summary
+from ..utils.media import decode_audio
+from ..utils.transcription import fallback_stats, normalize_language, transcribe_audio
+from ..utils.profiling import StageRecorder, maybe_profile, queue_wait_seconds
+from ..engines import get_engine
+from ..storage import get_storage
+from ..core.tracing import annotate, record_span, traced_task
+from ..utils.rtf_stats import hardware_tag, record_job
+from ..utils.cleanup import enforce_disk_quota, run_cleanup
+from ..utils.archive import archive_transcription_audio
+from ..utils.preview import PreviewCancelled, transcribe_chunked
+from ..utils.windowed import transcribe_windowed, use_windowed_decode
+from ..utils.metrics import AUDIO_SECONDS, DECODE_WINDOWS, REAL_TIME_FACTOR, TASK_DURATION
 
 logger = logging.getLogger(__name__)
 
@@ -16,55 +31,296 @@ logger = logging.getLogger(__name__)
             max_retries=3,
             soft_time_limit=3300,
             time_limit=3600)
+@traced_task("transcribe")
 def transcribe_audio_task(self, transcription_id: int):
     logger.info(f"Starting transcription task for ID: {transcription_id}")
     
     db = SessionLocal()
+    transcription = None
+    started = time.perf_counter()
+    stages = StageRecorder()
     try:
-        # Log directory contents
-        import os
-        logger.info(f"Contents of uploads directory: {os.listdir('/app/uploads')}")
-        
-        transcription = db.query(Transcription).filter(
-            Transcription.id == transcription_id
-        ).first()
-        
-        if not transcription:
-            logger.error(f"Transcription {transcription_id} not found in database")
-            return
-            
-        logger.info(f"Processing file: {transcription.filename}")
-        transcription.status = "processing"
-        db.commit()
+        with stages.stage("db_load"):
+            # Claim the job in one conditional UPDATE: of two deliveries of the same message only one
+            # matches. A row "processing" past the hard time limit has no live worker and is taken over.
+            now = datetime.utcnow()
+            claimed = db.execute(
+                update(Transcription)
+                .where(
+                    Transcription.id == transcription_id,
+                    or_(
+                        Transcription.status == "pending",
+                        and_(
+                            Transcription.status == "processing",
+                            Transcription.started_at < now - timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT)
+                        )
+                    )
+                )
+                .values(status="processing", started_at=now, attempts=func.coalesce(Transcription.attempts, 0) + 1)
+            ).rowcount
+            db.commit()
+
+            transcription = db.query(Transcription).filter(
+                Transcription.id == transcription_id
+            ).first()
+            if not transcription:
+                logger.error(f"Transcription {transcription_id} not found in database")
+                return
+            if not claimed:
+                # The outbox publishes at least once; a repeated delivery must not redo the work.
+                # A job whose worker died mid-run is recovered by outbox.reap_stale_processing().
+                logger.info(f"Transcription {transcription_id} already {transcription.status}, skipping duplicate delivery")
+                return
+
+            logger.info(f"Processing file: {transcription.filename} (attempt {transcription.attempts})")
+        queue_wait = queue_wait_seconds(transcription.created_at, transcription.started_at)
+        if queue_wait is not None:
+            stages.add("queue_wait", queue_wait)
+            record_span("queue_wait", transcription.created_at, transcription.started_at)
+        annotate(
+            transcription_id=transcription_id,
+            model=transcription.model_size,
+            profile=transcription.decoding_profile,
+            file_size=transcription.file_size
+        )
+        started = time.perf_counter()
 
-        # Check if file exists
-        file_path = Path(transcription.filename)
-        if not file_path.exists():
-            logger.error(f"File not found at path: {file_path}")
+        # A local file to decode: the upload itself, or a cached copy of the stored object
+        try:
+            with stages.stage("fetch"):
+                file_path = get_storage().local_path(transcription.filename)
+        except FileNotFoundError as e:
+            logger.error(str(e))
             transcription.status = "failed"
-            transcription.error = f"File not found at path: {file_path}"
+            transcription.error = str(e)
+            transcription.stage_timings = stages.as_dict()
             db.commit()
             return
 
-        # Load model with logging
-        logger.info(f"Loading Whisper model: {transcription.model_size}")
-        model = whisper.load_model(transcription.model_size)
-        
-        # Transcribe
-        logger.info("Starting transcription process")
-        result = model.transcribe(str(file_path))
+        with maybe_profile(transcription_id):
+            # Long inputs are decoded window by window so memory doesn't grow with their length
+            windowed = use_windowed_decode(str(file_path), transcription.audio_duration)
+            if not windowed:
+                # Decode once so the audio duration is known for RTF statistics
+                with stages.stage("decode"):
+                    audio = decode_audio(str(file_path))
+                audio_duration = len(audio) / settings.SAMPLE_RATE
+                annotate(audio_seconds=audio_duration)
+                with stages.stage("db_write"):
+                    transcription.audio_duration = audio_duration
+                    db.commit()
+
+            # Load (or reuse the process-cached) engine
+            logger.info(f"Loading model: {transcription.model_size}")
+            with stages.stage("model_load"):
+                engine = get_engine(transcription.model_size)
+
+            language = normalize_language(transcription.language)
+            if windowed:
+                # Decoding, language detection (on the first window) and inference are interleaved
+                logger.info("Starting windowed transcription process")
+                with stages.stage("inference"):
+                    result = transcribe_windowed(
+                        engine,
+                        str(file_path),
+                        language=language,
+                        profile=transcription.decoding_profile
+                    )
+                audio_duration = result["duration"]
+                annotate(audio_seconds=audio_duration, windowed=True)
+                transcription.audio_duration = audio_duration
+            else:
+                # Detect the language up front so it is timed apart from decoding
+                if language is None:
+                    with stages.stage("language_detection"):
+                        language = engine.detect_language(audio)
+
+                # Transcribe
+                logger.info("Starting transcription process")
+                with stages.stage("inference"):
+                    result = transcribe_audio(
+                        audio,
+                        model_size=transcription.model_size,
+                        language=language,
+                        profile=transcription.decoding_profile
+                    )
+            processing_time = time.perf_counter() - started
+            fallbacks = fallback_stats(result.get("segments", []))
+            profile_label = transcription.decoding_profile or settings.DECODING_PROFILE
+            DECODE_WINDOWS.labels(profile=profile_label, fallback="true").inc(fallbacks["fallbacks"])
+            DECODE_WINDOWS.labels(profile=profile_label, fallback="false").inc(fallbacks["windows"] - fallbacks["fallbacks"])
         
-        logger.info("Transcription completed successfully")
-        transcription.text = result["text"]
-        transcription.status = "completed"
-        transcription.completed_at = datetime.utcnow()
-        db.commit()
+            logger.info(
+                f"Transcription completed successfully: {audio_duration:.1f}s audio "
+                f"in {processing_time:.1f}s (RTF {processing_time / max(audio_duration, 1e-6):.3f}, "
+                f"{fallbacks['fallbacks']}/{fallbacks['windows']} windows re-decoded)"
+            )
+            with stages.stage("db_write"):
+                for column, value in text_summary(result["text"]).items():
+                    setattr(transcription, column, value)
+                transcription.segments = pack_segments(result.get("segments", []), result["text"])
+                transcription.processing_time = processing_time
+                transcription.quality = "final"
+                transcription.hardware_tag = hardware_tag()
+                transcription.status = "completed"
+                transcription.completed_at = datetime.utcnow()
+                db.flush()
+                save_text(db, transcription.id, result["text"])
+                try:
+                    # Savepoint so an indexing failure doesn't lose the transcript
+                    with db.begin_nested():
+                        index_transcription(db, transcription.id, result["text"])
+                except Exception as e:
+                    logger.error(f"Error indexing transcription {transcription_id}: {str(e)}")
+                db.flush()
+            # Written last so it includes the final write; JSON reassignment marks it dirty
+            transcription.stage_timings = stages.as_dict()
+            db.commit()
+
+        logger.info(f"Stage timings for {transcription_id}: {transcription.stage_timings}")
+        record_job(
+            transcription.model_size,
+            audio_duration,
+            processing_time,
+            transcription.hardware_tag,
+            transcription.stage_timings
+        )
+
+        model_label = transcription.model_size or "unknown"
+        TASK_DURATION.labels(model=model_label, status="completed").observe(processing_time)
+        REAL_TIME_FACTOR.labels(model=model_label).observe(processing_time / max(audio_duration, 1e-6))
+        AUDIO_SECONDS.labels(model=model_label).inc(audio_duration)
+        stages.observe()
+
+        if transcription.preview_task_id:
+            # The draft is now redundant; drop it if it hasn't started (a running one will see "final")
+            try:
+                celery_app.control.revoke(transcription.preview_task_id)
+            except Exception as e:
+                logger.error(f"Error revoking preview task for {transcription_id}: {str(e)}")
+
+        if settings.ARCHIVE_AUDIO_ENABLED:
+            try:
+                archive_audio_task.delay(transcription_id)
+            except Exception as e:
+                logger.error(f"Error queueing archive for transcription {transcription_id}: {str(e)}")
         
     except Exception as e:
         logger.error(f"Error in transcription task: {str(e)}")
-        transcription.status = "failed"
-        transcription.error = str(e)
+        if transcription is not None:
+            TASK_DURATION.labels(model=transcription.model_size or "unknown", status="failed").observe(
+                time.perf_counter() - started
+            )
+            transcription.status = "failed"
+            transcription.error = str(e)
+            transcription.stage_timings = stages.as_dict()
+            db.commit()
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(name='preview_transcription_task', ignore_result=True, soft_time_limit=600, time_limit=660)
+@traced_task("preview")
+def preview_transcription_task(transcription_id: int):
+    """Quick chunk-parallel draft with the preview model, replaced later by the final transcript"""
+    db = SessionLocal()
+    try:
+        transcription = db.query(Transcription).filter(Transcription.id == transcription_id).first()
+        if transcription is None or transcription.quality == "final" or transcription.status in ("completed", "failed"):
+            return
+
+        def final_arrived() -> bool:
+            db.expire_all()
+            quality = db.query(Transcription.quality).filter(Transcription.id == transcription_id).scalar()
+            return quality == "final"
+
+        started = time.perf_counter()
+        file_path = str(get_storage().local_path(transcription.filename))
+        # Drafts decode the whole input at once; long inputs only get the windowed final pass
+        if use_windowed_decode(file_path, transcription.audio_duration):
+            logger.info(f"Skipping draft for transcription {transcription_id}: input too long to decode whole")
+            return
+        audio = decode_audio(file_path)
+        engine = get_engine(settings.PREVIEW_MODEL)
+        result = transcribe_chunked(
+            engine,
+            audio,
+            language=normalize_language(transcription.language),
+            should_cancel=final_arrived
+        )
+
+        # Conditional write: never replace a final transcript with a draft
+        written = db.execute(
+            update(Transcription)
+            .where(
+                Transcription.id == transcription_id,
+                or_(Transcription.quality.is_(None), Transcription.quality != "final")
+            )
+            .values(
+                segments=pack_segments(result["segments"], result["text"]),
+                quality="draft",
+                audio_duration=len(audio) / settings.SAMPLE_RATE,
+                **text_summary(result["text"])
+            )
+        ).rowcount
+        if written:
+            save_text(db, transcription_id, result["text"])
         db.commit()
+        logger.info(
+            f"Draft for transcription {transcription_id} "
+            f"{'ready' if written else 'discarded, final already stored'} in {time.perf_counter() - started:.1f}s"
+        )
+    except PreviewCancelled:
+        logger.info(f"Draft for transcription {transcription_id} cancelled, final transcript arrived first")
+    except Exception as e:
+        # A failed draft only costs the preview; the requested model still runs
+        logger.error(f"Error creating draft for transcription {transcription_id}: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@celery_app.task(name='archive_audio_task', ignore_result=True, max_retries=2, default_retry_delay=300)
+def archive_audio_task(transcription_id: int):
+    """Re-encode a completed job's upload to Opus/FLAC at 16 kHz mono"""
+    db = SessionLocal()
+    try:
+        archive_transcription_audio(db, transcription_id)
+    except Exception as e:
+        logger.error(f"Error archiving transcription {transcription_id}: {str(e)}")
+        db.rollback()
+        raise archive_audio_task.retry(exc=e)
+    finally:
+        db.close()
+
+
+@celery_app.task(name='cleanup_uploads_task', ignore_result=True)
+def cleanup_uploads_task():
+    """Periodic retention expiry, stale file sweep and disk quota enforcement"""
+    logger.info("Starting cleanup task")
+    db = SessionLocal()
+    try:
+        summary = run_cleanup(db)
+        logger.info(f"Cleanup task completed: {summary}")
+        return summary
+    except Exception as e:
+        logger.error(f"Cleanup task failed: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(name='enforce_disk_quota_task', ignore_result=True)
+def enforce_disk_quota_task():
+    """Frequent check of the uploads volume high-water mark"""
+    db = SessionLocal()
+    try:
+        return enforce_disk_quota(db)
+    except Exception as e:
+        logger.error(f"Disk quota check failed: {str(e)}")
+        db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
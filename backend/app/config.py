@@ -1,7 +1,7 @@
 # backend/app/config.py
 from pydantic_settings import BaseSettings
 from pathlib import Path
-from typing import Dict, Set, Optional
+from typing import Any, Dict, Set, Optional
 import os
 
 class Settings(BaseSettings):
@@ -20,6 +20,10 @@ class Settings(BaseSettings):
         "postgresql://user:password@db:5432/whisperdb"
     )
     
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    
     # Redis and Celery
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379/0")
     CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", REDIS_URL)
@@ -28,8 +32,26 @@ class Settings(BaseSettings):
     # File Upload Settings
     UPLOAD_DIR: Path = Path(os.getenv("UPLOAD_DIR", "/app/uploads"))
     RECORDINGS_DIR: Path = Path(os.getenv("RECORDINGS_DIR", "/app/uploads/recordings"))
+
+    # Upload Storage (local directory, or an S3-compatible bucket so workers need no shared volume)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "local")  # local or s3
+    S3_BUCKET: str = os.getenv("S3_BUCKET", "speechtotext-uploads")
+    S3_PREFIX: str = os.getenv("S3_PREFIX", "uploads")
+    S3_ENDPOINT_URL: str = os.getenv("S3_ENDPOINT_URL", "")  # e.g. http://minio:9000; empty for AWS
+    S3_REGION: str = os.getenv("S3_REGION", "")
+    S3_ACCESS_KEY_ID: str = os.getenv("S3_ACCESS_KEY_ID", "")  # empty uses the default credential chain
+    S3_SECRET_ACCESS_KEY: str = os.getenv("S3_SECRET_ACCESS_KEY", "")
+    S3_PART_SIZE_MB: int = int(os.getenv("S3_PART_SIZE_MB", "8"))  # multipart part size
+    S3_MAX_CONCURRENCY: int = int(os.getenv("S3_MAX_CONCURRENCY", "4"))  # parallel parts per transfer
+    # Worker-side copies of remote objects, least recently used evicted first
+    STORAGE_CACHE_DIR: Path = Path(os.getenv("STORAGE_CACHE_DIR", "/tmp/stt-object-cache"))
+    STORAGE_CACHE_MAX_MB: int = int(os.getenv("STORAGE_CACHE_MAX_MB", "2048"))
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "100000000"))  # 100MB
-    ALLOWED_EXTENSIONS: Set[str] = {"mp3", "wav", "mp4", "avi", "mov"}
+    # Accepted containers, matched against the file's content (app.utils.media.sniff_format), not its name
+    ALLOWED_CONTAINERS: Set[str] = {"mp3", "wav", "mp4", "avi", "mov", "ogg", "flac", "webm", "aac"}
+    # Upload ingest: video containers are reduced to their audio track before storage
+    INGEST_DIR: Path = Path(os.getenv("INGEST_DIR", os.path.join(os.getenv("UPLOAD_DIR", "/app/uploads"), "incoming")))
+    INGEST_CONCURRENCY: int = int(os.getenv("INGEST_CONCURRENCY", "2"))  # extractions at once per API process
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "8192"))
     
     # Server Settings
@@ -41,7 +63,53 @@ class Settings(BaseSettings):
     CELERY_MAX_TASKS_PER_CHILD: int = int(os.getenv("CELERY_MAX_TASKS_PER_CHILD", "100"))
     CELERY_TASK_TIME_LIMIT: int = int(os.getenv("CELERY_TASK_TIME_LIMIT", "3600"))  # 1 hour
     CELERY_TASK_SOFT_TIME_LIMIT: int = int(os.getenv("CELERY_TASK_SOFT_TIME_LIMIT", "3300"))  # 55 minutes
+    # Comma-separated models loaded in the worker parent before forking, e.g. "base,small"
+    PRELOAD_MODELS: str = os.getenv("PRELOAD_MODELS", "")
+    WORKER_METRICS_PORT: int = int(os.getenv("WORKER_METRICS_PORT", "9808"))  # 0 disables
     
+    # Streaming Transcription (WebSocket)
+    STREAM_MAX_SESSIONS: int = int(os.getenv("STREAM_MAX_SESSIONS", "4"))  # per API worker process
+    STREAM_PARTIAL_INTERVAL: float = float(os.getenv("STREAM_PARTIAL_INTERVAL", "1.0"))  # seconds of new audio
+    STREAM_COMMIT_SILENCE: float = float(os.getenv("STREAM_COMMIT_SILENCE", "0.6"))
+    STREAM_MAX_WINDOW: float = float(os.getenv("STREAM_MAX_WINDOW", "15"))
+    STREAM_VAD_THRESHOLD: float = float(os.getenv("STREAM_VAD_THRESHOLD", "0.01"))  # frame RMS
+    STREAM_PROMPT_CHARS: int = int(os.getenv("STREAM_PROMPT_CHARS", "200"))
+    STREAM_IDLE_TIMEOUT: float = float(os.getenv("STREAM_IDLE_TIMEOUT", "30"))
+    STREAM_MAX_DURATION: int = int(os.getenv("STREAM_MAX_DURATION", "3600"))  # seconds of audio
+
+    # Worker Autoscaling (python -m app.utils.autoscaler)
+    AUTOSCALE_MIN_CONCURRENCY: int = int(os.getenv("AUTOSCALE_MIN_CONCURRENCY", "1"))
+    AUTOSCALE_MAX_CONCURRENCY: int = int(os.getenv("AUTOSCALE_MAX_CONCURRENCY", "4"))
+    AUTOSCALE_TARGET_DRAIN_SECONDS: float = float(os.getenv("AUTOSCALE_TARGET_DRAIN_SECONDS", "600"))
+    AUTOSCALE_INTERVAL_SECONDS: float = float(os.getenv("AUTOSCALE_INTERVAL_SECONDS", "30"))
+    AUTOSCALE_STEP: int = int(os.getenv("AUTOSCALE_STEP", "1"))  # max processes added per tick
+    AUTOSCALE_SHRINK_AFTER: int = int(os.getenv("AUTOSCALE_SHRINK_AFTER", "4"))  # ticks below target
+    AUTOSCALE_MEMORY_RESERVE_MB: int = int(os.getenv("AUTOSCALE_MEMORY_RESERVE_MB", "256"))
+    AUTOSCALE_CHILD_MEMORY_MB: int = int(os.getenv("AUTOSCALE_CHILD_MEMORY_MB", "1024"))  # until measured
+    AUTOSCALER_METRICS_PORT: int = int(os.getenv("AUTOSCALER_METRICS_PORT", "9809"))
+
+    # Fair-share Dispatch (python -m app.utils.fair_share); when disabled uploads go straight to the broker
+    FAIR_SHARE_ENABLED: bool = os.getenv("FAIR_SHARE_ENABLED", "false").lower() == "true"
+    FAIR_SHARE_MAX_INFLIGHT: int = int(os.getenv("FAIR_SHARE_MAX_INFLIGHT", "8"))  # ~ worker processes + prefetch
+    FAIR_SHARE_QUANTUM_SECONDS: float = float(os.getenv("FAIR_SHARE_QUANTUM_SECONDS", "300"))  # audio s per round
+    FAIR_SHARE_OWNER_CAP: int = int(os.getenv("FAIR_SHARE_OWNER_CAP", "0"))  # in-flight jobs per owner, 0 = no cap
+    FAIR_SHARE_OWNER_CAPS: str = os.getenv("FAIR_SHARE_OWNER_CAPS", "")  # overrides: "client:bulk=2,ip:10.0.0.5=1"
+    FAIR_SHARE_WEIGHTS: str = os.getenv("FAIR_SHARE_WEIGHTS", "")  # "client:premium=3"
+    FAIR_SHARE_HEAD_JOBS: int = int(os.getenv("FAIR_SHARE_HEAD_JOBS", "20"))  # oldest jobs read per owner per tick
+
+    # Task Outbox (python -m app.utils.outbox publishes the messages the API commits)
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+    OUTBOX_POLL_INTERVAL: float = float(os.getenv("OUTBOX_POLL_INTERVAL", "0.2"))
+    OUTBOX_RETRY_BASE_SECONDS: float = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "1"))
+    OUTBOX_RETRY_MAX_SECONDS: float = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "60"))
+    OUTBOX_STALE_PENDING_SECONDS: int = int(os.getenv("OUTBOX_STALE_PENDING_SECONDS", "1800"))
+    # Jobs still "processing" this long after starting have lost their worker (> CELERY_TASK_TIME_LIMIT)
+    PROCESSING_STALE_SECONDS: int = int(os.getenv("PROCESSING_STALE_SECONDS", "3900"))
+    MAX_PROCESSING_ATTEMPTS: int = int(os.getenv("MAX_PROCESSING_ATTEMPTS", "3"))  # then the job fails
+    OUTBOX_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("OUTBOX_SWEEP_INTERVAL_SECONDS", "60"))
+    OUTBOX_RETENTION_HOURS: int = int(os.getenv("OUTBOX_RETENTION_HOURS", "24"))  # published rows kept
+    OUTBOX_METRICS_PORT: int = int(os.getenv("OUTBOX_METRICS_PORT", "9810"))
+
     # Recording Settings
     MAX_RECORDING_DURATION: int = int(os.getenv("MAX_RECORDING_DURATION", "300"))  # 5 minutes
     SAMPLE_RATE: int = int(os.getenv("SAMPLE_RATE", "16000"))
@@ -92,6 +160,77 @@ class Settings(BaseSettings):
         }
     }
     
+    # Transcription Engines
+    # "whisper" (openai-whisper), "faster-whisper" (CTranslate2) or "fake" (benchmarks)
+    TRANSCRIPTION_ENGINE: str = os.getenv("TRANSCRIPTION_ENGINE", "whisper")
+    # Per-model engine choice, e.g. TRANSCRIPTION_ENGINE_OVERRIDES='{"large": "faster-whisper"}'
+    TRANSCRIPTION_ENGINE_OVERRIDES: Dict[str, str] = {}
+    FASTER_WHISPER_DEVICE: str = os.getenv("FASTER_WHISPER_DEVICE", "cpu")
+    FASTER_WHISPER_COMPUTE_TYPE: str = os.getenv("FASTER_WHISPER_COMPUTE_TYPE", "int8")
+    FASTER_WHISPER_CPU_THREADS: int = int(os.getenv("FASTER_WHISPER_CPU_THREADS", "0"))  # 0 = auto
+    FAKE_ENGINE_RTF: float = float(os.getenv("FAKE_ENGINE_RTF", "0.05"))
+    FAKE_ENGINE_LOAD_SECONDS: float = float(os.getenv("FAKE_ENGINE_LOAD_SECONDS", "0"))
+    FAKE_ENGINE_WEIGHTS_MB: float = float(os.getenv("FAKE_ENGINE_WEIGHTS_MB", "0"))
+
+    # Draft Preview (quick pass with a small model while the requested one runs)
+    PREVIEW_ENABLED: bool = os.getenv("PREVIEW_ENABLED", "true").lower() == "true"
+    PREVIEW_MODEL: str = os.getenv("PREVIEW_MODEL", "tiny")
+    PREVIEW_QUEUE: str = os.getenv("PREVIEW_QUEUE", "preview")
+    PREVIEW_CHUNK_SECONDS: float = float(os.getenv("PREVIEW_CHUNK_SECONDS", "30"))  # <= 30 for batched whisper
+    PREVIEW_PARALLELISM: int = int(os.getenv("PREVIEW_PARALLELISM", "4"))
+
+    # Windowed Decode (inputs longer than DECODE_WINDOW_MIN_SECONDS are decoded and transcribed in windows)
+    DECODE_WINDOW_SECONDS: float = float(os.getenv("DECODE_WINDOW_SECONDS", "600"))  # multiple of 30 s
+    DECODE_WINDOW_MIN_SECONDS: float = float(os.getenv("DECODE_WINDOW_MIN_SECONDS", "1200"))  # 0 = always
+    DECODE_WINDOW_SEARCH_SECONDS: float = float(os.getenv("DECODE_WINDOW_SEARCH_SECONDS", "5"))  # pause search
+    DECODE_WINDOW_PROMPT_CHARS: int = int(os.getenv("DECODE_WINDOW_PROMPT_CHARS", "200"))
+
+    # Decoding options passed to every engine (openai-whisper names)
+    DECODING_OPTIONS: Dict[str, Any] = {
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "compression_ratio_threshold": 2.4,
+        "logprob_threshold": -1.0,
+        "no_speech_threshold": 0.6,
+        "condition_on_previous_text": True
+    }
+
+    # Named decoding profiles, merged over DECODING_OPTIONS; chosen per upload with ?profile=
+    # beam_size/best_of None = greedy. Thresholds set to None disable the checks that trigger
+    # temperature-fallback re-decodes; without_timestamps gives one segment per 30 s window.
+    DECODING_PROFILES: Dict[str, Dict[str, Any]] = {
+        "fast": {
+            "temperature": 0.0,
+            "beam_size": None,
+            "best_of": None,
+            "compression_ratio_threshold": None,
+            "logprob_threshold": None,
+            "condition_on_previous_text": False,
+            "without_timestamps": True
+        },
+        "balanced": {
+            "beam_size": None,
+            "best_of": None
+        },
+        "accurate": {
+            "beam_size": 5,
+            "best_of": 5,
+            "patience": 1.0
+        }
+    }
+    DECODING_PROFILE: str = os.getenv("DECODING_PROFILE", "balanced")  # default when an upload names none
+
+    # Browser-side preprocessing an upload may declare with ?preprocessing=, and the bytes per
+    # second of audio each produces (16 kHz mono 16-bit WAV, 24 kbps Ogg Opus incl. framing)
+    CLIENT_PREPROCESSING: Dict[str, int] = {
+        "wav16k": 32000,
+        "opus16k": 3300
+    }
+    # Audio codec the server must probe before a declared byte rate is believed
+    CLIENT_PREPROCESSING_CODECS: Dict[str, str] = {
+        "wav16k": "pcm_s16le",
+        "opus16k": "opus"
+    }
+    
     # Supported Languages
     SUPPORTED_LANGUAGES: Dict[str, str] = {
         "en": "English",
@@ -106,12 +245,75 @@ class Settings(BaseSettings):
         "auto": "Auto Detect"
     }
 
+    # Processing-time Estimation
+    # Fallback real-time factors (processing seconds per audio second) used
+    # until enough measured samples exist for a model
+    DEFAULT_MODEL_RTF: Dict[str, float] = {
+        "tiny": 0.1,
+        "base": 0.2,
+        "small": 0.5,
+        "medium": 1.2,
+        "large": 2.5
+    }
+    RTF_STATS_WINDOW: int = int(os.getenv("RTF_STATS_WINDOW", "500"))
+    RTF_MIN_SAMPLES: int = int(os.getenv("RTF_MIN_SAMPLES", "5"))
+    RTF_STATS_CACHE_SECONDS: int = int(os.getenv("RTF_STATS_CACHE_SECONDS", "30"))
+    ETA_SNAPSHOT_SECONDS: float = float(os.getenv("ETA_SNAPSHOT_SECONDS", "5"))  # queue order reused by status polls
+    ESTIMATED_AUDIO_BYTES_PER_SECOND: int = int(os.getenv("ESTIMATED_AUDIO_BYTES_PER_SECOND", "16000"))  # ~128kbps
+    HARDWARE_TAG: str = os.getenv("HARDWARE_TAG", "")
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+
     # API Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "60"))
+
+    # Admission Control
+    ADMISSION_CONTROL_ENABLED: bool = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    # Proxies whose X-Real-IP/X-Forwarded-For are believed: comma-separated addresses or CIDR ranges
+    TRUSTED_PROXIES: str = os.getenv("TRUSTED_PROXIES", "127.0.0.1,::1")
+    MAX_QUEUE_DEPTH: int = int(os.getenv("MAX_QUEUE_DEPTH", "500"))
+    MAX_BACKLOG_SECONDS: int = int(os.getenv("MAX_BACKLOG_SECONDS", "3600"))
+    ADMISSION_CACHE_SECONDS: int = int(os.getenv("ADMISSION_CACHE_SECONDS", "5"))
+    CELERY_QUEUE_NAME: str = os.getenv("CELERY_QUEUE_NAME", "celery")
     
     # Cleanup Settings
     CLEANUP_INTERVAL_HOURS: int = int(os.getenv("CLEANUP_INTERVAL_HOURS", "24"))
     FILE_RETENTION_DAYS: int = int(os.getenv("FILE_RETENTION_DAYS", "7"))
+    CLEANUP_BATCH_SIZE: int = int(os.getenv("CLEANUP_BATCH_SIZE", "500"))
+    # Uploads volume usage (%) that triggers eviction of completed jobs' audio, and the target
+    DISK_HIGH_WATER_PERCENT: float = float(os.getenv("DISK_HIGH_WATER_PERCENT", "85"))
+    DISK_LOW_WATER_PERCENT: float = float(os.getenv("DISK_LOW_WATER_PERCENT", "75"))
+    DISK_CHECK_INTERVAL_MINUTES: int = int(os.getenv("DISK_CHECK_INTERVAL_MINUTES", "5"))
+    DISK_EVICT_MAX_PER_RUN: int = int(os.getenv("DISK_EVICT_MAX_PER_RUN", "500"))  # jobs whose audio one check may evict
+
+    # Audio Archival (re-encode retained uploads after transcription)
+    ARCHIVE_AUDIO_ENABLED: bool = os.getenv("ARCHIVE_AUDIO_ENABLED", "true").lower() == "true"
+    ARCHIVE_CODEC: str = os.getenv("ARCHIVE_CODEC", "opus")  # opus or flac
+    ARCHIVE_OPUS_BITRATE: str = os.getenv("ARCHIVE_OPUS_BITRATE", "24k")
+
+    # Transcript Text Storage (compressed in transcription_texts, see app.utils.transcript_text)
+    TEXT_COMPRESSION: str = os.getenv("TEXT_COMPRESSION", "zstd")  # zstd or zlib
+    TEXT_COMPRESSION_LEVEL: int = int(os.getenv("TEXT_COMPRESSION_LEVEL", "9"))
+    TEXT_PREVIEW_CHARS: int = int(os.getenv("TEXT_PREVIEW_CHARS", "500"))  # returned by status polls
+
+    # Full-text Search
+    SEARCH_TEXT_CONFIG: str = os.getenv("SEARCH_TEXT_CONFIG", "simple")  # Postgres regconfig
+    SEARCH_MAX_RESULTS: int = int(os.getenv("SEARCH_MAX_RESULTS", "50"))
+    SEARCH_MAX_TIMESTAMPS: int = int(os.getenv("SEARCH_MAX_TIMESTAMPS", "10"))
+    SEARCH_EXCERPT_CHARS: int = int(os.getenv("SEARCH_EXCERPT_CHARS", "100000"))  # plain text kept for snippets
+
+    # Job Profiling
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # fraction of jobs, 0 = off
+    PROFILER: str = os.getenv("PROFILER", "cprofile")  # cprofile or pyinstrument
+    PROFILE_DIR: Path = Path(os.getenv("PROFILE_DIR", "/app/uploads/profiles"))
+
+    # Distributed Tracing (OpenTelemetry, optional)
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACING_SAMPLE_RATE: float = float(os.getenv("TRACING_SAMPLE_RATE", "0.05"))  # fraction of uploads traced
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "otlp")  # otlp, file or console
+    TRACING_OTLP_ENDPOINT: str = os.getenv("TRACING_OTLP_ENDPOINT", "http://otel-collector:4318/v1/traces")
+    TRACING_FILE: str = os.getenv("TRACING_FILE", "/tmp/traces.jsonl")  # JSON lines, for TRACING_EXPORTER=file
+    TRACING_SERVICE_NAME: str = os.getenv("TRACING_SERVICE_NAME", "speechtotext")  # suffixed with -api, -worker, ...
 
     def get_model_max_file_size(self, model_name: str) -> int:
         """Get maximum file size for a specific model"""
@@ -119,7 +321,7 @@ class Settings(BaseSettings):
 
     def validate_file_extension(self, filename: str) -> bool:
         """Validate file extension"""
-        return filename.lower().split('.')[-1] in self.ALLOWED_EXTENSIONS
+        return filename.lower().split('.')[-1] in self.ALLOWED_CONTAINERS
 
     def validate_language_code(self, language_code: str) -> bool:
         """Validate language code"""
@@ -0,0 +1,234 @@
+# backend/app/core/admission.py
+import ipaddress
+import logging
+import math
+import time
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..config import settings
+from ..database import SessionLocal
+from ..utils.redis_client import get_redis
+from ..utils.rtf_stats import queue_backlog
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] bucket key; ARGV: refill rate (tokens/s), capacity, cost.
+# Returns {allowed, milliseconds until enough tokens are available}.
+_TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait_ms = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait_ms = math.ceil((cost - tokens) / rate * 1000)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, wait_ms}
+"""
+
+EXEMPT_PATHS = ("/health", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+
+class TokenBucketLimiter:
+    """Per-client token bucket kept in Redis so all API workers share it"""
+
+    def __init__(self, rate_per_minute: int, burst: int, redis_client=None, prefix: str = "ratelimit"):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.prefix = prefix
+        self._redis = redis_client
+        self._script = None
+
+    @property
+    def redis(self):
+        return self._redis if self._redis is not None else get_redis()
+
+    def acquire(self, client_id: str, cost: int = 1) -> Tuple[bool, float]:
+        """Take tokens for a client; returns (allowed, retry_after_seconds)"""
+        if self._script is None:
+            self._script = self.redis.register_script(_TOKEN_BUCKET_SCRIPT)
+        allowed, wait_ms = self._script(
+            keys=[f"{self.prefix}:{client_id}"],
+            args=[self.rate, self.capacity, cost]
+        )
+        return bool(allowed), int(wait_ms) / 1000.0
+
+
+@lru_cache(maxsize=1)
+def _trusted_networks(spec: str) -> Tuple:
+    networks = []
+    for entry in spec.split(","):
+        if entry.strip():
+            try:
+                networks.append(ipaddress.ip_network(entry.strip(), strict=False))
+            except ValueError:
+                logger.error(f"Ignoring invalid TRUSTED_PROXIES entry: {entry.strip()}")
+    return tuple(networks)
+
+
+def is_trusted_proxy(address: Optional[str]) -> bool:
+    """Whether an address is one of settings.TRUSTED_PROXIES (addresses or CIDR ranges)"""
+    try:
+        ip = ipaddress.ip_address(address or "")
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_networks(settings.TRUSTED_PROXIES))
+
+
+def client_identifier(scope: Scope) -> str:
+    """Client address: the socket peer, or the address a trusted proxy forwards.
+
+    X-Real-IP and X-Forwarded-For are only honoured from TRUSTED_PROXIES;
+    anyone else could put any value there to dodge rate limits.
+    """
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+    if not is_trusted_proxy(peer):
+        return peer
+    headers = dict(scope.get("headers") or [])
+    real_ip = headers.get(b"x-real-ip")
+    if real_ip:
+        return real_ip.decode("latin-1").strip()
+    forwarded = headers.get(b"x-forwarded-for")
+    if forwarded:
+        # The rightmost hop not added by one of our proxies is the one we can vouch for
+        hops = [hop.strip() for hop in forwarded.decode("latin-1").split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not is_trusted_proxy(hop):
+                return hop
+        if hops:
+            return hops[0]
+    return peer
+
+
+class AdmissionControlMiddleware:
+    """Rejects over-limit requests before the request body is read.
+
+    Implemented as plain ASGI so nothing is buffered: a refused upload costs
+    one Redis call and at most one cached backlog query.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: Optional[TokenBucketLimiter] = None):
+        self.app = app
+        self.limiter = limiter or TokenBucketLimiter(
+            settings.RATE_LIMIT_PER_MINUTE,
+            settings.RATE_LIMIT_BURST
+        )
+        self._backlog_cache: Tuple[float, dict] = (0.0, {})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or not settings.ADMISSION_CONTROL_ENABLED
+            or scope["method"] == "OPTIONS"
+            or scope["path"].startswith(EXEMPT_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        rejection = await run_in_threadpool(self.check, scope)
+        if rejection is not None:
+            status_code, detail, retry_after = rejection
+            headers = {"Retry-After": str(max(1, math.ceil(retry_after)))} if retry_after else None
+            response = JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def check(self, scope: Scope) -> Optional[Tuple[int, str, float]]:
+        """Return (status, detail, retry_after) when the request must be refused"""
+        is_upload = scope["method"] == "POST" and scope["path"].endswith("/transcription/upload")
+
+        if is_upload:
+            headers = dict(scope.get("headers") or [])
+            content_length = headers.get(b"content-length")
+            if content_length and content_length.isdigit() and int(content_length) > settings.MAX_FILE_SIZE:
+                return (
+                    status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    f"Request body exceeds maximum allowed size ({settings.MAX_FILE_SIZE / (1024*1024):.2f}MB)",
+                    0
+                )
+
+        try:
+            allowed, retry_after = self.limiter.acquire(client_identifier(scope))
+            if not allowed:
+                return status.HTTP_429_TOO_MANY_REQUESTS, "Rate limit exceeded", retry_after
+        except Exception as e:
+            # Fail open: a Redis outage must not take the API down with it
+            logger.error(f"Rate limiter unavailable: {str(e)}")
+
+        if is_upload:
+            return self.check_backlog()
+        return None
+
+    def backlog(self) -> dict:
+        """Queue depth and drain time, cached briefly to absorb upload bursts"""
+        cached_at, snapshot = self._backlog_cache
+        if snapshot and time.monotonic() - cached_at < settings.ADMISSION_CACHE_SECONDS:
+            return snapshot
+
+        db = SessionLocal()
+        try:
+            backlog = queue_backlog(db)
+        finally:
+            db.close()
+        try:
+            broker_depth = get_redis().llen(settings.CELERY_QUEUE_NAME)
+        except Exception as e:
+            logger.error(f"Error reading broker queue depth: {str(e)}")
+            broker_depth = 0
+
+        workers = max(1, settings.CELERY_WORKER_CONCURRENCY)
+        snapshot = {
+            "jobs": max(backlog["jobs"], broker_depth),
+            "drain_seconds": backlog["seconds_p50"] / workers,
+        }
+        self._backlog_cache = (time.monotonic(), snapshot)
+        return snapshot
+
+    def check_backlog(self) -> Optional[Tuple[int, str, float]]:
+        try:
+            snapshot = self.backlog()
+        except Exception as e:
+            logger.error(f"Backlog check failed: {str(e)}")
+            return None
+
+        jobs = snapshot["jobs"]
+        drain_seconds = snapshot["drain_seconds"]
+        per_job = drain_seconds / jobs if jobs else 0.0
+
+        if jobs >= settings.MAX_QUEUE_DEPTH:
+            retry_after = (jobs - settings.MAX_QUEUE_DEPTH + 1) * per_job
+            return (
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                f"Transcription queue is full ({jobs} jobs). Please retry later.",
+                max(retry_after, settings.ADMISSION_CACHE_SECONDS)
+            )
+        if drain_seconds > settings.MAX_BACKLOG_SECONDS:
+            return (
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                f"Transcription backlog is {int(drain_seconds // 60)} minutes. Please retry later.",
+                drain_seconds - settings.MAX_BACKLOG_SECONDS
+            )
+        return None
@@ -0,0 +1,66 @@
+# backend/app/core/instrumentation.py
+import logging
+import time
+import traceback
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, update_process_rss
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """Per-route latency histogram, in-flight gauge and X-Process-Time header.
+
+    Plain ASGI rather than BaseHTTPMiddleware: no extra task per request and
+    streaming responses pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, rss_interval: float = 10.0):
+        self.app = app
+        self.rss_interval = rss_interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(time.perf_counter() - start_time)
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.error(f"Request failed: {str(e)}\n{traceback.format_exc()}")
+            if response_started:
+                raise
+            error_response = JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"detail": f"Internal server error: {str(e)}"}
+            )
+            await error_response(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # Label by route template, not raw path, to keep cardinality bounded
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code)
+            ).observe(time.perf_counter() - start_time)
+            update_process_rss("api", self.rss_interval)
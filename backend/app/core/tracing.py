@@ -0,0 +1,236 @@
+# backend/app/core/tracing.py
+"""Distributed tracing from the upload request to the worker.
+
+OpenTelemetry is optional: with TRACING_ENABLED off, or the SDK missing,
+every helper here is a no-op costing one attribute check. Context travels as
+a W3C ``traceparent`` carrier. The upload request's carrier is saved on the
+transcription row and on each outbox message; the dispatcher publishes it as
+Celery message headers, and the worker continues the trace from them. One
+trace thus covers request, commit, enqueue, publish, queue wait, decode,
+inference and result write. Sampling is decided once, at the root
+(TRACING_SAMPLE_RATE), and every later hop follows that decision.
+"""
+import functools
+import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_CARRIER_KEYS = ("traceparent", "tracestate")
+
+_tracer = None
+_provider = None
+_initialized = False
+_lock = threading.Lock()
+
+
+def _build_exporter():
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+    if settings.TRACING_EXPORTER == "console":
+        out = sys.stdout
+    else:
+        # One JSON span per line; O_APPEND keeps lines from several processes intact
+        out = open(settings.TRACING_FILE, "a", buffering=1)
+    return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + os.linesep)
+
+
+def init_tracing(role: str) -> bool:
+    """Install this process's tracer (once); returns whether spans are recorded.
+
+    Call after fork: the batch exporter runs a background thread.
+    """
+    global _tracer, _provider, _initialized
+    with _lock:
+        if _initialized:
+            return _tracer is not None
+        _initialized = True
+        if not settings.TRACING_ENABLED:
+            return False
+        try:
+            from opentelemetry import trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+            _provider = TracerProvider(
+                resource=Resource.create({"service.name": f"{settings.TRACING_SERVICE_NAME}-{role}"}),
+                # Follow the caller's decision; roots are sampled at TRACING_SAMPLE_RATE
+                sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATE))
+            )
+            _provider.add_span_processor(BatchSpanProcessor(_build_exporter()))
+            trace.set_tracer_provider(_provider)
+            _tracer = trace.get_tracer("speechtotext")
+        except ImportError as e:
+            logger.warning(f"TRACING_ENABLED is set but OpenTelemetry is not installed ({str(e)}), tracing disabled")
+            return False
+        except Exception as e:
+            logger.error(f"Error initializing tracing: {str(e)}")
+            return False
+    logger.info(
+        f"Tracing {role} to {settings.TRACING_EXPORTER} "
+        f"(sample rate {settings.TRACING_SAMPLE_RATE})"
+    )
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush buffered spans (worker child exit, dispatcher shutdown)"""
+    if _provider is not None:
+        try:
+            _provider.shutdown()
+        except Exception as e:
+            logger.error(f"Error flushing spans: {str(e)}")
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def _attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Any]]:
+    """Child span of the current one; yields the span, or None when tracing is off"""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=_attributes(attributes)) as current:
+        yield current
+
+
+def annotate(**attributes: Any) -> None:
+    """Set attributes on the current span, if it is being recorded"""
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+    current = trace.get_current_span()
+    if current.is_recording():
+        current.set_attributes(_attributes(attributes))
+
+
+def _nanoseconds(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1e9)
+
+
+def record_span(name: str, start: Optional[datetime], end: Optional[datetime], **attributes: Any) -> None:
+    """A finished span with explicit timestamps, for intervals no process saw happen (queue wait)"""
+    if _tracer is None or start is None or end is None:
+        return
+    finished = _tracer.start_span(name, start_time=_nanoseconds(start), attributes=_attributes(attributes))
+    finished.end(end_time=max(_nanoseconds(end), _nanoseconds(start)))
+
+
+def current_carrier() -> Optional[Dict[str, str]]:
+    """The active span's context as W3C headers, or None outside a trace"""
+    if _tracer is None:
+        return None
+    from opentelemetry.propagate import inject
+    carrier: Dict[str, str] = {}
+    inject(carrier)
+    return {key: carrier[key] for key in _CARRIER_KEYS if carrier.get(key)} or None
+
+
+@contextmanager
+def continue_trace(carrier: Optional[Dict[str, str]]) -> Iterator[None]:
+    """Make spans opened inside children of the context in ``carrier``"""
+    if _tracer is None or not carrier:
+        yield
+        return
+    from opentelemetry import context
+    from opentelemetry.propagate import extract
+    token = context.attach(extract(carrier))
+    try:
+        yield
+    finally:
+        context.detach(token)
+
+
+def task_carrier(request: Any) -> Optional[Dict[str, str]]:
+    """Trace headers of the Celery message being executed"""
+    headers = getattr(request, "headers", None) or {}
+    carrier = {key: headers.get(key) or getattr(request, key, None) for key in _CARRIER_KEYS}
+    return {key: value for key, value in carrier.items() if value} or None
+
+
+def traced_task(name: str) -> Callable:
+    """Run a Celery task inside a span continuing the trace from its message headers.
+
+    Goes under ``@celery_app.task``; works for bound and unbound tasks.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return func(*args, **kwargs)
+            from celery import current_task
+            request = getattr(current_task, "request", None)
+            with continue_trace(task_carrier(request)), span(name, **{"celery.task_id": getattr(request, "id", None)}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_id(carrier: Optional[Dict[str, str]]) -> Optional[str]:
+    """Trace id from a carrier (``00-<trace id>-<span id>-<flags>``), for logs and API responses"""
+    parts = (carrier or {}).get("traceparent", "").split("-")
+    return parts[1] if len(parts) == 4 else None
+
+
+class TracingMiddleware:
+    """Server span per HTTP request, continuing a caller's ``traceparent`` if it sent one.
+
+    Plain ASGI like MetricsMiddleware; requests pass straight through when
+    tracing is off.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or _tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        with continue_trace({key: headers[key] for key in _CARRIER_KEYS if key in headers}):
+            with _tracer.start_as_current_span(
+                f"{scope['method']} {scope['path']}",
+                kind=SpanKind.SERVER,
+                attributes={"http.request.method": scope["method"], "url.path": scope["path"]}
+            ) as current:
+
+                async def send_wrapper(message: Message):
+                    if message["type"] == "http.response.start":
+                        current.set_attribute("http.response.status_code", message["status"])
+                        if message["status"] >= 500:
+                            current.set_status(Status(StatusCode.ERROR))
+                    await send(message)
+
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    # Name by route template once routing has resolved it, to keep names bounded
+                    route = scope.get("route")
+                    if route is not None and getattr(route, "path", None):
+                        current.update_name(f"{scope['method']} {route.path}")
+                        current.set_attribute("http.route", route.path)
@@ -1,21 +1,23 @@
 # backend/app/database.py
-from sqlalchemy import create_engine, exc, text
+from sqlalchemy import create_engine, exc, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from fastapi import HTTPException
 from .config import settings
+from .utils.metrics import DB_POOL_WAIT, DB_POOL_TIMEOUTS
 import logging
 import time
 from contextlib import contextmanager
+from typing import List
 
 logger = logging.getLogger(__name__)
 
 # Configure database engine with pool settings
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_size=5,                  # Maximum number of permanent connections
-    max_overflow=10,              # Maximum number of additional connections
-    pool_timeout=30,              # Timeout for getting connection from pool
+    pool_size=settings.DB_POOL_SIZE,          # Maximum number of permanent connections
+    max_overflow=settings.DB_MAX_OVERFLOW,    # Maximum number of additional connections
+    pool_timeout=settings.DB_POOL_TIMEOUT,    # Timeout for getting connection from pool
     pool_recycle=1800,           # Recycle connections after 30 minutes
     pool_pre_ping=True,          # Enable connection health checks
 )
@@ -27,9 +29,17 @@ def get_db():
     """FastAPI dependency for database sessions"""
     db = SessionLocal()
     try:
+        # Time the pool checkout separately from the health query
+        wait_start = time.perf_counter()
+        db.connection()
+        DB_POOL_WAIT.observe(time.perf_counter() - wait_start)
         # Test the connection with text() wrapper
         db.execute(text("SELECT 1"))
         yield db
+    except exc.TimeoutError as e:
+        DB_POOL_TIMEOUTS.inc()
+        logger.error(f"Database pool exhausted: {str(e)}")
+        raise HTTPException(status_code=503, detail="Database connection pool exhausted")
     except exc.OperationalError as e:
         logger.error(f"Database connection error: {str(e)}")
         # Try to reconnect
@@ -69,10 +79,47 @@ def get_db_context():
     finally:
         db.close()
 
+def upgrade_schema(bind) -> List[str]:
+    """Add the columns and indexes the models gained since their tables were created.
+
+    create_all() skips tables that already exist, so an existing database is
+    brought up to the models here: ADD COLUMN for each missing column (all
+    columns added after the first release are nullable) and CREATE INDEX for
+    each missing index. Safe to run repeatedly; returns the columns added.
+    """
+    inspector = inspect(bind)
+    quote = bind.dialect.identifier_preparer.quote
+    added = []
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(f"Cannot add required column {table.name}.{column.name} to existing rows")
+                conn.execute(text(
+                    f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)}"
+                    f" {column.type.compile(dialect=bind.dialect)}"
+                ))
+                added.append(f"{table.name}.{column.name}")
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind, checkfirst=True)
+    return added
+
 def init_db():
-    """Initialize database tables"""
+    """Create missing tables and bring existing ones up to the models"""
+    from . import models  # noqa: F401  (registers the tables on Base)
+    from .utils.search import ensure_search_schema
     try:
         Base.metadata.create_all(bind=engine)
+        added = upgrade_schema(engine)
+        if added:
+            logger.info(f"Added columns: {', '.join(added)}")
+        ensure_search_schema(engine)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {str(e)}")
@@ -0,0 +1,18 @@
+# backend/app/engines/__init__.py
+from .base import TranscriptionEngine
+from .registry import (
+    available_engines, engine_name_for, get_engine, loaded_engines, preload_engines, register_engine
+)
+
+# Register the built-in engines; heavy ML imports happen lazily in load()
+from . import whisper_engine, faster_whisper_engine, fake  # noqa: F401,E402
+
+__all__ = [
+    "TranscriptionEngine",
+    "available_engines",
+    "engine_name_for",
+    "get_engine",
+    "loaded_engines",
+    "preload_engines",
+    "register_engine",
+]
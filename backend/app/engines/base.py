@@ -0,0 +1,77 @@
+# backend/app/engines/base.py
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+AudioInput = Union[np.ndarray, str]
+
+
+class TranscriptionEngine(ABC):
+    """A speech-to-text backend bound to one model size.
+
+    ``audio`` is either 16 kHz mono float32 samples or a path ffmpeg can read.
+    Results use Whisper's shape: ``{"text", "segments", "language"}`` where each
+    segment carries at least id/start/end/text/avg_logprob/no_speech_prob.
+    """
+
+    name: str = ""
+    # Whether transcribe() may run on several threads at once against one model
+    concurrent_safe: bool = True
+
+    def __init__(self, model_size: str):
+        self.model_size = model_size
+        self.model = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.model is not None
+
+    @abstractmethod
+    def load(self) -> None:
+        """Load model weights; called once per process by the registry"""
+
+    @classmethod
+    def fork_safe(cls) -> bool:
+        """Whether a model loaded before fork() stays usable in forked children"""
+        return True
+
+    def load_shared(self) -> None:
+        """Load in a parent process whose children will share the weights copy-on-write"""
+        self.load()
+
+    def detect_language(self, audio: AudioInput) -> Optional[str]:
+        """Spoken language of the input, or None to let transcribe() detect it"""
+        return None
+
+    @abstractmethod
+    def stream_segments(
+        self,
+        audio: AudioInput,
+        language: Optional[str] = None,
+        **options: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield segments as they are decoded"""
+
+    def transcribe(
+        self,
+        audio: AudioInput,
+        language: Optional[str] = None,
+        **options: Any
+    ) -> Dict[str, Any]:
+        """Transcribe a whole input"""
+        segments = list(self.stream_segments(audio, language=language, **options))
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": language,
+        }
+
+    def transcribe_batch(
+        self,
+        chunks: List[np.ndarray],
+        language: Optional[str] = None,
+        **options: Any
+    ) -> List[Dict[str, Any]]:
+        """Transcribe several short clips; engines with batched decoding override this"""
+        return [self.transcribe(chunk, language=language, **options) for chunk in chunks]
@@ -0,0 +1,98 @@
+# backend/app/engines/fake.py
+import hashlib
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+from ..config import settings
+from .base import AudioInput, TranscriptionEngine
+from .registry import register_engine
+
+_VOCABULARY = (
+    "the", "a", "meeting", "audio", "record", "speech", "model", "queue", "worker",
+    "result", "minute", "second", "today", "project", "update", "status", "team",
+    "plan", "review", "data", "file", "upload", "call", "note", "question"
+)
+_FRAME = 480  # 30 ms at 16 kHz
+
+
+@register_engine("fake")
+class FakeEngine(TranscriptionEngine):
+    """Deterministic stand-in for Whisper, used for offline benchmarks.
+
+    Burns CPU for ``rtf`` seconds per second of audio (so concurrency and
+    contention behave like real inference) and returns Whisper-shaped output
+    derived from the audio energy, so identical input yields identical text.
+    """
+
+    def __init__(self, model_size: str, rtf: Optional[float] = None, segment_seconds: float = 5.0):
+        super().__init__(model_size)
+        self.rtf = settings.FAKE_ENGINE_RTF if rtf is None else rtf
+        self.segment_seconds = segment_seconds
+        self.weights = np.zeros(0, np.float32)
+
+    def load(self) -> None:
+        if settings.FAKE_ENGINE_LOAD_SECONDS:
+            time.sleep(settings.FAKE_ENGINE_LOAD_SECONDS)
+        # Stand-in for model weights so memory benchmarks have something to share
+        self.weights = np.ones(int(settings.FAKE_ENGINE_WEIGHTS_MB * 2**20) // 4, np.float32)
+        self.model = self
+
+    def _burn(self, seconds: float) -> None:
+        deadline = time.perf_counter() + seconds
+        block = np.random.default_rng(0).standard_normal(4096).astype(np.float32)
+        while time.perf_counter() < deadline:
+            np.fft.rfft(block)
+
+    def _words(self, seed: bytes, count: int) -> str:
+        digest = hashlib.sha256(seed).digest()
+        return " ".join(_VOCABULARY[digest[i % len(digest)] % len(_VOCABULARY)] for i in range(count))
+
+    def detect_language(self, audio: AudioInput) -> Optional[str]:
+        return "en"
+
+    def stream_segments(self, audio: AudioInput, language: Optional[str] = None, **options: Any) -> Iterator[Dict[str, Any]]:
+        if isinstance(audio, str):
+            from ..utils.media import decode_audio
+            audio = decode_audio(audio)
+
+        sample_rate = settings.SAMPLE_RATE
+        duration = len(audio) / sample_rate
+        frames = len(audio) // _FRAME
+        energy = (
+            np.sqrt(np.mean(audio[:frames * _FRAME].reshape(frames, _FRAME) ** 2, axis=1))
+            if frames else np.zeros(0)
+        )
+        voiced = energy > 0.01
+
+        frames_per_segment = max(1, int(self.segment_seconds * sample_rate / _FRAME))
+        segment_id = 0
+        for index, first in enumerate(range(0, frames, frames_per_segment)):
+            # Spread the compute cost over the input like a real decoder would
+            self._burn(min(frames_per_segment, frames - first) * _FRAME / sample_rate * self.rtf)
+            if len(self.weights):
+                self.weights.sum()  # read every weight page, as a forward pass would
+            window = voiced[first:first + frames_per_segment]
+            if not window.any():
+                continue
+            word_count = max(1, int(window.mean() * self.segment_seconds * 2.5))
+            seed = f"{self.model_size}:{index}:{energy[first:first + frames_per_segment].sum():.3f}".encode()
+            yield {
+                "id": segment_id,
+                "seek": first * _FRAME,
+                "start": first * _FRAME / sample_rate,
+                "end": min(duration, (first + frames_per_segment) * _FRAME / sample_rate),
+                "text": " " + self._words(seed, word_count),
+                "tokens": [],
+                "temperature": 0.0,
+                "avg_logprob": -0.25,
+                "compression_ratio": 1.5,
+                "no_speech_prob": float(1.0 - window.mean()),
+            }
+            segment_id += 1
+
+    def transcribe(self, audio: AudioInput, language: Optional[str] = None, **options: Any) -> Dict[str, Any]:
+        result = super().transcribe(audio, language=language, **options)
+        result["language"] = language or "en"
+        return result
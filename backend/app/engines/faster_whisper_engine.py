@@ -0,0 +1,70 @@
+# backend/app/engines/faster_whisper_engine.py
+from typing import Any, Dict, Iterator, Optional
+
+from ..config import settings
+from .base import AudioInput, TranscriptionEngine
+from .registry import register_engine
+
+# openai-whisper option names that faster-whisper spells differently
+_OPTION_ALIASES = {"logprob_threshold": "log_prob_threshold"}
+_UNSUPPORTED_OPTIONS = {"fp16", "verbose", "task"}
+
+
+@register_engine("faster-whisper")
+class FasterWhisperEngine(TranscriptionEngine):
+    """CTranslate2 backend (faster-whisper): int8 CPU inference, streamed segments"""
+
+    def load(self) -> None:
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(
+            self.model_size,
+            device=settings.FASTER_WHISPER_DEVICE,
+            compute_type=settings.FASTER_WHISPER_COMPUTE_TYPE,
+            cpu_threads=settings.FASTER_WHISPER_CPU_THREADS,
+        )
+
+    @classmethod
+    def fork_safe(cls) -> bool:
+        # CTranslate2 starts its worker threads when the model is created; they don't survive fork()
+        return False
+
+    def _run(self, audio: AudioInput, language: Optional[str], options: Dict[str, Any]):
+        kwargs = {
+            _OPTION_ALIASES.get(key, key): value
+            for key, value in options.items()
+            if key not in _UNSUPPORTED_OPTIONS
+        }
+        # openai-whisper means greedy by None; faster-whisper wants explicit counts
+        for key in ("beam_size", "best_of"):
+            if key in kwargs and kwargs[key] is None:
+                kwargs[key] = 1
+        segments, info = self.model.transcribe(audio, language=language, **kwargs)
+        return (_to_dict(segment) for segment in segments), info
+
+    def stream_segments(self, audio: AudioInput, language: Optional[str] = None, **options: Any) -> Iterator[Dict[str, Any]]:
+        segments, _ = self._run(audio, language, options)
+        yield from segments
+
+    def transcribe(self, audio: AudioInput, language: Optional[str] = None, **options: Any) -> Dict[str, Any]:
+        segments, info = self._run(audio, language, options)
+        segments = list(segments)
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": info.language,
+        }
+
+
+def _to_dict(segment) -> Dict[str, Any]:
+    return {
+        "id": segment.id,
+        "seek": segment.seek,
+        "start": segment.start,
+        "end": segment.end,
+        "text": segment.text,
+        "tokens": list(segment.tokens),
+        "temperature": segment.temperature,
+        "avg_logprob": segment.avg_logprob,
+        "compression_ratio": segment.compression_ratio,
+        "no_speech_prob": segment.no_speech_prob,
+    }
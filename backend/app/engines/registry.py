@@ -0,0 +1,92 @@
+# backend/app/engines/registry.py
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple, Type
+
+from ..config import settings
+from .base import TranscriptionEngine
+
+logger = logging.getLogger(__name__)
+
+_ENGINES: Dict[str, Type[TranscriptionEngine]] = {}
+_loaded: Dict[Tuple[str, str], TranscriptionEngine] = {}
+_lock = threading.Lock()
+
+
+def register_engine(name: str) -> Callable[[Type[TranscriptionEngine]], Type[TranscriptionEngine]]:
+    """Class decorator adding an engine to the registry"""
+    def decorator(cls: Type[TranscriptionEngine]) -> Type[TranscriptionEngine]:
+        cls.name = name
+        _ENGINES[name] = cls
+        return cls
+    return decorator
+
+
+def available_engines() -> List[str]:
+    return sorted(_ENGINES)
+
+
+def engine_name_for(model_size: str) -> str:
+    """Configured engine for a model: per-model override, else the default"""
+    return settings.TRANSCRIPTION_ENGINE_OVERRIDES.get(model_size, settings.TRANSCRIPTION_ENGINE)
+
+
+def _load(name: str, model_size: str, shared: bool = False) -> TranscriptionEngine:
+    if name not in _ENGINES:
+        raise ValueError(f"Unknown transcription engine '{name}'. Available: {available_engines()}")
+    engine = _ENGINES[name](model_size)
+    logger.info(f"Loading {name} engine for model: {model_size}")
+    started = time.perf_counter()
+    if shared:
+        engine.load_shared()
+    else:
+        engine.load()
+    load_seconds = time.perf_counter() - started
+    logger.info(f"Loaded {name}/{model_size} in {load_seconds:.2f}s")
+
+    from ..utils.metrics import MODEL_LOAD_DURATION
+    MODEL_LOAD_DURATION.labels(model=model_size).observe(load_seconds)
+    return engine
+
+
+def get_engine(model_size: str) -> TranscriptionEngine:
+    """Loaded engine for a model, cached for the life of the process"""
+    name = engine_name_for(model_size)
+    key = (name, model_size)
+    engine = _loaded.get(key)
+    if engine is not None:
+        return engine
+
+    with _lock:
+        engine = _loaded.get(key)
+        if engine is None:
+            engine = _load(name, model_size)
+            _loaded[key] = engine
+    return engine
+
+
+def preload_engines(model_sizes: Iterable[str]) -> List[Tuple[str, str]]:
+    """Load models in a parent process so forked children share the weights.
+
+    Engines that cannot survive fork() are skipped and load lazily in each
+    child as before. Returns the (engine, model) pairs that were preloaded.
+    """
+    preloaded = []
+    with _lock:
+        for model_size in model_sizes:
+            name = engine_name_for(model_size)
+            key = (name, model_size)
+            if key in _loaded:
+                preloaded.append(key)
+                continue
+            if name not in _ENGINES or not _ENGINES[name].fork_safe():
+                logger.warning(f"Not preloading {name}/{model_size}: engine is not fork-safe here")
+                continue
+            _loaded[key] = _load(name, model_size, shared=True)
+            preloaded.append(key)
+    return preloaded
+
+
+def loaded_engines() -> List[Tuple[str, str]]:
+    return list(_loaded)
@@ -0,0 +1,111 @@
+# backend/app/engines/whisper_engine.py
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from ..config import settings
+from .base import AudioInput, TranscriptionEngine
+from .registry import register_engine
+
+
+@register_engine("whisper")
+class WhisperEngine(TranscriptionEngine):
+    """Reference openai-whisper (PyTorch) implementation"""
+
+    # transcribe() installs kv-cache hooks on the shared model, so calls must not overlap
+    concurrent_safe = False
+
+    def __init__(self, model_size: str):
+        super().__init__(model_size)
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        import whisper
+        self.model = whisper.load_model(self.model_size)
+
+    @classmethod
+    def fork_safe(cls) -> bool:
+        # A CUDA context cannot survive fork(); CPU tensors are plain shared pages
+        import torch
+        return not torch.cuda.is_available()
+
+    def load_shared(self) -> None:
+        import torch
+        # Keep the parent out of OpenMP parallel regions: children would inherit a dead thread pool
+        threads = torch.get_num_threads()
+        torch.set_num_threads(1)
+        try:
+            self.load()
+        finally:
+            torch.set_num_threads(threads)
+
+    def detect_language(self, audio: AudioInput) -> Optional[str]:
+        import whisper
+        if isinstance(audio, str):
+            audio = whisper.load_audio(audio)
+        # Whisper detects from the first 30 s window, exactly as transcribe() would
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(audio), n_mels=self.model.dims.n_mels
+        ).to(self.model.device)
+        with self._lock:
+            _, probs = self.model.detect_language(mel)
+        return max(probs, key=probs.get)
+
+    def transcribe(self, audio: AudioInput, language: Optional[str] = None, **options: Any) -> Dict[str, Any]:
+        options.setdefault("fp16", self.model.device.type == "cuda")
+        with self._lock:
+            result = self.model.transcribe(audio, language=language, task="transcribe", **options)
+        return {
+            "text": result["text"],
+            "segments": result.get("segments", []),
+            "language": result.get("language", language),
+        }
+
+    def transcribe_batch(self, chunks: List[np.ndarray], language: Optional[str] = None, **options: Any) -> List[Dict[str, Any]]:
+        """Decode up-to-30 s clips as one batch: a single encoder/decoder pass for all of them"""
+        import torch
+        import whisper
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(chunk.astype(np.float32)), n_mels=self.model.dims.n_mels)
+            for chunk in chunks
+        ]).to(self.model.device)
+        temperature = options.get("temperature", 0.0)
+        decode_options = whisper.DecodingOptions(
+            language=language,
+            temperature=temperature[0] if isinstance(temperature, (tuple, list)) else temperature,
+            without_timestamps=True,
+            fp16=options.get("fp16", self.model.device.type == "cuda"),
+        )
+        with self._lock:
+            decoded = self.model.decode(mel, decode_options)
+
+        results = []
+        for chunk, result in zip(chunks, decoded):
+            # Same silence rule transcribe() applies per window
+            silent = (
+                result.no_speech_prob > options.get("no_speech_threshold", 0.6)
+                and result.avg_logprob < options.get("logprob_threshold", -1.0)
+            )
+            text = "" if silent else " " + result.text.strip()
+            results.append({
+                "text": text,
+                "segments": [] if silent else [{
+                    "id": 0,
+                    "seek": 0,
+                    "start": 0.0,
+                    "end": len(chunk) / settings.SAMPLE_RATE,
+                    "text": text,
+                    "tokens": result.tokens,
+                    "temperature": result.temperature,
+                    "avg_logprob": result.avg_logprob,
+                    "compression_ratio": result.compression_ratio,
+                    "no_speech_prob": result.no_speech_prob,
+                }],
+                "language": result.language,
+            })
+        return results
+
+    def stream_segments(self, audio: AudioInput, language: Optional[str] = None, **options: Any) -> Iterator[Dict[str, Any]]:
+        # openai-whisper only returns once the whole input is decoded
+        yield from self.transcribe(audio, language=language, **options)["segments"]
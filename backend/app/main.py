@@ -1,25 +1,26 @@
 # backend/app/main.py
 from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 import logging
 from typing import List
-import time
 from sqlalchemy import text
-from .api.endpoints import transcription
+from .api.endpoints import transcription, stats, streaming
 from .config import settings
-from .database import engine, SessionLocal
-from . import models
+from .database import SessionLocal
+from .core.admission import AdmissionControlMiddleware
+from .core.instrumentation import MetricsMiddleware
+from .core.tracing import TracingMiddleware, init_tracing, shutdown_tracing
+from .storage import get_storage
+from .utils.metrics import build_registry, render_latest, mark_process_dead
 import uvicorn
-import traceback
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Schema is created by `python -m app.manage init-db` before the API starts, not on import
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -27,6 +28,9 @@ app = FastAPI(
     description="Speech to Text API with Whisper",
 )
 
+# Admission control (added first so CORS wraps its 429/503 responses)
+app.add_middleware(AdmissionControlMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -38,26 +42,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    try:
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
-    except Exception as e:
-        logger.error(f"Request failed: {str(e)}\n{traceback.format_exc()}")
-        process_time = time.time() - start_time
-        error_response = JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"detail": f"Internal server error: {str(e)}"}
-        )
-        error_response.headers["X-Process-Time"] = str(process_time)
-        return error_response
+# Request timing and metrics (so rejected requests are counted too)
+app.add_middleware(MetricsMiddleware)
+
+# Server span per request (outermost, so the trace covers everything above; no-op unless TRACING_ENABLED)
+app.add_middleware(TracingMiddleware)
 
 # Error handlers
 @app.exception_handler(RequestValidationError)
@@ -78,7 +70,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         status_code=exc.status_code,
         content={
             "detail": exc.detail
-        }
+        },
+        headers=exc.headers
     )
 
 # Include router
@@ -87,6 +80,16 @@ app.include_router(
     prefix="/transcription",
     tags=["transcription"]
 )
+app.include_router(
+    streaming.router,
+    prefix="/transcription",
+    tags=["streaming"]
+)
+app.include_router(
+    stats.router,
+    prefix="/stats",
+    tags=["stats"]
+)
 
 # Health check endpoints
 @app.get("/health")
@@ -140,13 +143,23 @@ async def db_health_check():
             detail="Database connection failed"
         )
 
+metrics_registry = build_registry()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for every API worker process"""
+    body, content_type = render_latest(metrics_registry)
+    return Response(content=body, media_type=content_type)
+
 # Startup and shutdown events
 @app.on_event("startup")
 async def startup_event():
     logger.info("Application starting up...")
     try:
+        init_tracing("api")
+
         # Create necessary directories
-        settings.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        get_storage().prepare()
         settings.RECORDINGS_DIR.mkdir(parents=True, exist_ok=True)
         
         # Test database connection
@@ -165,6 +178,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Application shutting down...")
+    mark_process_dead()
+    shutdown_tracing()
 
 # Root endpoint
 @app.get("/")
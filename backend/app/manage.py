@@ -0,0 +1,50 @@
+# backend/app/manage.py
+"""Operational commands that must not run on the API import path.
+
+    python -m app.manage init-db
+    python -m app.manage compress-texts
+    python -m app.manage index-search
+"""
+import argparse
+import logging
+import sys
+from typing import List, Optional
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("init-db", help="create missing tables, add missing columns and indexes, and the full-text search schema")
+    compress = commands.add_parser("compress-texts", help="move plain transcript text into transcription_texts")
+    compress.add_argument("--batch-size", type=int, default=200)
+    index = commands.add_parser("index-search", help="(re)build the full-text index and its excerpts")
+    index.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "init-db":
+        from .database import init_db
+        init_db()
+    elif args.command == "compress-texts":
+        from .database import SessionLocal
+        from .utils.transcript_text import compress_legacy_texts
+        db = SessionLocal()
+        try:
+            moved, raw_bytes, stored_bytes = compress_legacy_texts(db, args.batch_size)
+        finally:
+            db.close()
+        logging.info(f"Compressed {moved} transcripts: {raw_bytes} bytes of text stored in {stored_bytes}")
+    elif args.command == "index-search":
+        from .database import SessionLocal
+        from .utils.search import backfill_search_index
+        db = SessionLocal()
+        try:
+            indexed = backfill_search_index(db, args.batch_size)
+        finally:
+            db.close()
+        logging.info(f"Indexed {indexed} transcripts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 # backend/app/models.py
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, LargeBinary, Float, JSON, Index, ForeignKey
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -7,13 +8,81 @@ class Transcription(Base):
     __tablename__ = "transcriptions"
 
     id = Column(Integer, primary_key=True, index=True)
-    filename = Column(String, nullable=False)
+    filename = Column(String, nullable=False, index=True)
+    # Name the upload was first stored under; filename changes when it is archived
+    upload_key = Column(String, nullable=True, index=True)
     original_filename = Column(String, nullable=False)
     file_size = Column(Integer)
     status = Column(String, default="pending")  # pending, processing, completed, failed
     model_size = Column(String)
     language = Column(String)
-    text = Column(Text, nullable=True)
+    decoding_profile = Column(String, nullable=True)  # key of settings.DECODING_PROFILES
+    client_preprocessing = Column(String, nullable=True)  # key of settings.CLIENT_PREPROCESSING, None = original file
+    media_format = Column(String, nullable=True)  # container sniffed from the upload
+    audio_codec = Column(String, nullable=True)  # codec of the stored audio, after ingest
+    # Rows written before transcription_texts; new transcripts go there, compressed
+    text = deferred(Column(Text, nullable=True))
+    text_preview = Column(Text, nullable=True)  # first TEXT_PREVIEW_CHARS characters
+    text_length = Column(Integer, nullable=True)  # characters in the full transcript
+    quality = Column(String, nullable=True)  # draft (preview model) or final (requested model)
+    preview_task_id = Column(String, nullable=True)
     error = Column(Text, nullable=True)
+    # Packed by app.utils.segments; deferred so status polls don't load it
+    segments = deferred(Column(LargeBinary, nullable=True))
+    audio_duration = Column(Float, nullable=True)  # seconds of decoded audio
+    processing_time = Column(Float, nullable=True)  # wall seconds from start to result
+    stage_timings = Column(JSON, nullable=True)  # seconds per processing stage
+    hardware_tag = Column(String, nullable=True)
+    owner = Column(String, nullable=True, index=True)  # client:<X-Client-Id> or ip:<address>, for fair share
+    task_id = Column(String, nullable=True)  # Celery id of the transcription task
+    trace_context = Column(JSON, nullable=True)  # W3C traceparent of the upload request, see app.core.tracing
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)  # released to the outbox
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    completed_at = Column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=True)  # deliveries that claimed the job; see app.utils.outbox.reap_stale_processing
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    stored_size = Column(Integer, nullable=True)  # bytes stored: after ingest, then after archiving
+    archived_at = Column(DateTime(timezone=True), nullable=True)
+    audio_purged_at = Column(DateTime(timezone=True), nullable=True)  # source audio evicted by cleanup
+
+    __table_args__ = (
+        # Queue scans (ETAs, backlog, fair share, reaper) filter on status and walk by id
+        Index("ix_transcriptions_status_id", "status", "id"),
+    )
+
+
+class TranscriptionText(Base):
+    """Full transcript, compressed and kept off the transcriptions row; see app.utils.transcript_text"""
+    __tablename__ = "transcription_texts"
+
+    transcription_id = Column(Integer, ForeignKey("transcriptions.id", ondelete="CASCADE"), primary_key=True)
+    codec = Column(String, nullable=False)  # zstd or zlib
+    data = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)  # UTF-8 bytes before compression
+
+
+class TaskOutbox(Base):
+    """Task messages committed with the rows they refer to; published by app.utils.outbox"""
+    __tablename__ = "task_outbox"
+
+    id = Column(Integer, primary_key=True)
+    task_name = Column(String, nullable=False)
+    args = Column(JSON, nullable=False)
+    queue = Column(String, nullable=True)  # None: route by celery_app.conf.task_routes
+    task_id = Column(String, nullable=False)
+    transcription_id = Column(Integer, nullable=True, index=True)
+    trace_context = Column(JSON, nullable=True)  # sent as the message's trace headers
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)  # backoff after a failed publish
+    published_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The dispatcher only ever scans unpublished rows
+        Index(
+            "ix_task_outbox_unpublished", "id",
+            postgresql_where=published_at.is_(None),
+            sqlite_where=published_at.is_(None)
+        ),
+    )
@@ -0,0 +1,55 @@
+# backend/app/storage/__init__.py
+import uuid
+from pathlib import PurePosixPath
+from typing import Optional
+
+from ..config import settings
+from .base import ObjectStorage
+from .cache import ObjectCache
+from .local import LocalStorage
+from .s3 import S3Storage
+
+_storage: Optional[ObjectStorage] = None
+
+
+def build_storage(backend: Optional[str] = None) -> ObjectStorage:
+    backend = backend or settings.STORAGE_BACKEND
+    if backend == "local":
+        return LocalStorage(settings.UPLOAD_DIR, chunk_size=settings.CHUNK_SIZE)
+    if backend == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            cache=ObjectCache(settings.STORAGE_CACHE_DIR, settings.STORAGE_CACHE_MAX_MB * 1024 * 1024),
+            prefix=settings.S3_PREFIX,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            part_size=settings.S3_PART_SIZE_MB * 1024 * 1024,
+            max_concurrency=settings.S3_MAX_CONCURRENCY
+        )
+    raise ValueError(f"Unknown storage backend: {backend}. Available: ['local', 's3']")
+
+
+def get_storage() -> ObjectStorage:
+    """The process-wide storage backend selected by STORAGE_BACKEND"""
+    global _storage
+    if _storage is None:
+        _storage = build_storage()
+    return _storage
+
+
+def new_object_key(filename: Optional[str]) -> str:
+    """Unique key for an upload, keeping the original suffix for ffmpeg"""
+    return f"{uuid.uuid4().hex}{PurePosixPath(filename or '').suffix.lower()}"
+
+
+__all__ = [
+    "LocalStorage",
+    "ObjectCache",
+    "ObjectStorage",
+    "S3Storage",
+    "build_storage",
+    "get_storage",
+    "new_object_key",
+]
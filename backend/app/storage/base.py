@@ -0,0 +1,63 @@
+# backend/app/storage/base.py
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+
+class ObjectStorage(ABC):
+    """Where uploaded audio lives, addressed by key.
+
+    Keys are relative, ``/``-separated names (``ab12cd.wav``) stored in
+    ``Transcription.filename``; the API, workers and cleanup only ever pass
+    keys around, so workers need no shared filesystem with the API. Rows
+    written before storage backends existed hold absolute paths, which the
+    local backend still resolves as-is.
+    """
+
+    name: str = ""
+
+    def prepare(self) -> None:
+        """Create whatever has to exist before the first write (directory, bucket)"""
+
+    @abstractmethod
+    def put_stream(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> int:
+        """Write a file-like object to ``key`` without holding it in memory; returns bytes written"""
+
+    @abstractmethod
+    def put_file(self, key: str, path: Path) -> int:
+        """Move a local file to ``key`` (the local file is consumed); returns bytes stored"""
+
+    @abstractmethod
+    def read_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = 1024 * 1024
+    ) -> Iterator[bytes]:
+        """Yield bytes ``start``..``end`` inclusive (to the end when None) in chunks"""
+
+    @abstractmethod
+    def size(self, key: str) -> Optional[int]:
+        """Object size in bytes, or None when it doesn't exist"""
+
+    def exists(self, key: str) -> bool:
+        return self.size(key) is not None
+
+    @abstractmethod
+    def delete(self, key: str) -> int:
+        """Remove an object, returning bytes freed; a missing object is not an error"""
+
+    @abstractmethod
+    def local_path(self, key: str) -> Path:
+        """A local file with the object's content for ffmpeg to read.
+
+        Raises FileNotFoundError when the object doesn't exist. Remote
+        backends download into the worker cache; the file stays valid at
+        least until the next local_path() call in the same thread, even
+        when other workers on the node fill the cache meanwhile.
+        """
+
+    def usage_percent(self) -> Optional[float]:
+        """Used share of the backing volume, or None when it has no fixed capacity"""
+        return None
@@ -0,0 +1,154 @@
+# backend/app/storage/cache.py
+import fcntl
+import hashlib
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterator, Optional, Set
+
+from ..config import settings
+from ..utils.metrics import STORAGE_CACHE
+
+logger = logging.getLogger(__name__)
+
+_LOCK_NAME = ".lock"
+_LEASE_PREFIX = ".lease."
+
+
+class ObjectCache:
+    """Size-bounded, least-recently-used local copies of remote objects.
+
+    The preview, final and archive tasks of one job usually run on the same
+    node within minutes of each other, so each object is downloaded once per
+    node instead of once per task. Safe to share between the worker processes
+    of a node: downloads land under a temporary name and are renamed into
+    place, and access time is tracked through the file mtime.
+
+    Every thread that gets a file holds a lease on it (a ``.lease.*`` file
+    naming it) until its next get(), and eviction never removes a leased
+    file. Leasing and evicting take an flock on the directory, so a file
+    can't be evicted between being found and being leased. Leases of exited
+    threads and processes are dropped; those of other hosts sharing the
+    directory expire after CELERY_TASK_TIME_LIMIT.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._host = socket.gethostname()
+
+    def path_for(self, key: str) -> Path:
+        # Hashed names keep the key's suffix so ffmpeg can still guess the container
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return self.directory / f"{digest}{PurePosixPath(key).suffix.lower()}"
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / _LOCK_NAME, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _lease(self, path: Path) -> None:
+        """Pin ``path`` for this thread, releasing the file it pinned before (call under _locked)"""
+        lease = self.directory / f"{_LEASE_PREFIX}{self._host}.{os.getpid()}.{threading.get_ident()}"
+        lease.write_text(path.name)
+
+    def _lease_alive(self, lease: Path) -> bool:
+        host, _, owner = lease.name[len(_LEASE_PREFIX):].rpartition(".")
+        host, _, pid = host.rpartition(".")
+        if host != self._host:
+            return time.time() - lease.stat().st_mtime < settings.CELERY_TASK_TIME_LIMIT
+        if int(pid) == os.getpid():
+            return int(owner) in {thread.ident for thread in threading.enumerate()}
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _leased(self) -> Set[str]:
+        """Names of leased files; leases of threads and processes that are gone are removed"""
+        names = set()
+        for lease in self.directory.glob(f"{_LEASE_PREFIX}*"):
+            try:
+                if self._lease_alive(lease):
+                    names.add(lease.read_text().strip())
+                else:
+                    lease.unlink(missing_ok=True)
+            except (FileNotFoundError, ValueError):
+                continue
+        return names
+
+    def get(self, key: str, size: Optional[int], download: Callable[[Path], None]) -> Path:
+        """Cached copy of ``key``, calling ``download(temp_path)`` on a miss or a size mismatch.
+
+        The file stays in place at least until this thread's next get().
+        """
+        path = self.path_for(key)
+        with self._locked():
+            try:
+                if size is not None and path.stat().st_size == size:
+                    os.utime(path)
+                    self._lease(path)
+                    STORAGE_CACHE.labels(result="hit").inc()
+                    return path
+            except FileNotFoundError:
+                pass
+
+        STORAGE_CACHE.labels(result="miss").inc()
+        temp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            download(temp)
+        except Exception:
+            temp.unlink(missing_ok=True)
+            raise
+        with self._locked():
+            os.replace(temp, path)
+            self._lease(path)
+            self._evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """Drop least recently used, unleased files until the cache fits in max_bytes; returns bytes freed"""
+        with self._locked():
+            return self._evict(keep)
+
+    def _evict(self, keep: Optional[Path] = None) -> int:
+        entries = []
+        for path in self.directory.iterdir():
+            try:
+                if path.is_file() and not path.name.startswith("."):
+                    stat = path.stat()
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return 0
+        leased = self._leased()
+        freed = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            if path == keep or path.name in leased:
+                continue
+            try:
+                path.unlink()
+                total -= size
+                freed += size
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.error(f"Error evicting cached object {path}: {str(e)}")
+        return freed
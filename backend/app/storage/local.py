@@ -0,0 +1,97 @@
+# backend/app/storage/local.py
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from .base import ObjectStorage
+
+
+class LocalStorage(ObjectStorage):
+    """Objects as files under one directory (a single host or a shared volume)"""
+
+    name = "local"
+
+    def __init__(self, root: Path, chunk_size: int = 1024 * 1024):
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+
+    def prepare(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        path = Path(key)
+        # Rows from before storage backends hold absolute paths
+        if path.is_absolute():
+            return path
+        resolved = (self.root / path).resolve()
+        if self.root.resolve() not in resolved.parents:
+            raise ValueError(f"Storage key escapes the storage root: {key}")
+        return resolved
+
+    def put_stream(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> int:
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name so readers never see a partial file
+        temp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp, "wb") as out:
+                shutil.copyfileobj(stream, out, self.chunk_size)
+            os.replace(temp, target)
+        except Exception:
+            temp.unlink(missing_ok=True)
+            raise
+        return target.stat().st_size
+
+    def put_file(self, key: str, path: Path) -> int:
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # A rename when both are on the same volume, a copy otherwise
+        shutil.move(str(path), str(target))
+        return target.stat().st_size
+
+    def read_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = 1024 * 1024
+    ) -> Iterator[bytes]:
+        with open(self.path(key), "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def size(self, key: str) -> Optional[int]:
+        try:
+            return self.path(key).stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def delete(self, key: str) -> int:
+        path = self.path(key)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            return size
+        except FileNotFoundError:
+            return 0
+
+    def local_path(self, key: str) -> Path:
+        path = self.path(key)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found at path: {path}")
+        return path
+
+    def usage_percent(self) -> Optional[float]:
+        if not self.root.exists():
+            return None
+        usage = shutil.disk_usage(self.root)
+        return 100.0 * usage.used / usage.total
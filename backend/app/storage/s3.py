@@ -0,0 +1,168 @@
+# backend/app/storage/s3.py
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from ..utils.metrics import STORAGE_BYTES
+from .base import ObjectStorage
+from .cache import ObjectCache
+
+
+class S3Storage(ObjectStorage):
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, Ceph RGW, R2).
+
+    Uploads stream through boto3's managed transfer, which switches to a
+    multipart upload past one part size, so memory stays at a few parts
+    however large the file. Workers read through an ObjectCache on local disk.
+    boto3 is imported on first use, so only processes that touch the bucket
+    need it installed.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        cache: ObjectCache,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4
+    ):
+        self.bucket = bucket
+        self.cache = cache
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.endpoint_url = endpoint_url or None
+        self.region = region or None
+        self.access_key_id = access_key_id or None
+        self.secret_access_key = secret_access_key or None
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
+        self._client = None
+        self._pid = None
+
+    @property
+    def client(self):
+        # One client per process: boto3 clients are thread-safe but must not cross fork()
+        if self._client is None or self._pid != os.getpid():
+            try:
+                import boto3
+                from botocore.config import Config
+            except ImportError:
+                raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+            self._client = boto3.client(
+                "s3",
+                endpoint_url=self.endpoint_url,
+                region_name=self.region,
+                aws_access_key_id=self.access_key_id,
+                aws_secret_access_key=self.secret_access_key,
+                # Path-style addressing works with MinIO and other self-hosted stores
+                config=Config(s3={"addressing_style": "path"}, retries={"max_attempts": 5, "mode": "standard"})
+            )
+            self._pid = os.getpid()
+        return self._client
+
+    def _transfer_config(self):
+        from boto3.s3.transfer import TransferConfig
+        return TransferConfig(
+            multipart_threshold=self.part_size,
+            multipart_chunksize=self.part_size,
+            max_concurrency=self.max_concurrency
+        )
+
+    def object_key(self, key: str) -> str:
+        return self.prefix + key.lstrip("/")
+
+    def _is_missing(self, error: Exception) -> bool:
+        code = str(getattr(error, "response", {}).get("Error", {}).get("Code", ""))
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def prepare(self) -> None:
+        # A fresh MinIO starts without buckets
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        except ClientError as e:
+            if not self._is_missing(e):
+                raise
+            self.client.create_bucket(Bucket=self.bucket)
+
+    def put_stream(self, key: str, stream: BinaryIO, content_type: Optional[str] = None) -> int:
+        written = [0]
+
+        def progress(count: int) -> None:
+            written[0] += count
+
+        self.client.upload_fileobj(
+            stream,
+            self.bucket,
+            self.object_key(key),
+            ExtraArgs={"ContentType": content_type} if content_type else None,
+            Config=self._transfer_config(),
+            Callback=progress
+        )
+        STORAGE_BYTES.labels(backend=self.name, direction="upload").inc(written[0])
+        return written[0]
+
+    def put_file(self, key: str, path: Path) -> int:
+        size = Path(path).stat().st_size
+        self.client.upload_file(str(path), self.bucket, self.object_key(key), Config=self._transfer_config())
+        STORAGE_BYTES.labels(backend=self.name, direction="upload").inc(size)
+        Path(path).unlink(missing_ok=True)
+        return size
+
+    def read_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = 1024 * 1024
+    ) -> Iterator[bytes]:
+        from botocore.exceptions import ClientError
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket,
+                Key=self.object_key(key),
+                Range=f"bytes={start}-{'' if end is None else end}"
+            )
+        except ClientError as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(f"Object not found: {key}")
+            raise
+        body = response["Body"]
+        try:
+            for chunk in body.iter_chunks(chunk_size):
+                STORAGE_BYTES.labels(backend=self.name, direction="download").inc(len(chunk))
+                yield chunk
+        finally:
+            body.close()
+
+    def size(self, key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+        try:
+            return int(self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))["ContentLength"])
+        except ClientError as e:
+            if self._is_missing(e):
+                return None
+            raise
+
+    def delete(self, key: str) -> int:
+        size = self.size(key)
+        if size is None:
+            return 0
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_key(key))
+        return size
+
+    def local_path(self, key: str) -> Path:
+        size = self.size(key)
+        if size is None:
+            raise FileNotFoundError(f"Object not found: {key}")
+
+        def download(temp: Path) -> None:
+            self.client.download_file(self.bucket, self.object_key(key), str(temp), Config=self._transfer_config())
+            STORAGE_BYTES.labels(backend=self.name, direction="download").inc(size)
+
+        return self.cache.get(key, size, download)
@@ -6,6 +6,9 @@ from sqlalchemy.orm import Session
 from .database import SessionLocal
 from .models import Transcription
 from .utils.transcription import transcribe_audio
+from .utils.transcript_text import save_text, text_summary
+from .utils.cleanup import run_cleanup
+from .storage import get_storage
 from .worker import celery
 
 logger = logging.getLogger(__name__)
@@ -52,15 +55,18 @@ def transcribe_audio_task(
         # Transcribe audio
         logger.info(f"Transcribing file: {transcription.filename}")
         result = transcribe_audio(
-            str(transcription.filename),
+            str(get_storage().local_path(transcription.filename)),
             model_size=model_size,
             language=language
         )
 
         # Update transcription with results
-        transcription.text = result["text"]
+        for column, value in text_summary(result["text"]).items():
+            setattr(transcription, column, value)
         transcription.status = "completed"
         transcription.completed_at = datetime.utcnow()
+        self.db.flush()
+        save_text(self.db, transcription.id, result["text"])
         self.db.commit()
 
         logger.info(f"Transcription {transcription_id} completed successfully")
@@ -91,29 +97,8 @@ def cleanup_old_files():
     logger.info("Starting cleanup task")
     db = SessionLocal()
     try:
-        # Find old transcriptions (e.g., older than 30 days)
-        cutoff = datetime.utcnow() - timedelta(days=30)
-        old_transcriptions = db.query(Transcription).filter(
-            Transcription.created_at < cutoff
-        ).all()
-
-        for trans in old_transcriptions:
-            try:
-                # Delete the file
-                file_path = Path(trans.filename)
-                if file_path.exists():
-                    file_path.unlink()
-                    logger.info(f"Deleted file: {trans.filename}")
-                
-                # Delete the database record
-                db.delete(trans)
-                logger.info(f"Deleted record for transcription {trans.id}")
-                
-            except Exception as e:
-                logger.error(f"Error cleaning up transcription {trans.id}: {str(e)}")
-
-        db.commit()
-        logger.info("Cleanup task completed")
+        summary = run_cleanup(db)
+        logger.info(f"Cleanup task completed: {summary}")
         
     except Exception as e:
         logger.error(f"Cleanup task failed: {str(e)}")
@@ -0,0 +1,90 @@
+# backend/app/utils/archive.py
+import logging
+from datetime import datetime
+from pathlib import PurePosixPath
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Transcription
+from ..storage import get_storage
+from .media import ARCHIVE_CODECS, transcode_audio
+
+logger = logging.getLogger(__name__)
+
+
+def archive_key(source: str, codec: str) -> str:
+    return str(PurePosixPath(source).with_suffix(ARCHIVE_CODECS[codec][2]))
+
+
+def archive_transcription_audio(db: Session, transcription_id: int, codec: Optional[str] = None) -> Optional[str]:
+    """Replace a completed job's source upload with a compact mono speech encoding.
+
+    The archive is encoded from a local copy, stored under its own key, and
+    only then is ``filename`` swapped with a conditional UPDATE, so readers
+    see either the old object or the new one. Returns the archive key, or
+    None when the job was skipped.
+    """
+    codec = codec or settings.ARCHIVE_CODEC
+    transcription = db.query(Transcription).filter(Transcription.id == transcription_id).first()
+    if (
+        transcription is None
+        or transcription.status != "completed"
+        or transcription.archived_at is not None
+        or transcription.audio_purged_at is not None
+    ):
+        return None
+
+    storage = get_storage()
+    source = transcription.filename
+    target = archive_key(source, codec)
+    if source == target:
+        return None
+    try:
+        source_path = storage.local_path(source)
+    except FileNotFoundError:
+        return None
+
+    # Encode beside the local copy; put_file renames it into place or uploads it
+    temp = source_path.with_name(f".{PurePosixPath(target).name}.tmp")
+    try:
+        transcode_audio(str(source_path), str(temp), codec=codec, bitrate=settings.ARCHIVE_OPUS_BITRATE)
+        source_size, archived_size = source_path.stat().st_size, temp.stat().st_size
+        if archived_size == 0 or archived_size >= source_size:
+            logger.info(f"Archive of transcription {transcription_id} is not smaller, keeping original")
+            temp.unlink()
+            return None
+        storage.put_file(target, temp)
+    except Exception:
+        temp.unlink(missing_ok=True)
+        raise
+
+    # Only swap if nothing re-queued the job or changed its file meanwhile
+    swapped = db.execute(
+        update(Transcription)
+        .where(
+            Transcription.id == transcription_id,
+            Transcription.filename == source,
+            Transcription.status == "completed"
+        )
+        .values(
+            filename=target,
+            upload_key=func.coalesce(Transcription.upload_key, PurePosixPath(source).name),
+            stored_size=archived_size,
+            archived_at=datetime.utcnow()
+        )
+    ).rowcount
+    db.commit()
+    if not swapped:
+        logger.info(f"Transcription {transcription_id} changed during archiving, discarding archive")
+        storage.delete(target)
+        return None
+
+    storage.delete(source)
+    logger.info(
+        f"Archived transcription {transcription_id} as {codec}: "
+        f"{source_size} -> {archived_size} bytes ({source_size / archived_size:.1f}x)"
+    )
+    return target
@@ -0,0 +1,292 @@
+# backend/app/utils/autoscaler.py
+"""Backlog-aware concurrency controller for the Celery workers.
+
+Run one instance next to the workers (``python -m app.utils.autoscaler``).
+Every tick it reads broker queue depth and the backlog in processing seconds
+(audio seconds x measured RTF), works out how many pool processes would drain
+the backlog within AUTOSCALE_TARGET_DRAIN_SECONDS, caps that by the memory
+headroom each worker reports, and applies the difference with Celery's
+``pool_grow``/``pool_shrink`` remote-control commands.
+"""
+import json
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import settings
+from .metrics import AUTOSCALE_DECISIONS, AUTOSCALE_HEADROOM, AUTOSCALE_INPUTS, AUTOSCALE_TARGET
+
+logger = logging.getLogger(__name__)
+
+_REPORT_KEY = "autoscale:worker:{hostname}"
+_REPORT_TTL = 300
+# Pool processes across all workers after the last tick; read by app.utils.rtf_stats for ETAs
+POOL_SIZE_KEY = "autoscale:pool_size"
+
+
+def memory_headroom_bytes() -> Optional[int]:
+    """Memory still available to this container: the tighter of the cgroup limit and the host"""
+    available = None
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/memory.max") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            with open("/sys/fs/cgroup/memory.current") as f:
+                cgroup_free = int(limit) - int(f.read().strip())
+            available = cgroup_free if available is None else min(available, cgroup_free)
+    except (OSError, ValueError):
+        pass
+    return available
+
+
+def report_worker_memory(hostname: str, child_private_bytes: Optional[int] = None, redis_client=None) -> None:
+    """Publish a worker's memory headroom (and a child's private footprint) for the controller"""
+    from .redis_client import get_redis
+
+    client = redis_client if redis_client is not None else get_redis()
+    key = _REPORT_KEY.format(hostname=hostname)
+    mapping: Dict[str, Any] = {"updated_at": time.time()}
+    headroom = memory_headroom_bytes()
+    if headroom is not None:
+        mapping["headroom_bytes"] = headroom
+    pipe = client.pipeline()
+    pipe.hset(key, mapping=mapping)
+    if child_private_bytes:
+        # Largest child footprint seen recently: what one more process would cost
+        current = client.hget(key, "child_bytes")
+        pipe.hset(key, "child_bytes", max(int(current or 0), child_private_bytes))
+    pipe.expire(key, _REPORT_TTL)
+    pipe.execute()
+
+
+@dataclass
+class WorkerState:
+    hostname: str
+    processes: int
+    headroom_bytes: Optional[int] = None
+    child_bytes: Optional[int] = None
+
+
+@dataclass
+class Decision:
+    hostname: str
+    current: int
+    target: int
+    action: str  # grow, shrink, hold
+    reason: str
+    inputs: Dict[str, float] = field(default_factory=dict)
+
+
+class AutoscaleController:
+    """Decides and applies per-worker pool sizes.
+
+    Everything external is injectable (Redis client, Celery control, backlog
+    source, worker discovery), so the controller runs against fakeredis and a
+    stub control object without a broker or database.
+    """
+
+    def __init__(
+        self,
+        control=None,
+        redis_client=None,
+        backlog_fn: Optional[Callable[[], Dict[str, float]]] = None,
+        workers_fn: Optional[Callable[[], List[WorkerState]]] = None,
+        queues: Optional[List[str]] = None,
+        min_processes: int = settings.AUTOSCALE_MIN_CONCURRENCY,
+        max_processes: int = settings.AUTOSCALE_MAX_CONCURRENCY,
+        target_drain_seconds: float = settings.AUTOSCALE_TARGET_DRAIN_SECONDS,
+        step: int = settings.AUTOSCALE_STEP,
+        shrink_after: int = settings.AUTOSCALE_SHRINK_AFTER,
+        memory_reserve_bytes: int = settings.AUTOSCALE_MEMORY_RESERVE_MB * 2**20,
+        default_child_bytes: int = settings.AUTOSCALE_CHILD_MEMORY_MB * 2**20
+    ):
+        self._control = control
+        self._redis = redis_client
+        self._backlog_fn = backlog_fn
+        self._workers_fn = workers_fn
+        self.queues = queues or [settings.CELERY_QUEUE_NAME]
+        self.min_processes = min_processes
+        self.max_processes = max_processes
+        self.target_drain_seconds = target_drain_seconds
+        self.step = step
+        self.shrink_after = shrink_after
+        self.memory_reserve_bytes = memory_reserve_bytes
+        self.default_child_bytes = default_child_bytes
+        self._below_target: Dict[str, int] = {}
+
+    @property
+    def control(self):
+        if self._control is None:
+            from ..celery import celery_app
+            self._control = celery_app.control
+        return self._control
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            from .redis_client import get_redis
+            self._redis = get_redis()
+        return self._redis
+
+    def queue_depth(self) -> Dict[str, int]:
+        return {queue: int(self.redis.llen(queue)) for queue in self.queues}
+
+    def backlog(self) -> Dict[str, float]:
+        if self._backlog_fn is not None:
+            return self._backlog_fn()
+        from ..database import SessionLocal
+        from .rtf_stats import queue_backlog
+        db = SessionLocal()
+        try:
+            return queue_backlog(db)
+        finally:
+            db.close()
+
+    def workers(self) -> List[WorkerState]:
+        """Live workers with their pool size and last memory report"""
+        if self._workers_fn is not None:
+            states = self._workers_fn()
+        else:
+            stats = self.control.inspect(timeout=2).stats() or {}
+            states = [
+                WorkerState(hostname, len(info.get("pool", {}).get("processes", [])))
+                for hostname, info in stats.items()
+            ]
+        for state in states:
+            report = self.redis.hgetall(_REPORT_KEY.format(hostname=state.hostname)) or {}
+            if "headroom_bytes" in report:
+                state.headroom_bytes = int(float(report["headroom_bytes"]))
+            if "child_bytes" in report:
+                state.child_bytes = int(float(report["child_bytes"]))
+        return states
+
+    def desired_total(self, depth: int, backlog_seconds: float) -> int:
+        """Processes needed to drain the backlog within the target time"""
+        needed = math.ceil(backlog_seconds / self.target_drain_seconds) if backlog_seconds > 0 else 0
+        if depth and not needed:
+            needed = 1
+        return needed
+
+    def decide(self, worker: WorkerState, per_worker: int, inputs: Dict[str, float]) -> Decision:
+        target = min(max(per_worker, self.min_processes), self.max_processes)
+        reason = "backlog"
+
+        if worker.headroom_bytes is not None and target > worker.processes:
+            child_bytes = worker.child_bytes or self.default_child_bytes
+            affordable = max(0, (worker.headroom_bytes - self.memory_reserve_bytes) // child_bytes)
+            if worker.processes + affordable < target:
+                target = max(worker.processes + affordable, self.min_processes)
+                reason = "memory"
+
+        if target > worker.processes:
+            self._below_target.pop(worker.hostname, None)
+            return Decision(worker.hostname, worker.processes, min(target, worker.processes + self.step),
+                            "grow", reason, inputs)
+        if target < worker.processes:
+            # Hysteresis: only shrink after the backlog has stayed low for a while
+            ticks = self._below_target.get(worker.hostname, 0) + 1
+            self._below_target[worker.hostname] = ticks
+            if ticks >= self.shrink_after:
+                self._below_target.pop(worker.hostname, None)
+                return Decision(worker.hostname, worker.processes, worker.processes - 1, "shrink", reason, inputs)
+            return Decision(worker.hostname, worker.processes, worker.processes, "hold", "cooldown", inputs)
+        self._below_target.pop(worker.hostname, None)
+        return Decision(worker.hostname, worker.processes, worker.processes, "hold",
+                        "memory" if reason == "memory" else "steady", inputs)
+
+    def apply(self, decision: Decision) -> None:
+        delta = decision.target - decision.current
+        if delta > 0:
+            self.control.pool_grow(delta, destination=[decision.hostname])
+        elif delta < 0:
+            self.control.pool_shrink(-delta, destination=[decision.hostname])
+
+    def run_once(self, dry_run: bool = False) -> List[Decision]:
+        depth = self.queue_depth()
+        backlog = self.backlog()
+        workers = self.workers()
+        total_depth = sum(depth.values())
+        inputs = {
+            "queue_depth": total_depth,
+            "backlog_seconds": backlog.get("seconds_p50", 0.0),
+            "workers": len(workers),
+        }
+        for name, value in inputs.items():
+            AUTOSCALE_INPUTS.labels(input=name).set(value)
+        if not workers:
+            logger.warning("Autoscaler found no live workers")
+            return []
+
+        needed = self.desired_total(total_depth, inputs["backlog_seconds"])
+        per_worker = math.ceil(needed / len(workers))
+        decisions = []
+        pool_size = 0
+        for worker in workers:
+            decision = self.decide(worker, per_worker, inputs)
+            AUTOSCALE_TARGET.labels(worker=worker.hostname).set(decision.target)
+            AUTOSCALE_DECISIONS.labels(action=decision.action, reason=decision.reason).inc()
+            if worker.headroom_bytes is not None:
+                AUTOSCALE_HEADROOM.labels(worker=worker.hostname).set(worker.headroom_bytes)
+            if decision.action != "hold":
+                logger.info(
+                    f"Autoscale {decision.action} {worker.hostname}: {decision.current} -> {decision.target} "
+                    f"({decision.reason}; depth={total_depth}, backlog={inputs['backlog_seconds']:.0f}s)"
+                )
+                if not dry_run:
+                    try:
+                        self.apply(decision)
+                        pool_size += decision.target - decision.current
+                    except Exception as e:
+                        logger.error(f"Error applying autoscale decision for {worker.hostname}: {str(e)}")
+            pool_size += decision.current
+            decisions.append(decision)
+        try:
+            self.redis.set(POOL_SIZE_KEY, pool_size, ex=_REPORT_TTL)
+        except Exception as e:
+            logger.error(f"Error publishing pool size: {str(e)}")
+        return decisions
+
+    def run_forever(self, interval: float = settings.AUTOSCALE_INTERVAL_SECONDS, dry_run: bool = False) -> None:
+        logger.info(
+            f"Autoscaler running every {interval}s, pool bounds {self.min_processes}-{self.max_processes}, "
+            f"target drain {self.target_drain_seconds}s"
+        )
+        while True:
+            try:
+                self.run_once(dry_run=dry_run)
+            except Exception as e:
+                logger.error(f"Autoscaler tick failed: {str(e)}")
+            time.sleep(interval)
+
+
+def main() -> None:
+    import argparse
+    from prometheus_client import start_http_server
+
+    parser = argparse.ArgumentParser(description="Backlog-aware Celery pool autoscaler")
+    parser.add_argument("--dry-run", action="store_true", help="log decisions without applying them")
+    parser.add_argument("--once", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if settings.AUTOSCALER_METRICS_PORT:
+        start_http_server(settings.AUTOSCALER_METRICS_PORT)
+    controller = AutoscaleController()
+    if args.once:
+        print(json.dumps([decision.__dict__ for decision in controller.run_once(dry_run=args.dry_run)], indent=2))
+    else:
+        controller.run_forever(dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
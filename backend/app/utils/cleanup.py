@@ -0,0 +1,191 @@
+# backend/app/utils/cleanup.py
+import logging
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Transcription, TranscriptionText
+from ..storage import ObjectStorage, get_storage
+from .search import remove_from_index
+
+logger = logging.getLogger(__name__)
+
+# Jobs a worker may still be reading from are never touched
+_ACTIVE_STATUSES = ("pending", "processing")
+# Jobs nothing will read the audio of again, bar a download
+_TERMINAL_STATUSES = ("completed", "failed")
+
+
+def profile_paths(transcription_id: int) -> List[Path]:
+    """Profiler output on local disk that belongs to a transcription"""
+    if not settings.PROFILE_DIR.exists():
+        return []
+    return list(settings.PROFILE_DIR.glob(f"transcription_{transcription_id}.*"))
+
+
+def _unlink(paths: Iterable[Path]) -> int:
+    """Delete files, returning bytes freed; missing files are not an error"""
+    freed = 0
+    for path in paths:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            freed += size
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            logger.error(f"Error deleting {path}: {str(e)}")
+    return freed
+
+
+def _delete_objects(keys: Iterable[str], storage: Optional[ObjectStorage] = None) -> int:
+    """Delete stored uploads, returning bytes freed; missing objects are not an error"""
+    storage = storage or get_storage()
+    freed = 0
+    for key in keys:
+        try:
+            freed += storage.delete(key)
+        except Exception as e:
+            logger.error(f"Error deleting stored object {key}: {str(e)}")
+    return freed
+
+
+def expire_transcriptions(
+    db: Session,
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> int:
+    """Delete transcriptions older than the retention period with their files.
+
+    Works in id-ordered batches, each its own transaction, so memory and lock
+    time stay bounded however large the backlog is.
+    """
+    retention_days = settings.FILE_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.CLEANUP_BATCH_SIZE
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted, freed, last_id = 0, 0, 0
+
+    while True:
+        rows = db.query(Transcription.id, Transcription.filename).filter(
+            Transcription.id > last_id,
+            Transcription.created_at < cutoff,
+            Transcription.status.notin_(_ACTIVE_STATUSES)
+        ).order_by(Transcription.id).limit(batch_size).all()
+        if not rows:
+            break
+        ids = [row.id for row in rows]
+        last_id = ids[-1]
+
+        remove_from_index(db, ids)
+        # Explicit as well as ON DELETE CASCADE: SQLite doesn't enforce foreign keys by default
+        db.execute(delete(TranscriptionText).where(TranscriptionText.transcription_id.in_(ids)))
+        db.execute(delete(Transcription).where(Transcription.id.in_(ids)))
+        db.commit()
+        # Files go after the commit: a crash leaves orphaned files, never dangling rows
+        freed += _delete_objects(row.filename for row in rows if row.filename)
+        freed += _unlink(path for row in rows for path in profile_paths(row.id))
+        deleted += len(ids)
+
+    if deleted:
+        logger.info(f"Expired {deleted} transcriptions older than {retention_days} days, freed {freed} bytes")
+    return deleted
+
+
+def sweep_stale_files(directory: Path, retention_days: Optional[int] = None) -> int:
+    """Delete files not tied to a job (recordings, abandoned profiles) past retention"""
+    if not directory.exists():
+        return 0
+    retention_days = settings.FILE_RETENTION_DAYS if retention_days is None else retention_days
+    cutoff = time.time() - retention_days * 86400
+    stale = []
+    for path in directory.iterdir():
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                stale.append(path)
+        except FileNotFoundError:
+            continue
+    _unlink(stale)
+    return len(stale)
+
+
+def enforce_disk_quota(
+    db: Session,
+    storage: Optional[ObjectStorage] = None,
+    high_water: Optional[float] = None,
+    low_water: Optional[float] = None,
+    batch_size: Optional[int] = None,
+    max_evictions: Optional[int] = None
+) -> int:
+    """Evict audio of the oldest finished jobs once the uploads volume passes the high-water mark.
+
+    Completed and failed jobs are candidates, oldest first (failed jobs by
+    creation time, as they never complete). Transcripts are kept; only the source audio goes (``audio_purged_at`` is
+    set). Eviction continues down to the low-water mark so the check does not
+    fire again on every run, but stops after ``max_evictions`` jobs or a batch
+    that frees nothing: when something else (caches, recordings, spooled
+    uploads) fills the volume, deleting audio can't reach the mark and would
+    otherwise purge every finished job in one run. Backends without a fixed
+    capacity (object stores) are left to retention expiry.
+    """
+    storage = storage or get_storage()
+    high_water = settings.DISK_HIGH_WATER_PERCENT if high_water is None else high_water
+    low_water = settings.DISK_LOW_WATER_PERCENT if low_water is None else low_water
+    batch_size = batch_size or settings.CLEANUP_BATCH_SIZE
+    max_evictions = settings.DISK_EVICT_MAX_PER_RUN if max_evictions is None else max_evictions
+
+    usage = storage.usage_percent()
+    if usage is None or usage < high_water:
+        return 0
+
+    logger.warning(f"Uploads volume above {high_water}% used, evicting audio of finished jobs")
+    evicted, freed = 0, 0
+    while (storage.usage_percent() or 0.0) > low_water:
+        if evicted >= max_evictions:
+            logger.error(
+                f"Uploads volume still at {storage.usage_percent():.1f}% after evicting {max_evictions} jobs' audio "
+                f"({freed} bytes); check what else fills it"
+            )
+            break
+        rows = db.query(Transcription.id, Transcription.filename).filter(
+            Transcription.status.in_(_TERMINAL_STATUSES),
+            Transcription.audio_purged_at.is_(None)
+        ).order_by(
+            func.coalesce(Transcription.completed_at, Transcription.created_at), Transcription.id
+        ).limit(min(batch_size, max_evictions - evicted)).all()
+        if not rows:
+            logger.error(f"Uploads volume still above {low_water}% with no finished audio left to evict")
+            break
+        ids = [row.id for row in rows]
+        db.execute(
+            update(Transcription).where(Transcription.id.in_(ids)).values(audio_purged_at=datetime.utcnow())
+        )
+        db.commit()
+        batch_freed = _delete_objects((row.filename for row in rows if row.filename), storage)
+        freed += batch_freed
+        evicted += len(ids)
+        if not batch_freed:
+            logger.error(
+                f"Evicting {len(ids)} jobs' audio freed nothing; uploads volume still at "
+                f"{storage.usage_percent():.1f}%, above {low_water}%"
+            )
+            break
+
+    logger.info(f"Evicted audio for {evicted} transcriptions, freed {freed} bytes")
+    return evicted
+
+
+def run_cleanup(db: Session) -> dict:
+    """Retention expiry, stale file sweep and disk quota in one pass"""
+    return {
+        "expired": expire_transcriptions(db),
+        "stale_recordings": sweep_stale_files(settings.RECORDINGS_DIR),
+        "stale_profiles": sweep_stale_files(settings.PROFILE_DIR),
+        # Spooled uploads are removed as soon as they're stored; leftovers are from crashes
+        "stale_ingest": sweep_stale_files(settings.INGEST_DIR, retention_days=1),
+        "evicted": enforce_disk_quota(db),
+    }
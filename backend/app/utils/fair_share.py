@@ -0,0 +1,252 @@
+# backend/app/utils/fair_share.py
+"""Fair-share dispatch of transcription jobs across owners.
+
+With FAIR_SHARE_ENABLED the API only records jobs; the dispatcher loop
+(``python -m app.utils.outbox``) keeps at most FAIR_SHARE_MAX_INFLIGHT
+jobs on the broker and fills free slots by deficit round robin over owners,
+charging each job its estimated audio seconds. A bulk client with 500 files
+then gets its share of the workers instead of all of them, and a small user's
+upload waits for at most about one round rather than for the whole backlog.
+"""
+import logging
+import math
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Transcription
+from .metrics import FAIR_SHARE_DISPATCHED, FAIR_SHARE_OWNERS, FAIR_SHARE_WAIT
+from .rtf_stats import estimated_audio_seconds
+
+logger = logging.getLogger(__name__)
+
+ANONYMOUS_OWNER = "anonymous"
+
+
+def parse_owner_map(value: str) -> Dict[str, float]:
+    """Parse "owner=value,owner=value" settings (weights and caps)"""
+    result = {}
+    for item in value.split(","):
+        owner, sep, number = item.strip().rpartition("=")
+        if sep and owner:
+            result[owner.strip()] = float(number)
+    return result
+
+
+def request_owner(client_id: Optional[str], client_address: str) -> str:
+    """Owner key for an upload: the X-Client-Id an integration sends, else the caller's address"""
+    if client_id and client_id.strip():
+        return f"client:{client_id.strip()[:64]}"
+    return f"ip:{client_address}"
+
+
+def new_task_id() -> str:
+    return str(uuid.uuid4())
+
+
+@dataclass
+class QueuedJob:
+    id: int
+    owner: str
+    cost: float  # estimated audio seconds
+    created_at: Optional[datetime] = None
+    task_id: Optional[str] = None
+    trace_context: Optional[Dict[str, str]] = None
+
+
+class DeficitRoundRobin:
+    """Deficit round robin over owners, weighted, with optional per-owner in-flight caps.
+
+    Each round credits every eligible owner ``quantum * weight`` seconds and
+    releases its oldest jobs while their cost fits in the credit. State (the
+    deficits and the ring position) persists across select() calls, so the
+    dispatcher can hand out a few slots per tick and still converge on the
+    weighted share. Pure and DB-free, so the simulation drives it directly.
+    """
+
+    def __init__(
+        self,
+        quantum: float = settings.FAIR_SHARE_QUANTUM_SECONDS,
+        weights: Optional[Dict[str, float]] = None,
+        owner_cap: int = settings.FAIR_SHARE_OWNER_CAP,
+        owner_caps: Optional[Dict[str, float]] = None
+    ):
+        self.quantum = quantum
+        self.weights = weights if weights is not None else parse_owner_map(settings.FAIR_SHARE_WEIGHTS)
+        self.owner_cap = owner_cap
+        self.owner_caps = owner_caps if owner_caps is not None else parse_owner_map(settings.FAIR_SHARE_OWNER_CAPS)
+        self.deficit: Dict[str, float] = {}
+        self.ring: List[str] = []
+        self._next = 0
+
+    def cap(self, owner: str) -> int:
+        """Max in-flight jobs for an owner, 0 for unlimited"""
+        return int(self.owner_caps.get(owner, self.owner_cap))
+
+    def _sync(self, waiting: Dict[str, Sequence[QueuedJob]]) -> None:
+        # Owners with nothing waiting leave the ring and lose their credit (standard DRR)
+        keep = [owner for owner in self.ring if waiting.get(owner)]
+        if keep != self.ring and self.ring:
+            current = self.ring[self._next % len(self.ring)]
+            self._next = keep.index(current) if current in keep else 0
+        self.ring = keep
+        self.ring.extend(owner for owner in waiting if waiting[owner] and owner not in self.ring)
+        self.deficit = {owner: self.deficit.get(owner, 0.0) for owner in self.ring}
+
+    def select(
+        self,
+        waiting: Dict[str, Sequence[QueuedJob]],
+        inflight: Dict[str, int],
+        slots: int
+    ) -> List[QueuedJob]:
+        """Pick up to ``slots`` jobs; ``waiting`` lists each owner's undispatched jobs oldest first"""
+        self._sync(waiting)
+        picked: List[QueuedJob] = []
+        heads = {owner: 0 for owner in self.ring}
+        running = dict(inflight)
+
+        def eligible(owner: str) -> bool:
+            cap = self.cap(owner)
+            return heads[owner] < len(waiting[owner]) and (not cap or running.get(owner, 0) < cap)
+
+        while slots > 0 and self.ring:
+            candidates = [owner for owner in self.ring if eligible(owner)]
+            if not candidates:
+                break
+            # Skip rounds in which nobody could afford their head job
+            rounds = min(
+                math.ceil(max(0.0, waiting[o][heads[o]].cost - self.deficit[o]) / (self.quantum * self.weights.get(o, 1.0)))
+                for o in candidates
+            )
+            if rounds > 1:
+                for owner in candidates:
+                    self.deficit[owner] += (rounds - 1) * self.quantum * self.weights.get(owner, 1.0)
+
+            for step in range(len(self.ring)):
+                position = (self._next + step) % len(self.ring)
+                owner = self.ring[position]
+                if not eligible(owner):
+                    continue
+                self.deficit[owner] += self.quantum * self.weights.get(owner, 1.0)
+                while slots > 0 and eligible(owner) and waiting[owner][heads[owner]].cost <= self.deficit[owner]:
+                    job = waiting[owner][heads[owner]]
+                    self.deficit[owner] -= job.cost
+                    heads[owner] += 1
+                    running[owner] = running.get(owner, 0) + 1
+                    picked.append(job)
+                    slots -= 1
+                if slots == 0:
+                    self._next = (position + 1) % len(self.ring)
+                    break
+        return picked
+
+
+class FairShareDispatcher:
+    """Moves recorded jobs onto the broker in fair-share order"""
+
+    def __init__(
+        self,
+        scheduler: Optional[DeficitRoundRobin] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+        max_inflight: int = settings.FAIR_SHARE_MAX_INFLIGHT,
+        head_jobs: int = settings.FAIR_SHARE_HEAD_JOBS
+    ):
+        self.scheduler = scheduler or DeficitRoundRobin()
+        self._session_factory = session_factory
+        self.max_inflight = max_inflight
+        self.head_jobs = head_jobs
+
+    def session(self) -> Session:
+        if self._session_factory is None:
+            from ..database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def waiting(self, db: Session) -> Dict[str, List[QueuedJob]]:
+        """The oldest ``head_jobs`` undispatched jobs of every owner"""
+        owner = func.coalesce(Transcription.owner, ANONYMOUS_OWNER)
+        ranked = db.query(
+            Transcription.id,
+            owner.label("owner"),
+            Transcription.file_size,
+            Transcription.audio_duration,
+            Transcription.created_at,
+            Transcription.task_id,
+            Transcription.trace_context,
+            func.row_number().over(partition_by=owner, order_by=Transcription.id).label("rank")
+        ).filter(
+            Transcription.status == "pending",
+            Transcription.dispatched_at.is_(None)
+        ).subquery()
+        rows = db.query(ranked).filter(ranked.c.rank <= self.head_jobs).order_by(ranked.c.id).all()
+
+        waiting: Dict[str, List[QueuedJob]] = {}
+        for row in rows:
+            waiting.setdefault(row.owner, []).append(QueuedJob(
+                row.id, row.owner, estimated_audio_seconds(row.file_size, row.audio_duration),
+                row.created_at, row.task_id, row.trace_context
+            ))
+        return waiting
+
+    def inflight(self, db: Session) -> Dict[str, int]:
+        """Dispatched jobs that haven't finished, per owner"""
+        owner = func.coalesce(Transcription.owner, ANONYMOUS_OWNER)
+        return dict(
+            db.query(owner, func.count(Transcription.id))
+            .filter(
+                Transcription.dispatched_at.isnot(None),
+                Transcription.status.in_(["pending", "processing"])
+            )
+            .group_by(owner)
+            .all()
+        )
+
+    def dispatch(self, db: Session, job: QueuedJob) -> bool:
+        from .outbox import TRANSCRIBE_TASK, stage_task
+
+        task_id = job.task_id or new_task_id()
+        # Claim and stage the message together, so a job is released exactly once
+        claimed = db.execute(
+            update(Transcription)
+            .where(
+                Transcription.id == job.id,
+                Transcription.status == "pending",
+                Transcription.dispatched_at.is_(None)
+            )
+            .values(dispatched_at=datetime.utcnow(), task_id=task_id)
+        ).rowcount
+        if not claimed:
+            db.rollback()
+            return False
+        stage_task(db, TRANSCRIBE_TASK, [job.id], task_id=task_id, transcription_id=job.id,
+                   trace_context=job.trace_context)
+        db.commit()
+        if job.created_at is not None:
+            FAIR_SHARE_WAIT.observe(max(0.0, (datetime.utcnow() - job.created_at.replace(tzinfo=None)).total_seconds()))
+        FAIR_SHARE_DISPATCHED.inc()
+        return True
+
+    def run_once(self) -> List[QueuedJob]:
+        db = self.session()
+        try:
+            inflight = self.inflight(db)
+            slots = self.max_inflight - sum(inflight.values())
+            waiting = self.waiting(db)
+            FAIR_SHARE_OWNERS.set(len(waiting))
+            if slots <= 0 or not waiting:
+                return []
+            sent = [job for job in self.scheduler.select(waiting, inflight, slots) if self.dispatch(db, job)]
+            if sent:
+                logger.info(
+                    f"Dispatched {len(sent)} jobs for {len({job.owner for job in sent})} owners "
+                    f"({len(waiting)} owners waiting, {sum(inflight.values()) + len(sent)} in flight)"
+                )
+            return sent
+        finally:
+            db.close()
+
@@ -0,0 +1,92 @@
+# backend/app/utils/ingest.py
+"""Upload ingest: spool, probe and reduce video uploads to their audio track.
+
+Runs in the API's threadpool before anything is stored, so storage and the
+workers only ever see audio: a video's audio track is stream-copied (or
+transcoded to Opus when its codec has no compact container), and the video
+frames are dropped. The probe's duration is saved with the job.
+"""
+import logging
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from ..config import settings
+from .media import MediaProbeError, extract_audio, probe_media
+from .metrics import INGEST_ACTIONS, INGEST_DISCARDED_BYTES
+
+logger = logging.getLogger(__name__)
+
+_extractions = threading.BoundedSemaphore(max(1, settings.INGEST_CONCURRENCY))
+
+
+class MediaRejected(Exception):
+    """The upload is readable but holds nothing to transcribe"""
+
+
+@dataclass
+class IngestedMedia:
+    path: Path  # local file to store: the upload itself or its extracted audio
+    format: str  # container sniffed from the upload
+    audio_codec: str  # codec of the stored audio
+    duration: Optional[float]
+    action: str  # none, copy or transcode
+    size: int  # bytes of ``path``
+
+
+def spool_upload(stream: BinaryIO, media_format: str) -> Path:
+    """Copy an upload to a local file ffmpeg can seek in"""
+    settings.INGEST_DIR.mkdir(parents=True, exist_ok=True)
+    path = settings.INGEST_DIR / f"{uuid.uuid4().hex}.{media_format}"
+    try:
+        with open(path, "wb") as out:
+            shutil.copyfileobj(stream, out, settings.CHUNK_SIZE * 128)
+    except Exception:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def ingest_media(path: Path, media_format: str) -> IngestedMedia:
+    """Probe a spooled upload; for video, replace it with its audio track.
+
+    Consumes ``path`` when it extracts. Raises MediaRejected for files without
+    audio and MediaProbeError for files ffmpeg can't read; anything else
+    (ffmpeg missing, a failed extraction) is the node's fault.
+    """
+    info = probe_media(str(path))
+    if info.audio_codec is None:
+        raise MediaRejected("File has no audio track")
+    if not info.has_video:
+        INGEST_ACTIONS.labels(action="none").inc()
+        return IngestedMedia(path, media_format, info.audio_codec, info.duration, "none", path.stat().st_size)
+
+    original_size = path.stat().st_size
+    with _extractions:
+        written, copied = extract_audio(str(path), str(path.with_suffix("")) + ".audio", info.audio_codec)
+    audio_path = Path(written)
+    path.unlink(missing_ok=True)
+    try:
+        extracted = probe_media(str(audio_path))
+    except MediaProbeError as e:
+        audio_path.unlink(missing_ok=True)
+        raise RuntimeError(f"Extracted audio is unreadable: {str(e)}") from e
+    except Exception:
+        audio_path.unlink(missing_ok=True)
+        raise
+
+    action = "copy" if copied else "transcode"
+    media = IngestedMedia(
+        audio_path, media_format, extracted.audio_codec or info.audio_codec,
+        extracted.duration or info.duration, action, audio_path.stat().st_size
+    )
+    INGEST_ACTIONS.labels(action=action).inc()
+    INGEST_DISCARDED_BYTES.inc(max(0, original_size - media.size))
+    logger.info(
+        f"Extracted {info.audio_codec} audio from {media_format} ({action}): "
+        f"{original_size} -> {media.size} bytes"
+    )
+    return media
@@ -0,0 +1,219 @@
+# backend/app/utils/media.py
+import logging
+import re
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# ISO base media atoms a QuickTime file may open with instead of ftyp
+_QUICKTIME_ATOMS = (b"moov", b"mdat", b"wide", b"free", b"skip", b"pnot")
+
+
+def sniff_format(header: bytes) -> Optional[str]:
+    """Container of a media file from its first bytes (16 are enough), or None if unrecognised.
+
+    Every name returned is in settings.ALLOWED_CONTAINERS.
+    """
+    if header[:4] == b"RIFF":
+        return {b"WAVE": "wav", b"AVI ": "avi"}.get(header[8:12])
+    if header[:4] == b"OggS":
+        return "ogg"
+    if header[:4] == b"fLaC":
+        return "flac"
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"  # Matroska/WebM EBML header
+    if header[4:8] == b"ftyp":
+        return "mov" if header[8:12] == b"qt  " else "mp4"  # mp4 includes m4a and 3gp brands
+    if header[4:8] in _QUICKTIME_ATOMS:
+        return "mov"
+    if header[:3] == b"ID3":
+        return "mp3"
+    if len(header) >= 2 and header[0] == 0xFF:
+        if header[1] & 0xF6 == 0xF0:
+            return "aac"  # ADTS frame
+        if header[1] & 0xE0 == 0xE0:
+            return "mp3"  # MPEG audio frame sync
+    return None
+
+
+class MediaProbeError(RuntimeError):
+    """ffmpeg ran but couldn't read or decode the input; the file is at fault, not the node"""
+
+
+@dataclass
+class MediaInfo:
+    duration: Optional[float]  # seconds, from the container
+    audio_codec: Optional[str]  # first audio stream; None if there is none
+    sample_rate: Optional[int]
+    has_video: bool  # a real video stream, not cover art
+
+
+_DURATION = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_STREAM = re.compile(r"Stream #\d+:\d+\S*: (Audio|Video): (\w+)(.*)")
+_SAMPLE_RATE = re.compile(r"(\d+) Hz")
+
+
+def probe_media(file_path: str) -> MediaInfo:
+    """Streams and duration from ffmpeg's input summary, reading only the container headers"""
+    result = subprocess.run(
+        ["ffmpeg", "-hide_banner", "-nostdin", "-i", file_path],
+        capture_output=True
+    )
+    # With no output file ffmpeg always exits non-zero; only a missing summary means failure
+    summary = result.stderr.decode(errors="ignore")
+    if "Input #0" not in summary:
+        raise MediaProbeError(f"Failed to read media: {summary.strip()[-500:]}")
+
+    duration = None
+    match = _DURATION.search(summary)
+    if match:
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    audio_codec, sample_rate, has_video = None, None, False
+    for kind, codec, rest in _STREAM.findall(summary):
+        if kind == "Video" and "(attached pic)" not in rest:
+            has_video = True
+        elif kind == "Audio" and audio_codec is None:
+            audio_codec = codec
+            rate = _SAMPLE_RATE.search(rest)
+            sample_rate = int(rate.group(1)) if rate else None
+    return MediaInfo(duration=duration, audio_codec=audio_codec, sample_rate=sample_rate, has_video=has_video)
+
+
+def decode_audio(file_path: str, sample_rate: int = settings.SAMPLE_RATE) -> np.ndarray:
+    """Decode any ffmpeg-readable input to mono float32 PCM"""
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0",
+        "-i", file_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate),
+        "-"
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise MediaProbeError(f"Failed to decode audio: {e.stderr.decode(errors='ignore')}") from e
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+
+def stream_audio(
+    file_path: str,
+    block_seconds: float,
+    sample_rate: int = settings.SAMPLE_RATE
+) -> Iterator[np.ndarray]:
+    """Decode like decode_audio(), yielding blocks of block_seconds (the last may be shorter).
+
+    Samples are read from ffmpeg's pipe as they are produced, so memory holds
+    one block rather than the whole input. Closing the generator early stops ffmpeg.
+    """
+    block_bytes = max(1, int(block_seconds * sample_rate)) * 2
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0",
+        "-i", file_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate),
+        "-"
+    ]
+    # stderr goes to a file: a pipe nobody reads would stall ffmpeg once full
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+        try:
+            buffer = bytearray(block_bytes)
+            view = memoryview(buffer)
+            while True:
+                filled = 0
+                while filled < block_bytes:
+                    read = process.stdout.readinto(view[filled:])
+                    if not read:
+                        break
+                    filled += read
+                filled -= filled % 2
+                if filled:
+                    yield np.frombuffer(buffer, np.int16, filled // 2).astype(np.float32) / 32768.0
+                if filled < block_bytes:
+                    break
+            if process.wait() != 0:
+                stderr.seek(0)
+                raise MediaProbeError(f"Failed to decode audio: {stderr.read().decode(errors='ignore')}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+
+# ffmpeg muxer, codec arguments and file suffix per archive codec
+ARCHIVE_CODECS = {
+    "opus": ("ogg", ["-c:a", "libopus", "-application", "voip"], ".opus"),
+    "flac": ("flac", ["-c:a", "flac", "-sample_fmt", "s16", "-compression_level", "8"], ".flac"),
+}
+
+
+def transcode_audio(
+    src_path: str,
+    dst_path: str,
+    codec: str = "opus",
+    sample_rate: int = settings.SAMPLE_RATE,
+    bitrate: str = "24k"
+) -> None:
+    """Re-encode the audio track of any input to mono speech audio, dropping video"""
+    if codec not in ARCHIVE_CODECS:
+        raise ValueError(f"Unsupported archive codec: {codec}")
+    muxer, codec_args, _ = ARCHIVE_CODECS[codec]
+    cmd = [
+        "ffmpeg", "-nostdin", "-y", "-threads", "0",
+        "-i", src_path,
+        "-vn", "-sn", "-dn", "-map_metadata", "-1",
+        "-ac", "1", "-ar", str(sample_rate),
+        *codec_args,
+        *(["-b:a", bitrate] if codec == "opus" else []),
+        "-f", muxer, dst_path
+    ]
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to transcode audio: {e.stderr.decode(errors='ignore')}") from e
+
+
+# Audio codecs stream-copied out of video containers: ffmpeg muxer and file suffix
+AUDIO_COPY_CONTAINERS = {
+    "aac": ("ipod", ".m4a"),
+    "mp3": ("mp3", ".mp3"),
+    "opus": ("ogg", ".opus"),
+    "vorbis": ("ogg", ".ogg"),
+    "flac": ("flac", ".flac"),
+}
+
+
+def extract_audio(src_path: str, dst_stem: str, audio_codec: Optional[str]) -> Tuple[str, bool]:
+    """Write the first audio track of any input to ``dst_stem`` plus a suffix, without video.
+
+    Copies codecs in AUDIO_COPY_CONTAINERS bit for bit; anything else (PCM,
+    AC-3, ...) is transcoded like an Opus archive. Returns the written path
+    and whether the track was copied.
+    """
+    if audio_codec in AUDIO_COPY_CONTAINERS:
+        muxer, suffix = AUDIO_COPY_CONTAINERS[audio_codec]
+        dst_path = dst_stem + suffix
+        cmd = [
+            "ffmpeg", "-nostdin", "-y",
+            "-i", src_path,
+            "-map", "0:a:0", "-map_metadata", "-1", "-c:a", "copy",
+            "-f", muxer, dst_path
+        ]
+        try:
+            subprocess.run(cmd, capture_output=True, check=True)
+            return dst_path, True
+        except subprocess.CalledProcessError as e:
+            logger.warning(
+                f"Stream copy of {audio_codec} audio failed, transcoding instead: "
+                f"{e.stderr.decode(errors='ignore')[-300:]}"
+            )
+    dst_path = dst_stem + ARCHIVE_CODECS["opus"][2]
+    transcode_audio(src_path, dst_path, codec="opus", bitrate=settings.ARCHIVE_OPUS_BITRATE)
+    return dst_path, False
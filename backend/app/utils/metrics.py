@@ -0,0 +1,298 @@
+# backend/app/utils/metrics.py
+import logging
+import os
+import resource
+import time
+from typing import Dict, Iterable, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# All metrics are multiprocess-safe when PROMETHEUS_MULTIPROC_DIR is set
+# (uvicorn --workers and Celery prefork children each write their own files).
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    multiprocess_mode="livesum",
+)
+TASK_DURATION = Histogram(
+    "transcription_task_duration_seconds",
+    "Wall time of transcription tasks",
+    ["model", "status"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+)
+TASKS_IN_PROGRESS = Gauge(
+    "transcription_tasks_in_progress",
+    "Transcription tasks currently executing",
+    multiprocess_mode="livesum",
+)
+STAGE_DURATION = Histogram(
+    "transcription_stage_seconds",
+    "Time spent in each transcription stage",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 15, 30, 60, 300, 900, 1800),
+)
+MODEL_LOAD_DURATION = Histogram(
+    "model_load_seconds",
+    "Time to load transcription model weights",
+    ["model"],
+    buckets=(0.1, 0.5, 1, 2, 5, 10, 20, 40, 80),
+)
+REAL_TIME_FACTOR = Histogram(
+    "transcription_real_time_factor",
+    "Processing seconds per second of audio",
+    ["model"],
+    buckets=(0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 3, 5),
+)
+AUDIO_SECONDS = Counter(
+    "transcription_audio_seconds",
+    "Seconds of audio transcribed",
+    ["model"],
+)
+PROCESS_RSS = Gauge(
+    "process_rss_bytes",
+    "Resident set size per process",
+    ["role"],
+    multiprocess_mode="all",
+)
+PROCESS_MEMORY = Gauge(
+    "process_memory_bytes",
+    "Per-process memory from smaps_rollup: pss, shared and private pages",
+    ["role", "kind"],
+    multiprocess_mode="all",
+)
+
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time to check a connection out of the SQLAlchemy pool",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts",
+    "Requests that gave up waiting for a pooled connection",
+)
+STREAM_SESSIONS = Gauge(
+    "stream_sessions_active",
+    "Open WebSocket streaming transcription sessions",
+    multiprocess_mode="livesum",
+)
+STREAM_SESSIONS_REJECTED = Counter(
+    "stream_sessions_rejected",
+    "Streaming sessions refused because the per-process cap was reached",
+)
+STREAM_DECODE_LATENCY = Histogram(
+    "stream_decode_seconds",
+    "Time to decode one streaming window",
+    ["kind"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+)
+DECODE_WINDOWS = Counter(
+    "decode_windows",
+    "30 s decode windows by decoding profile and whether a temperature fallback re-decoded them",
+    ["profile", "fallback"],
+)
+AUTOSCALE_TARGET = Gauge(
+    "autoscale_target_processes",
+    "Pool size the autoscaler last chose per worker",
+    ["worker"],
+)
+AUTOSCALE_DECISIONS = Counter(
+    "autoscale_decisions",
+    "Autoscaler decisions by action and reason",
+    ["action", "reason"],
+)
+AUTOSCALE_INPUTS = Gauge(
+    "autoscale_input",
+    "Signals the autoscaler acted on (queue_depth, backlog_seconds, workers)",
+    ["input"],
+)
+AUTOSCALE_HEADROOM = Gauge(
+    "autoscale_memory_headroom_bytes",
+    "Memory headroom last reported by each worker",
+    ["worker"],
+)
+FAIR_SHARE_DISPATCHED = Counter(
+    "fair_share_dispatched",
+    "Jobs moved onto the broker by the fair-share dispatcher",
+)
+FAIR_SHARE_OWNERS = Gauge(
+    "fair_share_waiting_owners",
+    "Owners with undispatched jobs",
+)
+OUTBOX_PUBLISHED = Counter(
+    "outbox_messages",
+    "Outbox messages handed to the broker, by result",
+    ["result"],
+)
+OUTBOX_LAG = Histogram(
+    "outbox_publish_lag_seconds",
+    "Time from staging a task message to publishing it",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 15, 60, 300),
+)
+OUTBOX_PENDING = Gauge(
+    "outbox_unpublished_messages",
+    "Staged task messages not yet published",
+)
+OUTBOX_REQUEUED = Counter(
+    "outbox_requeued_jobs",
+    "Never-staged pending transcriptions staged by the sweeper",
+)
+JOBS_REAPED = Counter(
+    "outbox_reaped_jobs",
+    "Transcriptions left processing by a lost worker, by outcome",
+    ["action"],  # requeued or failed
+)
+FAIR_SHARE_WAIT = Histogram(
+    "fair_share_wait_seconds",
+    "Time from upload until the fair-share dispatcher released the job",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200),
+)
+UPLOAD_BYTES = Counter(
+    "upload_received_bytes",
+    "Bytes of accepted uploads, by client-side preprocessing (none = original file)",
+    ["preprocessing"],
+)
+INGEST_ACTIONS = Counter(
+    "upload_ingest",
+    "Uploads by ingest action: none (audio stored as sent), copy or transcode (audio track extracted)",
+    ["action"],
+)
+INGEST_DISCARDED_BYTES = Counter(
+    "upload_ingest_discarded_bytes",
+    "Upload bytes dropped at ingest with the video tracks",
+)
+STORAGE_CACHE = Counter(
+    "storage_cache_lookups",
+    "Worker-side object cache lookups, by result (hit or miss)",
+    ["result"],
+)
+STORAGE_BYTES = Counter(
+    "storage_transferred_bytes",
+    "Bytes moved to or from the object store, by direction",
+    ["backend", "direction"],
+)
+
+_last_rss_update = 0.0
+
+
+def current_rss_bytes() -> int:
+    """Current resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current, but better than nothing off Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def memory_breakdown() -> Dict[str, int]:
+    """RSS split into proportional, shared and private bytes (Linux 4.14+)
+
+    Pages a prefork child still shares with its parent (e.g. preloaded model
+    weights) count as shared; PSS divides them between the processes using them.
+    """
+    fields = {"Rss": "rss", "Pss": "pss", "Shared_Clean": "shared", "Shared_Dirty": "shared",
+              "Private_Clean": "private", "Private_Dirty": "private"}
+    breakdown: Dict[str, int] = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if parts and parts[0].rstrip(":") in fields:
+                    kind = fields[parts[0].rstrip(":")]
+                    breakdown[kind] = breakdown.get(kind, 0) + int(parts[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return {"rss": current_rss_bytes()}
+    return breakdown
+
+
+def format_memory(breakdown: Dict[str, int]) -> str:
+    return " ".join(f"{kind}={value / 2**20:.0f}MiB" for kind, value in sorted(breakdown.items()))
+
+
+def update_process_rss(role: str, min_interval: float = 0.0) -> Dict[str, int]:
+    """Refresh the memory gauges, at most once per min_interval seconds"""
+    global _last_rss_update
+    now = time.monotonic()
+    if now - _last_rss_update < min_interval:
+        return {}
+    _last_rss_update = now
+    breakdown = memory_breakdown()
+    PROCESS_RSS.labels(role=role).set(breakdown.get("rss") or current_rss_bytes())
+    for kind in ("pss", "shared", "private"):
+        if kind in breakdown:
+            PROCESS_MEMORY.labels(role=role, kind=kind).set(breakdown[kind])
+    return breakdown
+
+
+class QueueDepthCollector:
+    """Reads broker queue lengths at scrape time"""
+
+    def __init__(self, queues: Iterable[str], redis_client=None):
+        self.queues = list(queues)
+        self._redis = redis_client
+
+    def collect(self):
+        from .redis_client import get_redis
+
+        family = GaugeMetricFamily(
+            "celery_queue_depth", "Messages waiting in the broker queue", labels=["queue"]
+        )
+        try:
+            client = self._redis if self._redis is not None else get_redis()
+            for queue in self.queues:
+                family.add_metric([queue], client.llen(queue))
+        except Exception as e:
+            logger.error(f"Error reading queue depth: {str(e)}")
+        yield family
+
+
+class _DefaultRegistryCollector:
+    """Exposes the default registry (app and process metrics) in single-process mode"""
+
+    def collect(self):
+        return REGISTRY.collect()
+
+
+def build_registry(include_queue_depth: bool = False) -> CollectorRegistry:
+    """Registry aggregating every process when running in multiprocess mode"""
+    registry = CollectorRegistry()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(_DefaultRegistryCollector())
+    if include_queue_depth:
+        registry.register(QueueDepthCollector([settings.CELERY_QUEUE_NAME]))
+    return registry
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop a finished process's live gauges from the multiprocess files"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def render_latest(registry: CollectorRegistry):
+    """Serialized metrics and their content type"""
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,288 @@
+# backend/app/utils/outbox.py
+"""Transactional outbox for Celery task messages.
+
+Request handlers never talk to the broker. They call stage_task() in the same
+transaction that creates the row a task refers to, so either both commit or
+neither does. The dispatcher (``python -m app.utils.outbox``) publishes
+unpublished messages in id order, in batches over one broker connection.
+Rows are locked with SKIP LOCKED, so several dispatchers can run, and each
+row is marked published in the transaction that holds its lock. Failed
+publishes back off exponentially. Task ids are fixed when a message is
+staged, and transcribe_audio_task claims its job with a conditional UPDATE,
+so a message delivered twice does the work once.
+
+A sweeper stages pending jobs that never had a message (rows older than
+the outbox) and recovers jobs a lost worker left "processing". A job whose
+message was published is never re-sent for being slow: under load it can
+wait in the broker's queue for hours.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, exists, or_
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..core.tracing import continue_trace, current_carrier, span
+from ..models import TaskOutbox, Transcription
+from ..celery.client import TRANSCRIBE_TASK, send_task
+from .fair_share import FairShareDispatcher, new_task_id
+from .metrics import JOBS_REAPED, OUTBOX_LAG, OUTBOX_PENDING, OUTBOX_PUBLISHED, OUTBOX_REQUEUED
+
+logger = logging.getLogger(__name__)
+
+
+def stage_task(
+    db: Session,
+    task_name: str,
+    args: Sequence[Any],
+    queue: Optional[str] = None,
+    task_id: Optional[str] = None,
+    transcription_id: Optional[int] = None,
+    trace_context: Optional[Dict[str, str]] = None
+) -> TaskOutbox:
+    """Add a task message to the caller's transaction; it is published once that commits.
+
+    ``trace_context`` (default: the caller's current trace) parents the
+    enqueue span, and the message carries that span on to the worker, so one
+    trace runs from the upload to the result.
+    """
+    with continue_trace(trace_context), span("enqueue", task=task_name, transcription_id=transcription_id):
+        message = TaskOutbox(
+            task_name=task_name,
+            args=list(args),
+            queue=queue,
+            task_id=task_id or new_task_id(),
+            transcription_id=transcription_id,
+            trace_context=current_carrier() or trace_context,
+            created_at=datetime.utcnow()
+        )
+        db.add(message)
+    return message
+
+
+def retry_delay(attempts: int) -> float:
+    return min(settings.OUTBOX_RETRY_MAX_SECONDS, settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1))
+
+
+def publish_pending(
+    db: Session,
+    batch_size: int = settings.OUTBOX_BATCH_SIZE,
+    send: Optional[Callable[[TaskOutbox, Any], None]] = None
+) -> int:
+    """Publish one batch of due messages; returns how many went out"""
+    now = datetime.utcnow()
+    batch = (
+        db.query(TaskOutbox)
+        .filter(
+            TaskOutbox.published_at.is_(None),
+            or_(TaskOutbox.next_attempt_at.is_(None), TaskOutbox.next_attempt_at <= now)
+        )
+        .order_by(TaskOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not batch:
+        db.rollback()
+        return 0
+
+    from ..celery import celery_app
+
+    published = 0
+    with celery_app.producer_or_acquire() as producer:
+        for message in batch:
+            try:
+                with continue_trace(message.trace_context), span(
+                    "outbox.publish", task=message.task_name, transcription_id=message.transcription_id
+                ):
+                    if send is not None:
+                        send(message, producer)
+                    else:
+                        # Trace headers name the publish span as the worker's parent
+                        send_task(message.task_name, message.args, queue=message.queue,
+                                  task_id=message.task_id, producer=producer,
+                                  headers=current_carrier() or message.trace_context)
+            except Exception as e:
+                message.attempts = (message.attempts or 0) + 1
+                message.last_error = str(e)[:1000]
+                message.next_attempt_at = now + timedelta(seconds=retry_delay(message.attempts))
+                OUTBOX_PUBLISHED.labels(result="failed").inc()
+                logger.error(
+                    f"Error publishing outbox message {message.id} ({message.task_name}), "
+                    f"attempt {message.attempts}: {str(e)}"
+                )
+                # The broker is most likely down: leave the rest of the batch for the next tick
+                break
+            message.published_at = datetime.utcnow()
+            published += 1
+            OUTBOX_PUBLISHED.labels(result="published").inc()
+            if message.created_at is not None:
+                OUTBOX_LAG.observe(max(0.0, (message.published_at - message.created_at.replace(tzinfo=None)).total_seconds()))
+    db.commit()
+    return published
+
+
+def requeue_stale(db: Session, stale_seconds: int = settings.OUTBOX_STALE_PENDING_SECONDS) -> int:
+    """Stage jobs still pending that never had a transcription message staged.
+
+    Only undispatched rows qualify: uploads stage their message in the same
+    transaction (dispatched_at is set with it), so these are rows written
+    before the outbox or by hand. With fair share on, undispatched jobs are
+    the fair-share dispatcher's to release.
+    """
+    if settings.FAIR_SHARE_ENABLED:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_seconds)
+    any_message = exists().where(and_(
+        TaskOutbox.transcription_id == Transcription.id,
+        TaskOutbox.task_name == TRANSCRIBE_TASK
+    ))
+    stale = db.query(Transcription).filter(
+        Transcription.status == "pending",
+        Transcription.created_at < cutoff,
+        Transcription.dispatched_at.is_(None),
+        ~any_message
+    ).order_by(Transcription.id).limit(settings.OUTBOX_BATCH_SIZE).all()
+    for transcription in stale:
+        transcription.task_id = transcription.task_id or new_task_id()
+        transcription.dispatched_at = datetime.utcnow()
+        stage_task(db, TRANSCRIBE_TASK, [transcription.id], task_id=transcription.task_id,
+                   transcription_id=transcription.id, trace_context=transcription.trace_context)
+    db.commit()
+    if stale:
+        OUTBOX_REQUEUED.inc(len(stale))
+        logger.warning(f"Staged {len(stale)} pending transcriptions that never had a task: {[t.id for t in stale]}")
+    return len(stale)
+
+
+def reap_stale_processing(db: Session, stale_seconds: int = settings.PROCESSING_STALE_SECONDS) -> Tuple[int, int]:
+    """Recover jobs left "processing" by a worker that died (OOM kill, lost node).
+
+    No run outlives the hard time limit, so a job processing for longer has
+    no live worker; the broker's redelivery of its message, if any, was
+    turned away as a duplicate. It goes back to pending with a new message,
+    or fails once MAX_PROCESSING_ATTEMPTS deliveries have claimed it, so an
+    input that kills workers is not retried forever. Returns (requeued, failed).
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_seconds)
+    stale = db.query(Transcription).filter(
+        Transcription.status == "processing",
+        Transcription.started_at < cutoff
+    ).order_by(Transcription.id).limit(settings.OUTBOX_BATCH_SIZE).with_for_update(skip_locked=True).all()
+
+    requeued, failed = [], []
+    for transcription in stale:
+        if (transcription.attempts or 0) >= settings.MAX_PROCESSING_ATTEMPTS:
+            transcription.status = "failed"
+            transcription.error = f"Worker lost during processing {transcription.attempts} times"
+            failed.append(transcription.id)
+            continue
+        transcription.status = "pending"
+        transcription.started_at = None
+        transcription.task_id = new_task_id()
+        if settings.FAIR_SHARE_ENABLED:
+            # Back in its owner's queue; it also stops holding an in-flight slot
+            transcription.dispatched_at = None
+        else:
+            transcription.dispatched_at = datetime.utcnow()
+            stage_task(db, TRANSCRIBE_TASK, [transcription.id], task_id=transcription.task_id,
+                       transcription_id=transcription.id, trace_context=transcription.trace_context)
+        requeued.append(transcription.id)
+    db.commit()
+    if requeued:
+        JOBS_REAPED.labels(action="requeued").inc(len(requeued))
+        logger.warning(f"Requeued {len(requeued)} transcriptions abandoned by a lost worker: {requeued}")
+    if failed:
+        JOBS_REAPED.labels(action="failed").inc(len(failed))
+        logger.error(f"Failed {len(failed)} transcriptions after {settings.MAX_PROCESSING_ATTEMPTS} lost workers: {failed}")
+    return len(requeued), len(failed)
+
+
+def purge_published(db: Session, retention_hours: int = settings.OUTBOX_RETENTION_HOURS) -> int:
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+    deleted = db.query(TaskOutbox).filter(
+        TaskOutbox.published_at.isnot(None),
+        TaskOutbox.published_at < cutoff
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+class OutboxDispatcher:
+    """One loop for everything that hands work to the broker: fair-share release, publishing, sweeping"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        fair_share: Optional[FairShareDispatcher] = None,
+        sweep_interval: float = settings.OUTBOX_SWEEP_INTERVAL_SECONDS
+    ):
+        self._session_factory = session_factory
+        self.fair_share = fair_share
+        if self.fair_share is None and settings.FAIR_SHARE_ENABLED:
+            self.fair_share = FairShareDispatcher(session_factory=session_factory)
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+
+    def session(self) -> Session:
+        if self._session_factory is None:
+            from ..database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def run_once(self) -> Dict[str, int]:
+        result = {"released": 0, "published": 0, "requeued": 0, "reaped": 0}
+        if self.fair_share is not None:
+            result["released"] = len(self.fair_share.run_once())
+        db = self.session()
+        try:
+            while True:
+                published = publish_pending(db)
+                result["published"] += published
+                if published < settings.OUTBOX_BATCH_SIZE:
+                    break
+            if time.monotonic() - self._last_sweep >= self.sweep_interval:
+                self._last_sweep = time.monotonic()
+                result["requeued"] = requeue_stale(db)
+                result["reaped"] = sum(reap_stale_processing(db))
+                purge_published(db)
+                OUTBOX_PENDING.set(db.query(TaskOutbox).filter(TaskOutbox.published_at.is_(None)).count())
+        finally:
+            db.close()
+        return result
+
+    def run_forever(self, interval: float = settings.OUTBOX_POLL_INTERVAL) -> None:
+        logger.info(
+            f"Outbox dispatcher polling every {interval}s, batches of {settings.OUTBOX_BATCH_SIZE}, "
+            f"fair share {'on' if self.fair_share is not None else 'off'}"
+        )
+        while True:
+            try:
+                result = self.run_once()
+            except Exception as e:
+                logger.error(f"Outbox dispatch tick failed: {str(e)}")
+                result = {}
+            # Keep draining without sleeping while there is a backlog
+            if not any(result.values()):
+                time.sleep(interval)
+
+
+def main() -> None:
+    from prometheus_client import start_http_server
+    from ..core.tracing import init_tracing, shutdown_tracing
+
+    logging.basicConfig(level=logging.INFO)
+    if settings.OUTBOX_METRICS_PORT:
+        start_http_server(settings.OUTBOX_METRICS_PORT)
+    init_tracing("dispatcher")
+    try:
+        OutboxDispatcher().run_forever()
+    finally:
+        shutdown_tracing()
+
+
+if __name__ == "__main__":
+    main()
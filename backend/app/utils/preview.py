@@ -0,0 +1,110 @@
+# backend/app/utils/preview.py
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..engines.base import TranscriptionEngine
+from .streaming import frame_energy
+
+logger = logging.getLogger(__name__)
+
+_FRAME = 480  # 30 ms at 16 kHz
+
+# Chunks are decoded independently, so there is no previous text to condition on
+PREVIEW_OPTIONS = {"temperature": 0.0, "condition_on_previous_text": False}
+
+
+class PreviewCancelled(Exception):
+    """The final transcript arrived before the draft was finished"""
+
+
+def chunk_boundaries(
+    audio: np.ndarray,
+    chunk_seconds: float,
+    sample_rate: int = settings.SAMPLE_RATE,
+    search_seconds: float = 2.0
+) -> List[Tuple[int, int]]:
+    """Split into pieces of at most chunk_seconds, cutting at the quietest frame before each boundary"""
+    chunk = int(chunk_seconds * sample_rate)
+    if len(audio) <= chunk:
+        return [(0, len(audio))]
+    energy = frame_energy(audio)
+    search = int(search_seconds * sample_rate / _FRAME)
+    bounds, start = [], 0
+    while len(audio) - start > chunk:
+        nominal = (start + chunk) // _FRAME
+        # Only look backwards so no chunk exceeds chunk_seconds (Whisper's window is 30 s)
+        lo, hi = max(start // _FRAME + 1, nominal - search), min(len(energy), nominal + 1)
+        cut = (lo + int(np.argmin(energy[lo:hi]))) * _FRAME if hi > lo else nominal * _FRAME
+        bounds.append((start, cut))
+        start = cut
+    bounds.append((start, len(audio)))
+    return bounds
+
+
+def transcribe_chunked(
+    engine: TranscriptionEngine,
+    audio: np.ndarray,
+    language: Optional[str] = None,
+    chunk_seconds: float = settings.PREVIEW_CHUNK_SECONDS,
+    parallelism: int = settings.PREVIEW_PARALLELISM,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    sample_rate: int = settings.SAMPLE_RATE
+) -> Dict[str, Any]:
+    """Decode chunks in parallel and stitch them back together with stream timestamps.
+
+    Thread-safe engines (faster-whisper) decode chunks on concurrent threads;
+    openai-whisper decodes them as batches of ``parallelism`` windows instead.
+    ``should_cancel`` is polled as chunks finish; when it returns True the
+    remaining chunks are dropped and PreviewCancelled is raised.
+    """
+    bounds = chunk_boundaries(audio, chunk_seconds, sample_rate)
+    chunks = [audio[start:end] for start, end in bounds]
+    results: Dict[int, Dict[str, Any]] = {}
+
+    if not engine.concurrent_safe:
+        # One model can't serve parallel threads; batch the chunks through it instead
+        batch = max(1, parallelism)
+        for first in range(0, len(chunks), batch):
+            for offset, result in enumerate(
+                engine.transcribe_batch(chunks[first:first + batch], language=language, **PREVIEW_OPTIONS)
+            ):
+                results[first + offset] = result
+            if first + batch < len(chunks) and should_cancel is not None and should_cancel():
+                raise PreviewCancelled()
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, parallelism)) as executor:
+            futures = {
+                executor.submit(engine.transcribe, chunk, language=language, **PREVIEW_OPTIONS): index
+                for index, chunk in enumerate(chunks)
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[futures[future]] = future.result()
+                if pending and should_cancel is not None and should_cancel():
+                    for future in pending:
+                        future.cancel()
+                    raise PreviewCancelled()
+
+    segments, detected = [], language
+    for index, (start, _) in enumerate(bounds):
+        offset = start / sample_rate
+        result = results[index]
+        detected = detected or result.get("language")
+        for segment in result.get("segments", []):
+            segments.append({
+                **segment,
+                "id": len(segments),
+                "start": segment["start"] + offset,
+                "end": segment["end"] + offset,
+            })
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": detected,
+    }
@@ -0,0 +1,97 @@
+# backend/app/utils/profiling.py
+import cProfile
+import logging
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from ..config import settings
+from ..core.tracing import span
+from .metrics import STAGE_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+class StageRecorder:
+    """Accumulates wall-clock seconds per named processing stage, each also a trace span"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            with span(name):
+                yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + max(seconds, 0.0)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(seconds, 4) for name, seconds in self.timings.items()}
+
+    def observe(self) -> None:
+        for name, seconds in self.timings.items():
+            STAGE_DURATION.labels(stage=name).observe(seconds)
+
+
+def queue_wait_seconds(created_at: Optional[datetime], started_at: datetime) -> Optional[float]:
+    """Seconds between upload and a worker picking the job up"""
+    if created_at is None:
+        return None
+    # created_at comes from the database clock and may be naive (SQLite)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    if started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=timezone.utc)
+    return max((started_at - created_at).total_seconds(), 0.0)
+
+
+@contextmanager
+def maybe_profile(job_id: int) -> Iterator[Optional[Path]]:
+    """Profile the enclosed block for a PROFILE_SAMPLE_RATE fraction of jobs.
+
+    Writes ``<PROFILE_DIR>/transcription_<id>.prof`` (cProfile, open with
+    snakeviz or pstats) or ``.html`` when PROFILER=pyinstrument and it is
+    installed. Yields the output path, or None when the job is not sampled.
+    """
+    if settings.PROFILE_SAMPLE_RATE <= 0 or random.random() >= settings.PROFILE_SAMPLE_RATE:
+        yield None
+        return
+
+    settings.PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profiler = None
+    if settings.PROFILER == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            path = settings.PROFILE_DIR / f"transcription_{job_id}.html"
+        except ImportError:
+            logger.warning("pyinstrument is not installed, falling back to cProfile")
+    if profiler is None:
+        profiler = cProfile.Profile()
+        path = settings.PROFILE_DIR / f"transcription_{job_id}.prof"
+
+    if isinstance(profiler, cProfile.Profile):
+        profiler.enable()
+    else:
+        profiler.start()
+    try:
+        yield path
+    finally:
+        try:
+            if isinstance(profiler, cProfile.Profile):
+                profiler.disable()
+                profiler.dump_stats(str(path))
+            else:
+                profiler.stop()
+                path.write_text(profiler.output_html())
+            logger.info(f"Wrote profile for transcription {job_id} to {path}")
+        except Exception as e:
+            logger.error(f"Error writing profile for transcription {job_id}: {str(e)}")
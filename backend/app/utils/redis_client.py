@@ -0,0 +1,19 @@
+# backend/app/utils/redis_client.py
+from typing import Optional
+import redis
+from ..config import settings
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Shared Redis client for app-level state (stats, rate limits)"""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True
+        )
+    return _client
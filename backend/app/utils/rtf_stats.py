@@ -0,0 +1,297 @@
+# backend/app/utils/rtf_stats.py
+import json
+import logging
+import os
+import platform
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Transcription
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+_SAMPLES_KEY = "rtf:samples:{model}"
+_stats_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_snapshot: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+def hardware_tag() -> str:
+    """Identify the hardware a worker runs on, for grouping RTF samples"""
+    if settings.HARDWARE_TAG:
+        return settings.HARDWARE_TAG
+    accelerator = "cpu"
+    try:
+        import torch
+        if torch.cuda.is_available():
+            accelerator = torch.cuda.get_device_name(0).replace(" ", "_")
+    except ImportError:
+        pass
+    return f"{platform.machine()}-{os.cpu_count()}core-{accelerator}"
+
+
+def record_job(
+    model_size: str,
+    audio_seconds: float,
+    processing_seconds: float,
+    hardware: str,
+    stage_timings: Optional[Dict[str, float]] = None
+) -> None:
+    """Append a finished job to the model's rolling RTF window"""
+    if audio_seconds <= 0:
+        return
+    sample = {
+        "rtf": processing_seconds / audio_seconds,
+        "audio_seconds": audio_seconds,
+        "processing_seconds": processing_seconds,
+        "hardware": hardware,
+        "stages": stage_timings or {},
+        "ts": time.time()
+    }
+    key = _SAMPLES_KEY.format(model=model_size)
+    try:
+        pipe = get_redis().pipeline()
+        pipe.lpush(key, json.dumps(sample))
+        pipe.ltrim(key, 0, settings.RTF_STATS_WINDOW - 1)
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Error recording RTF sample: {str(e)}")
+
+
+def get_model_stats(model_size: str, use_cache: bool = True) -> Dict[str, Any]:
+    """Rolling p50/p95 real-time factor for a model, falling back to defaults"""
+    cached = _stats_cache.get(model_size)
+    if use_cache and cached and time.monotonic() - cached[0] < settings.RTF_STATS_CACHE_SECONDS:
+        return cached[1]
+
+    default_rtf = settings.DEFAULT_MODEL_RTF.get(model_size, 1.0)
+    stats: Dict[str, Any] = {
+        "model": model_size,
+        "samples": 0,
+        "source": "default",
+        "rtf_p50": default_rtf,
+        "rtf_p95": default_rtf * 2,
+    }
+    try:
+        raw = get_redis().lrange(_SAMPLES_KEY.format(model=model_size), 0, -1)
+    except Exception as e:
+        logger.error(f"Error reading RTF samples: {str(e)}")
+        raw = []
+
+    samples = [json.loads(item) for item in raw]
+    if len(samples) >= settings.RTF_MIN_SAMPLES:
+        import numpy as np  # not at module level: admission imports this module into every API worker
+        rtf = np.array([s["rtf"] for s in samples])
+        stats.update({
+            "samples": len(samples),
+            "source": "measured",
+            "rtf_p50": round(float(np.percentile(rtf, 50)), 4),
+            "rtf_p95": round(float(np.percentile(rtf, 95)), 4),
+            "rtf_mean": round(float(rtf.mean()), 4),
+            "audio_seconds_total": round(sum(s["audio_seconds"] for s in samples), 1),
+            "hardware": sorted({s.get("hardware", "unknown") for s in samples}),
+        })
+        stage_names = {name for s in samples for name in s.get("stages", {})}
+        stats["stage_seconds_p50"] = {
+            name: round(float(np.percentile(
+                [s["stages"][name] for s in samples if name in s.get("stages", {})], 50
+            )), 4)
+            for name in sorted(stage_names)
+        }
+
+    _stats_cache[model_size] = (time.monotonic(), stats)
+    return stats
+
+
+def get_all_stats() -> Dict[str, Dict[str, Any]]:
+    """RTF statistics for every configured model"""
+    return {model: get_model_stats(model) for model in settings.WHISPER_MODELS}
+
+
+def estimated_audio_seconds(file_size: Optional[int], audio_duration: Optional[float]) -> float:
+    """Audio duration if known, otherwise a bitrate-based guess from file size"""
+    if audio_duration:
+        return audio_duration
+    return (file_size or 0) / settings.ESTIMATED_AUDIO_BYTES_PER_SECOND
+
+
+def queue_backlog(db: Session, before_id: Optional[int] = None) -> Dict[str, Any]:
+    """Queued and running work, expressed as p50/p95 processing seconds"""
+    jobs = 0
+    seconds_p50 = 0.0
+    seconds_p95 = 0.0
+
+    pending = db.query(
+        Transcription.model_size,
+        func.count(Transcription.id),
+        func.sum(func.coalesce(
+            Transcription.audio_duration,
+            Transcription.file_size / float(settings.ESTIMATED_AUDIO_BYTES_PER_SECOND)
+        ))
+    ).filter(Transcription.status == "pending")
+    if before_id is not None:
+        pending = pending.filter(Transcription.id < before_id)
+
+    for model_size, count, audio_seconds in pending.group_by(Transcription.model_size):
+        stats = get_model_stats(model_size)
+        jobs += count
+        seconds_p50 += (audio_seconds or 0) * stats["rtf_p50"]
+        seconds_p95 += (audio_seconds or 0) * stats["rtf_p95"]
+
+    processing = db.query(
+        Transcription.model_size,
+        Transcription.file_size,
+        Transcription.audio_duration,
+        Transcription.started_at
+    ).filter(Transcription.status == "processing")
+    now = datetime.utcnow()
+    for model_size, file_size, audio_duration, started_at in processing:
+        stats = get_model_stats(model_size)
+        audio_seconds = estimated_audio_seconds(file_size, audio_duration)
+        elapsed = (now - started_at.replace(tzinfo=None)).total_seconds() if started_at else 0.0
+        jobs += 1
+        seconds_p50 += max(0.0, audio_seconds * stats["rtf_p50"] - elapsed)
+        seconds_p95 += max(0.0, audio_seconds * stats["rtf_p95"] - elapsed)
+
+    return {"jobs": jobs, "seconds_p50": seconds_p50, "seconds_p95": seconds_p95}
+
+
+def live_concurrency() -> int:
+    """Pool processes across the workers as the autoscaler last applied them, else the static setting"""
+    from .autoscaler import POOL_SIZE_KEY
+    try:
+        reported = get_redis().get(POOL_SIZE_KEY)
+    except Exception as e:
+        logger.error(f"Error reading pool size: {str(e)}")
+        reported = None
+    return max(1, int(reported) if reported else settings.CELERY_WORKER_CONCURRENCY)
+
+
+def _start_order(pending: List[Any]) -> Tuple[List[Any], str]:
+    """Pending jobs in the order workers will start them.
+
+    FIFO by id, unless fair share is on: then jobs already on the broker go
+    first and the rest follow a deficit round robin projection, the order the
+    dispatcher releases them in (per-owner caps aside, which delay but don't
+    reorder).
+    """
+    if not settings.FAIR_SHARE_ENABLED:
+        return pending, "fifo"
+    from .fair_share import ANONYMOUS_OWNER, DeficitRoundRobin, QueuedJob
+
+    dispatched = [row for row in pending if row.dispatched_at is not None]
+    waiting: Dict[str, List[QueuedJob]] = {}
+    rows = {}
+    for row in pending:
+        if row.dispatched_at is None:
+            owner = row.owner or ANONYMOUS_OWNER
+            waiting.setdefault(owner, []).append(
+                QueuedJob(row.id, owner, estimated_audio_seconds(row.file_size, row.audio_duration))
+            )
+            rows[row.id] = row
+    picked = DeficitRoundRobin(owner_cap=0, owner_caps={}).select(waiting, {}, len(rows))
+    return dispatched + [rows[job.id] for job in picked], "fair_share"
+
+
+def queue_snapshot(db: Session, use_cache: bool = True) -> Dict[str, Any]:
+    """Projected start order of the queue and the work ahead of each pending job.
+
+    Status polls share one snapshot per process for ETA_SNAPSHOT_SECONDS
+    rather than each scanning the queue.
+    """
+    global _snapshot
+    if use_cache and _snapshot and time.monotonic() - _snapshot[0] < settings.ETA_SNAPSHOT_SECONDS:
+        return _snapshot[1]
+
+    running, seconds_p50, seconds_p95 = 0, 0.0, 0.0
+    now = datetime.utcnow()
+    processing = db.query(
+        Transcription.model_size,
+        Transcription.file_size,
+        Transcription.audio_duration,
+        Transcription.started_at
+    ).filter(Transcription.status == "processing")
+    for model_size, file_size, audio_duration, started_at in processing:
+        stats = get_model_stats(model_size)
+        audio_seconds = estimated_audio_seconds(file_size, audio_duration)
+        elapsed = (now - started_at.replace(tzinfo=None)).total_seconds() if started_at else 0.0
+        running += 1
+        seconds_p50 += max(0.0, audio_seconds * stats["rtf_p50"] - elapsed)
+        seconds_p95 += max(0.0, audio_seconds * stats["rtf_p95"] - elapsed)
+
+    pending = db.query(
+        Transcription.id,
+        Transcription.owner,
+        Transcription.model_size,
+        Transcription.file_size,
+        Transcription.audio_duration,
+        Transcription.dispatched_at
+    ).filter(Transcription.status == "pending").order_by(Transcription.id).all()
+    ordered, order = _start_order(pending)
+
+    # id -> (jobs ahead, p50 and p95 processing seconds ahead), running jobs included
+    ahead: Dict[int, Tuple[int, float, float]] = {}
+    for index, row in enumerate(ordered):
+        ahead[row.id] = (running + index, seconds_p50, seconds_p95)
+        stats = get_model_stats(row.model_size)
+        audio_seconds = estimated_audio_seconds(row.file_size, row.audio_duration)
+        seconds_p50 += audio_seconds * stats["rtf_p50"]
+        seconds_p95 += audio_seconds * stats["rtf_p95"]
+
+    snapshot = {
+        "ahead": ahead,
+        "total": (running + len(ordered), seconds_p50, seconds_p95),
+        "order": order,
+        "workers": live_concurrency(),
+    }
+    _snapshot = (time.monotonic(), snapshot)
+    return snapshot
+
+
+def estimate_completion(db: Session, transcription: Transcription) -> Dict[str, Any]:
+    """ETA for a queued transcription from measured RTF and the work projected to start before it"""
+    stats = get_model_stats(transcription.model_size)
+    audio_seconds = estimated_audio_seconds(transcription.file_size, transcription.audio_duration)
+    snapshot = queue_snapshot(db)
+    if transcription.status == "pending" and transcription.id not in snapshot["ahead"]:
+        snapshot = queue_snapshot(db, use_cache=False)  # uploaded since the snapshot was taken
+
+    own_p50 = audio_seconds * stats["rtf_p50"]
+    own_p95 = audio_seconds * stats["rtf_p95"]
+    if transcription.status == "processing" and transcription.started_at:
+        elapsed = (datetime.utcnow() - transcription.started_at.replace(tzinfo=None)).total_seconds()
+        jobs_ahead, ahead_p50, ahead_p95 = 0, 0.0, 0.0
+        own_p50 = max(0.0, own_p50 - elapsed)
+        own_p95 = max(0.0, own_p95 - elapsed)
+    else:
+        jobs_ahead, ahead_p50, ahead_p95 = snapshot["ahead"].get(transcription.id, snapshot["total"])
+
+    workers = snapshot["workers"]
+    eta_p50 = ahead_p50 / workers + own_p50
+    eta_p95 = ahead_p95 / workers + own_p95
+    return {
+        "queue_position": jobs_ahead + 1 if transcription.status == "pending" else 0,
+        "queue_depth": snapshot["total"][0],
+        "queue_order": snapshot["order"],
+        "workers": workers,
+        "estimated_audio_seconds": round(audio_seconds, 1),
+        "estimated_seconds": round(eta_p50, 1),
+        "estimated_seconds_p95": round(eta_p95, 1),
+        "estimated_completion_at": (datetime.utcnow() + timedelta(seconds=eta_p50)).isoformat() + "Z",
+        "rtf_source": stats["source"],
+    }
+
+
+def format_eta(seconds: float) -> str:
+    """Human readable ETA"""
+    minutes = seconds / 60
+    if minutes < 1:
+        return "less than a minute"
+    elif minutes < 5:
+        return "about 5 minutes"
+    return f"about {int(minutes)} minutes"
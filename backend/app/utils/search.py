@@ -0,0 +1,224 @@
+# backend/app/utils/search.py
+"""Full-text search over completed transcripts.
+
+Transcripts are stored compressed, so the index keeps its own plain-text
+excerpt of each one (the first SEARCH_EXCERPT_CHARS characters) written
+alongside the search document. Snippets and hit timestamps come from that
+excerpt in the search query itself; a search never decompresses a
+transcript. Hits past the excerpt still rank; they get no timestamps, and
+on Postgres no highlighted snippet either.
+"""
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Transcription
+from .segments import PackedSegments
+from .transcript_text import load_texts
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "transcript_search"
+_MARK_START = "<mark>"
+_MARK_END = "</mark>"
+_MARKED = re.compile(re.escape(_MARK_START) + r"(.+?)" + re.escape(_MARK_END))
+
+
+class SearchUnavailableError(Exception):
+    """Raised when the database has no usable full-text index"""
+
+
+def ensure_search_schema(bind) -> bool:
+    """Create the full-text index for the current dialect if missing"""
+    dialect = bind.dialect.name
+    try:
+        with bind.begin() as conn:
+            if dialect == "postgresql":
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+                    " transcription_id INTEGER PRIMARY KEY"
+                    " REFERENCES transcriptions(id) ON DELETE CASCADE,"
+                    " document TSVECTOR NOT NULL,"
+                    " excerpt TEXT)"
+                ))
+                conn.execute(text(f"ALTER TABLE {SEARCH_TABLE} ADD COLUMN IF NOT EXISTS excerpt TEXT"))
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document"
+                    f" ON {SEARCH_TABLE} USING GIN (document)"
+                ))
+            elif dialect == "sqlite":
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE}"
+                    " USING fts5(text, tokenize='unicode61')"
+                ))
+            else:
+                logger.warning(f"Full-text search not supported on {dialect}")
+                return False
+        return True
+    except Exception as e:
+        logger.error(f"Error creating search index: {str(e)}")
+        return False
+
+
+def index_transcription(db: Session, transcription_id: int, document: str) -> None:
+    """Add or replace a transcript in the index (inside the caller's transaction)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (transcription_id, document, excerpt)"
+                " VALUES (:id, to_tsvector(CAST(:config AS regconfig), :document), :excerpt)"
+                " ON CONFLICT (transcription_id) DO UPDATE"
+                " SET document = EXCLUDED.document, excerpt = EXCLUDED.excerpt"
+            ),
+            {
+                "id": transcription_id,
+                "config": settings.SEARCH_TEXT_CONFIG,
+                "document": document,
+                "excerpt": document[:settings.SEARCH_EXCERPT_CHARS]
+            }
+        )
+    elif dialect == "sqlite":
+        db.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"), {"id": transcription_id})
+        db.execute(
+            text(f"INSERT INTO {SEARCH_TABLE} (rowid, text) VALUES (:id, :document)"),
+            {"id": transcription_id, "document": document}
+        )
+
+
+def remove_from_index(db: Session, transcription_ids: List[int]) -> None:
+    """Drop transcripts from the index; Postgres rows cascade with the transcription"""
+    if transcription_ids and db.get_bind().dialect.name == "sqlite":
+        db.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({','.join(str(int(i)) for i in transcription_ids)})")
+        )
+
+
+def backfill_search_index(db: Session, batch_size: int = 500) -> int:
+    """Index (or re-index) all completed transcriptions, e.g. those that predate the index or its excerpts"""
+    indexed = 0
+    last_id = 0
+    while True:
+        ids = [row.id for row in db.query(Transcription.id).filter(
+            Transcription.status == "completed",
+            Transcription.id > last_id
+        ).order_by(Transcription.id).limit(batch_size)]
+        if not ids:
+            break
+        documents = load_texts(db, ids)
+        for transcription_id, document in documents.items():
+            index_transcription(db, transcription_id, document)
+        db.commit()
+        indexed += len(documents)
+        last_id = ids[-1]
+    return indexed
+
+
+def _fts5_query(query: str) -> str:
+    """Quote each term so user input can't inject FTS5 syntax"""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+def _hit_timestamps(snippet: str, excerpt: Optional[str], segments: Optional[bytes]) -> List[float]:
+    """Start times of the segments containing the highlighted terms; the excerpt is the transcript's head"""
+    if not excerpt or not segments:
+        return []
+    terms = {match.lower() for match in _MARKED.findall(snippet or "")}
+    if not terms:
+        return []
+
+    packed = PackedSegments(segments)
+    pattern = re.compile(
+        r"\b(" + "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + r")\b",
+        re.IGNORECASE
+    )
+    timestamps: List[float] = []
+    for match in pattern.finditer(excerpt):
+        timestamp = packed.time_at_offset(match.start())
+        if timestamp is None:
+            continue
+        timestamp = round(timestamp, 3)
+        if timestamp not in timestamps:
+            timestamps.append(timestamp)
+        if len(timestamps) >= settings.SEARCH_MAX_TIMESTAMPS:
+            break
+    return timestamps
+
+
+def search_transcriptions(
+    db: Session,
+    query: str,
+    limit: int = 20,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """Ranked full-text search over completed transcripts"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Headlines are built in an outer query so only the returned page pays for them
+        rows = db.execute(
+            text(
+                "SELECT id, rank, excerpt, ts_headline(CAST(:config AS regconfig), excerpt, q,"
+                " 'StartSel=" + _MARK_START + ", StopSel=" + _MARK_END + ","
+                "  MaxFragments=2, MaxWords=20, MinWords=5') AS snippet"
+                " FROM (SELECT s.transcription_id AS id, ts_rank(s.document, q) AS rank, s.excerpt, q"
+                f" FROM {SEARCH_TABLE} s, websearch_to_tsquery(CAST(:config AS regconfig), :query) q"
+                " WHERE s.document @@ q"
+                " ORDER BY rank DESC LIMIT :limit OFFSET :offset) hits"
+                " ORDER BY rank DESC"
+            ),
+            {"config": settings.SEARCH_TEXT_CONFIG, "query": query, "limit": limit, "offset": offset}
+        ).all()
+    elif dialect == "sqlite":
+        rows = db.execute(
+            text(
+                f"SELECT rowid AS id, -bm25({SEARCH_TABLE}) AS rank,"
+                f" snippet({SEARCH_TABLE}, 0, '{_MARK_START}', '{_MARK_END}', '...', 24) AS snippet,"
+                " substr(text, 1, :excerpt_chars) AS excerpt"
+                f" FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query"
+                " ORDER BY rank DESC LIMIT :limit OFFSET :offset"
+            ),
+            {
+                "query": _fts5_query(query),
+                "excerpt_chars": settings.SEARCH_EXCERPT_CHARS,
+                "limit": limit,
+                "offset": offset
+            }
+        ).all()
+    else:
+        raise SearchUnavailableError(f"Full-text search not supported on {dialect}")
+
+    if not rows:
+        return []
+
+    details = {
+        row.id: row for row in db.query(
+            Transcription.id,
+            Transcription.original_filename,
+            Transcription.created_at,
+            Transcription.completed_at,
+            Transcription.segments
+        ).filter(
+            Transcription.id.in_([row.id for row in rows]),
+            Transcription.status == "completed"
+        )
+    }
+
+    hits = []
+    for row in rows:
+        detail = details.get(row.id)
+        if detail is None:
+            continue
+        hits.append({
+            "id": row.id,
+            "original_filename": detail.original_filename,
+            "created_at": detail.created_at,
+            "completed_at": detail.completed_at,
+            "rank": round(float(row.rank), 6),
+            "snippet": row.snippet,
+            "timestamps": _hit_timestamps(row.snippet, row.excerpt, detail.segments)
+        })
+    return hits
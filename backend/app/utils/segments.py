@@ -0,0 +1,124 @@
+# backend/app/utils/segments.py
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Layout (little endian):
+#   header  : magic(4s) version(H) count(I)
+#   float32 : start[n], end[n], avg_logprob[n], no_speech_prob[n]
+#   uint32  : text_start[n], text_end[n]  (character offsets into Transcription.text)
+MAGIC = b"SEG1"
+VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+_FLOAT_FIELDS = ("start", "end", "avg_logprob", "no_speech_prob")
+_OFFSET_FIELDS = ("text_start", "text_end")
+
+
+def _text_offsets(segments: List[Dict[str, Any]], text: str) -> Tuple[List[int], List[int]]:
+    """Locate each segment's text inside the full transcript"""
+    starts, ends = [], []
+    cursor = 0
+    for segment in segments:
+        segment_text = segment.get("text", "") or ""
+        index = text.find(segment_text, cursor) if segment_text else -1
+        if index < 0:
+            # Segment text was normalised differently; keep offsets monotonic
+            index = min(cursor, len(text))
+        end = min(index + len(segment_text), len(text))
+        starts.append(index)
+        ends.append(end)
+        cursor = end
+    return starts, ends
+
+
+def pack_segments(segments: Iterable[Dict[str, Any]], text: str) -> bytes:
+    """Pack Whisper segments into a compact columnar blob"""
+    segments = list(segments)
+    count = len(segments)
+    text_start, text_end = _text_offsets(segments, text)
+
+    columns = [
+        np.asarray([float(s.get("start", 0.0)) for s in segments], dtype="<f4"),
+        # Keep ends non-decreasing so range lookups can binary search them
+        np.maximum.accumulate(
+            np.asarray([float(s.get("end", 0.0)) for s in segments], dtype="<f4")
+        ) if count else np.zeros(0, dtype="<f4"),
+        np.asarray([float(s.get("avg_logprob", 0.0)) for s in segments], dtype="<f4"),
+        np.asarray([float(s.get("no_speech_prob", 0.0)) for s in segments], dtype="<f4"),
+        np.asarray(text_start, dtype="<u4"),
+        np.asarray(text_end, dtype="<u4"),
+    ]
+    return _HEADER.pack(MAGIC, VERSION, count) + b"".join(c.tobytes() for c in columns)
+
+
+class PackedSegments:
+    """Read-only view over a packed segment blob.
+
+    Columns are exposed as zero-copy NumPy views, so a time-range lookup only
+    touches the start/end arrays plus the rows it returns.
+    """
+
+    def __init__(self, blob: bytes):
+        magic, version, count = _HEADER.unpack_from(blob, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Unsupported segment blob format")
+        expected = _HEADER.size + count * 4 * (len(_FLOAT_FIELDS) + len(_OFFSET_FIELDS))
+        if len(blob) != expected:
+            raise ValueError("Corrupt segment blob")
+
+        self._count = count
+        offset = _HEADER.size
+        for name in _FLOAT_FIELDS:
+            setattr(self, name, np.frombuffer(blob, dtype="<f4", count=count, offset=offset))
+            offset += count * 4
+        for name in _OFFSET_FIELDS:
+            setattr(self, name, np.frombuffer(blob, dtype="<u4", count=count, offset=offset))
+            offset += count * 4
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def duration(self) -> float:
+        return float(self.end[-1]) if self._count else 0.0
+
+    def index_range(self, start: Optional[float] = None, end: Optional[float] = None) -> range:
+        """Indices of segments overlapping [start, end)"""
+        lo = 0 if start is None else int(np.searchsorted(self.end, start, side="right"))
+        hi = self._count if end is None else int(np.searchsorted(self.start, end, side="left"))
+        return range(lo, max(lo, hi))
+
+    def index_at_offset(self, char_offset: int) -> Optional[int]:
+        """Index of the segment containing a character offset of the transcript"""
+        if not self._count:
+            return None
+        index = int(np.searchsorted(self.text_start, char_offset, side="right")) - 1
+        return max(index, 0)
+
+    def time_at_offset(self, char_offset: int) -> Optional[float]:
+        """Start time of the segment containing a character offset"""
+        index = self.index_at_offset(char_offset)
+        return None if index is None else float(self.start[index])
+
+    def segment(self, index: int, text: Optional[str] = None) -> Dict[str, Any]:
+        """Materialise a single segment as a dict"""
+        item = {
+            "id": index,
+            "start": round(float(self.start[index]), 3),
+            "end": round(float(self.end[index]), 3),
+            "avg_logprob": round(float(self.avg_logprob[index]), 4),
+            "no_speech_prob": round(float(self.no_speech_prob[index]), 4),
+        }
+        if text is not None:
+            item["text"] = text[int(self.text_start[index]):int(self.text_end[index])]
+        return item
+
+    def slice(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        text: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Materialise only the segments overlapping a time range"""
+        return [self.segment(i, text) for i in self.index_range(start, end)]
@@ -0,0 +1,212 @@
+# backend/app/utils/streaming.py
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..config import settings
+from ..engines.base import TranscriptionEngine
+from .transcription import profile_options
+
+logger = logging.getLogger(__name__)
+
+_FRAME = 480  # 30 ms at 16 kHz
+
+# Partials favour latency: greedy decoding, no temperature fallback
+PARTIAL_OPTIONS = {"temperature": 0.0, "condition_on_previous_text": False}
+
+
+def pcm16_to_float(data: bytes) -> np.ndarray:
+    return np.frombuffer(data[:len(data) - len(data) % 2], np.int16).astype(np.float32) / 32768.0
+
+
+def frame_energy(audio: np.ndarray) -> np.ndarray:
+    """RMS per 30 ms frame"""
+    frames = len(audio) // _FRAME
+    if not frames:
+        return np.zeros(0, np.float32)
+    return np.sqrt(np.mean(audio[:frames * _FRAME].reshape(frames, _FRAME) ** 2, axis=1))
+
+
+class StreamingTranscriber:
+    """Incremental transcription over a sliding window of live audio.
+
+    Audio accumulates in an uncommitted window. Every ``partial_interval``
+    seconds the window is re-decoded and a provisional ``partial`` is emitted.
+    Once the energy VAD sees ``commit_silence`` seconds of trailing silence
+    after speech (or the window reaches ``max_window``), the window is decoded
+    with the full decoding options, emitted as ``final`` segments with stream
+    timestamps, and dropped; its text primes the next window.
+    """
+
+    def __init__(
+        self,
+        engine: TranscriptionEngine,
+        language: Optional[str] = None,
+        sample_rate: int = settings.SAMPLE_RATE,
+        partial_interval: float = settings.STREAM_PARTIAL_INTERVAL,
+        commit_silence: float = settings.STREAM_COMMIT_SILENCE,
+        max_window: float = settings.STREAM_MAX_WINDOW,
+        vad_threshold: float = settings.STREAM_VAD_THRESHOLD
+    ):
+        self.engine = engine
+        self.language = language
+        self.sample_rate = sample_rate
+        self.partial_interval = partial_interval
+        self.commit_silence = commit_silence
+        self.max_window = max_window
+        self.vad_threshold = vad_threshold
+
+        self.buffer = np.zeros(0, np.float32)
+        self.offset = 0.0  # stream time of buffer[0]
+        self.prompt = ""
+        self.last_partial_at = 0  # buffer length at the last partial
+        self.segments_emitted = 0
+
+    @property
+    def buffered_seconds(self) -> float:
+        return len(self.buffer) / self.sample_rate
+
+    def _commit_point(self, energy: np.ndarray) -> Optional[int]:
+        """Sample index to cut the window at, or None to keep listening"""
+        voiced = energy > self.vad_threshold
+        if not voiced.any():
+            # Pure silence: discard it so the window doesn't grow unbounded
+            return len(voiced) * _FRAME if self.buffered_seconds >= self.commit_silence else None
+
+        silence_frames = int(self.commit_silence * self.sample_rate / _FRAME)
+        last_voiced = int(np.flatnonzero(voiced)[-1])
+        if len(voiced) - 1 - last_voiced >= silence_frames:
+            return len(voiced) * _FRAME
+
+        if self.buffered_seconds >= self.max_window:
+            # Forced commit: cut in the quietest frame of the last third, not mid-word
+            start = len(energy) * 2 // 3
+            return (start + int(np.argmin(energy[start:])) + 1) * _FRAME
+        return None
+
+    def _decode(self, audio: np.ndarray, options: Dict[str, Any]) -> Dict[str, Any]:
+        if self.prompt:
+            options = {**options, "initial_prompt": self.prompt[-settings.STREAM_PROMPT_CHARS:]}
+        return self.engine.transcribe(audio, language=self.language, **options)
+
+    def _finalize(self, cut: int) -> Optional[Dict[str, Any]]:
+        audio, self.buffer = self.buffer[:cut], self.buffer[cut:]
+        start = self.offset
+        self.offset += cut / self.sample_rate
+        self.last_partial_at = 0
+        if not self._has_speech(audio):
+            return None
+
+        result = self._decode(audio, profile_options())
+        segments = []
+        for segment in result.get("segments", []):
+            text = segment["text"].strip()
+            if not text:
+                continue
+            segments.append({
+                "id": self.segments_emitted,
+                "start": round(start + segment["start"], 3),
+                "end": round(start + min(segment["end"], len(audio) / self.sample_rate), 3),
+                "text": text,
+            })
+            self.segments_emitted += 1
+        text = " ".join(segment["text"] for segment in segments)
+        if text:
+            self.prompt = f"{self.prompt} {text}".strip()
+        if result.get("language") and not self.language:
+            self.language = result["language"]
+        return {"type": "final", "segments": segments, "text": text, "language": result.get("language")}
+
+    def _has_speech(self, audio: np.ndarray) -> bool:
+        return bool((frame_energy(audio) > self.vad_threshold).any())
+
+    def feed(self, samples: np.ndarray) -> List[Dict[str, Any]]:
+        """Add audio and return any partial/final events that became due (blocking)"""
+        self.buffer = np.concatenate([self.buffer, samples.astype(np.float32, copy=False)])
+        events = []
+
+        cut = self._commit_point(frame_energy(self.buffer))
+        if cut is not None:
+            event = self._finalize(cut)
+            if event is not None:
+                events.append(event)
+            return events
+
+        due = len(self.buffer) - self.last_partial_at >= self.partial_interval * self.sample_rate
+        if due and self._has_speech(self.buffer):
+            self.last_partial_at = len(self.buffer)
+            result = self._decode(self.buffer, PARTIAL_OPTIONS)
+            events.append({
+                "type": "partial",
+                "start": round(self.offset, 3),
+                "end": round(self.offset + self.buffered_seconds, 3),
+                "text": result["text"].strip(),
+            })
+        return events
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Finalize whatever is buffered at end of stream"""
+        if not len(self.buffer):
+            return []
+        event = self._finalize(len(self.buffer))
+        return [event] if event is not None else []
+
+
+class FFmpegStreamDecoder:
+    """Decodes a compressed stream (Ogg/WebM Opus) to 16 kHz s16le through an ffmpeg pipe"""
+
+    def __init__(self, sample_rate: int = settings.SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._pending = bytearray()
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-nostdin", "-loglevel", "error",
+            "-fflags", "nobuffer", "-probesize", "32768",
+            "-i", "pipe:0",
+            "-f", "s16le", "-ac", "1", "-ar", str(self.sample_rate), "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while True:
+            chunk = await self.process.stdout.read(65536)
+            if not chunk:
+                break
+            self._pending.extend(chunk)
+
+    async def write(self, data: bytes) -> bytes:
+        """Feed compressed bytes; returns whatever PCM ffmpeg has produced so far"""
+        self.process.stdin.write(data)
+        await self.process.stdin.drain()
+        await asyncio.sleep(0)
+        return self.take()
+
+    def take(self) -> bytes:
+        usable = len(self._pending) - len(self._pending) % 2
+        pcm = bytes(self._pending[:usable])
+        del self._pending[:usable]
+        return pcm
+
+    async def close(self) -> bytes:
+        """Signal end of stream and return the remaining PCM"""
+        if self.process is None:
+            return b""
+        if self.process.returncode is None:
+            try:
+                self.process.stdin.close()
+            except Exception:
+                pass
+            try:
+                await asyncio.wait_for(self._reader, timeout=10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+            await self.process.wait()
+        return self.take()
@@ -0,0 +1,152 @@
+# backend/app/utils/transcript_text.py
+"""Compressed transcript storage.
+
+Full transcripts live in ``transcription_texts``, compressed with zstd (or
+zlib where zstandard isn't installed), so the transcriptions row only carries
+a short preview and the length that status polls return. Rows written before
+the table existed keep their plain ``Transcription.text`` and are still read;
+``python -m app.manage compress-texts`` moves them over.
+"""
+import logging
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import Transcription, TranscriptionText
+
+logger = logging.getLogger(__name__)
+
+# Content-Encoding under which each codec's blob can be sent as-is (zlib streams are HTTP "deflate")
+CONTENT_ENCODINGS = {"zstd": "zstd", "zlib": "deflate"}
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_warned = False
+
+
+def _zstd():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def _codec() -> str:
+    global _warned
+    if settings.TEXT_COMPRESSION == "zstd" and _zstd() is None:
+        if not _warned:
+            logger.warning("zstandard is not installed, compressing transcripts with zlib")
+            _warned = True
+        return "zlib"
+    return settings.TEXT_COMPRESSION
+
+
+def compress_text(text: str) -> Tuple[str, bytes]:
+    """(codec, compressed UTF-8 bytes)"""
+    codec = _codec()
+    raw = text.encode("utf-8")
+    if codec == "zstd":
+        return codec, _zstd().ZstdCompressor(level=settings.TEXT_COMPRESSION_LEVEL).compress(raw)
+    if codec == "zlib":
+        return codec, zlib.compress(raw, min(settings.TEXT_COMPRESSION_LEVEL, 9))
+    raise ValueError(f"Unknown TEXT_COMPRESSION: {codec}")
+
+
+def iter_decompressed(codec: str, data: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """UTF-8 chunks of a compressed transcript, without inflating it all at once"""
+    if codec == "zstd":
+        zstandard = _zstd()
+        if zstandard is None:
+            raise RuntimeError("Transcript is zstd-compressed but zstandard is not installed")
+        yield from zstandard.ZstdDecompressor().read_to_iter(data, read_size=chunk_size, write_size=chunk_size)
+    elif codec == "zlib":
+        decompressor = zlib.decompressobj()
+        for start in range(0, len(data), chunk_size):
+            chunk = decompressor.decompress(data[start:start + chunk_size])
+            if chunk:
+                yield chunk
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+    else:
+        raise ValueError(f"Unknown transcript codec: {codec}")
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    return b"".join(iter_decompressed(codec, data)).decode("utf-8")
+
+
+def text_summary(text: str) -> Dict[str, Any]:
+    """Column values for the transcriptions row; the full text goes to save_text()"""
+    return {"text": None, "text_preview": text[:settings.TEXT_PREVIEW_CHARS], "text_length": len(text)}
+
+
+def save_text(db: Session, transcription_id: int, text: str) -> TranscriptionText:
+    """Replace a transcript's compressed text (inside the caller's transaction).
+
+    Update the transcriptions row first: its row lock orders concurrent draft
+    and final writes, so the delete below always sees the other's insert.
+    """
+    codec, data = compress_text(text)
+    db.execute(delete(TranscriptionText).where(TranscriptionText.transcription_id == transcription_id))
+    row = TranscriptionText(
+        transcription_id=transcription_id,
+        codec=codec,
+        data=data,
+        raw_size=len(text.encode("utf-8"))
+    )
+    db.add(row)
+    return row
+
+
+def load_texts(db: Session, transcription_ids: Iterable[int]) -> Dict[int, str]:
+    """Full transcripts by id, compressed or legacy; ids without text are left out"""
+    ids = list(transcription_ids)
+    if not ids:
+        return {}
+    texts = {
+        row.transcription_id: decompress_text(row.codec, row.data)
+        for row in db.query(TranscriptionText).filter(TranscriptionText.transcription_id.in_(ids))
+    }
+    missing = [i for i in ids if i not in texts]
+    if missing:
+        texts.update(
+            (row.id, row.text) for row in db.query(Transcription.id, Transcription.text).filter(
+                Transcription.id.in_(missing),
+                Transcription.text.isnot(None)
+            )
+        )
+    return texts
+
+
+def load_text(db: Session, transcription_id: int) -> Optional[str]:
+    return load_texts(db, [transcription_id]).get(transcription_id)
+
+
+def compress_legacy_texts(db: Session, batch_size: int = 200) -> Tuple[int, int, int]:
+    """Move plain Transcription.text into transcription_texts.
+
+    Returns (rows, raw bytes, compressed bytes). Batches commit on their own,
+    so an interrupted run resumes where it stopped.
+    """
+    moved, raw_bytes, stored_bytes = 0, 0, 0
+    while True:
+        rows: List[Transcription] = db.query(Transcription).filter(
+            Transcription.text.isnot(None)
+        ).order_by(Transcription.id).limit(batch_size).all()
+        if not rows:
+            break
+        for transcription in rows:
+            text = transcription.text
+            for column, value in text_summary(text).items():
+                setattr(transcription, column, value)
+            db.flush()
+            stored = save_text(db, transcription.id, text)
+            raw_bytes += stored.raw_size
+            stored_bytes += len(stored.data)
+        db.commit()
+        moved += len(rows)
+    return moved, raw_bytes, stored_bytes
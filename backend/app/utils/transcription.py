@@ -1,39 +1,53 @@
 # backend/app/utils/transcription.py
-import whisper
-from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import logging
 from ..config import settings
+from ..engines import get_engine
+from ..engines.base import AudioInput
 
 logger = logging.getLogger(__name__)
 
+def normalize_language(language: Optional[str]) -> Optional[str]:
+    """Map the API's "auto" to the engines' None (detect)"""
+    if not language or language == "auto":
+        return None
+    return language
+
+def profile_options(profile: Optional[str] = None) -> Dict[str, Any]:
+    """DECODING_OPTIONS with a named profile (default DECODING_PROFILE) applied"""
+    name = profile or settings.DECODING_PROFILE
+    if name not in settings.DECODING_PROFILES:
+        raise ValueError(f"Unknown decoding profile: {name}")
+    return {**settings.DECODING_OPTIONS, **settings.DECODING_PROFILES[name]}
+
+def fallback_stats(segments: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Decode windows and how many needed a temperature-fallback re-decode (final temperature > 0)"""
+    windows: Dict[Any, float] = {}
+    for segment in segments:
+        key = segment.get("seek", segment.get("start"))
+        windows[key] = max(windows.get(key, 0.0), segment.get("temperature") or 0.0)
+    return {"windows": len(windows), "fallbacks": sum(1 for temperature in windows.values() if temperature > 0)}
+
 def transcribe_audio(
-    file_path: str,
+    audio: AudioInput,
     model_size: str = "base",
-    language: str = "en"
+    language: str = "en",
+    profile: Optional[str] = None,
+    **options: Any
 ) -> Dict[str, Any]:
-    """Transcribe audio file using Whisper"""
+    """Transcribe a file path or decoded samples with the configured engine"""
     try:
-        logger.info(f"Loading Whisper model: {model_size}")
-        model = whisper.load_model(model_size)
-        
-        logger.info(f"Starting transcription: {file_path}")
-        result = model.transcribe(
-            file_path,
-            language=language,
-            task="transcribe",
-            temperature=0.0,
-            compression_ratio_threshold=2.4,
-            no_speech_threshold=0.6,
-            condition_on_previous_text=True,
-            fp16=False
-        )
+        engine = get_engine(model_size)
+        decoding_options = {**profile_options(profile), **options}
+
+        logger.info(f"Starting transcription with {engine.name}/{model_size} ({profile or settings.DECODING_PROFILE})")
+        result = engine.transcribe(audio, language=normalize_language(language), **decoding_options)
         
         return {
             "text": result["text"],
-            "language": result.get("language", language),
+            "language": result.get("language") or language,
             "segments": result.get("segments", [])
         }
     except Exception as e:
         logger.error(f"Transcription failed: {str(e)}")
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,133 @@
+# backend/app/utils/windowed.py
+"""Windowed transcription of long inputs in bounded memory.
+
+decode_audio() holds a whole input as float32 (about 230 MB per hour at
+16 kHz), and the engines then build a mel spectrogram over all of it. Long
+inputs are instead read from ffmpeg's pipe in blocks and transcribed one
+window of DECODE_WINDOW_SECONDS at a time. Each window is cut at the
+quietest frame before its nominal end, its segments are shifted onto the
+input's timeline, and the tail of its text prompts the next window. Peak
+memory is about one window, however long the input is.
+"""
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..engines.base import TranscriptionEngine
+from .media import MediaProbeError, probe_media, stream_audio
+from .preview import chunk_boundaries
+from .transcription import normalize_language, profile_options
+
+logger = logging.getLogger(__name__)
+
+_MEL_FRAMES_PER_SECOND = 100  # Whisper's segment "seek" counts mel frames
+_BLOCK_SECONDS = 30  # read from ffmpeg at a time
+
+
+def use_windowed_decode(file_path: str, duration: Optional[float] = None) -> bool:
+    """Whether an input is long enough to transcribe in windows; probes it when the duration isn't known"""
+    if duration is None:
+        try:
+            duration = probe_media(file_path).duration
+        except MediaProbeError:
+            return False  # unreadable; decode_audio() reports why
+    # Streams without a duration in their headers (e.g. MediaRecorder WebM) could be any length
+    return duration is None or duration > settings.DECODE_WINDOW_MIN_SECONDS
+
+
+def split_windows(
+    blocks: Iterable[np.ndarray],
+    window_seconds: float,
+    sample_rate: int = settings.SAMPLE_RATE,
+    search_seconds: float = settings.DECODE_WINDOW_SEARCH_SECONDS
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """(first sample, samples) windows of at most window_seconds from a stream of shorter blocks"""
+    window = int(window_seconds * sample_rate)
+    parts: List[np.ndarray] = []
+    buffered = 0
+    first = 0
+    for block in blocks:
+        parts.append(block)
+        buffered += len(block)
+        if buffered <= window:
+            continue
+        # Join once per window rather than per block; the parts are freed before the window is decoded
+        pending = np.concatenate(parts)
+        parts.clear()
+        cut = chunk_boundaries(pending[:window + 1], window_seconds, sample_rate, search_seconds)[0][1]
+        parts.append(pending[cut:].copy())
+        buffered = len(parts[0])
+        yield first, pending[:cut]
+        first += cut
+        del pending
+    if buffered:
+        yield first, np.concatenate(parts)
+
+
+def transcribe_windowed(
+    engine: TranscriptionEngine,
+    file_path: str,
+    language: Optional[str] = None,
+    profile: Optional[str] = None,
+    window_seconds: float = settings.DECODE_WINDOW_SECONDS,
+    sample_rate: int = settings.SAMPLE_RATE,
+    **options: Any
+) -> Dict[str, Any]:
+    """Transcribe a file window by window, never decoding it whole.
+
+    Returns transcribe_audio()'s shape plus ``duration``, the seconds of
+    audio decoded. Without a language, it is detected on the first window.
+    """
+    decoding_options = {**profile_options(profile), **options}
+    prompt = decoding_options.pop("initial_prompt", None)
+    carry_prompt = decoding_options.get("condition_on_previous_text", True)
+    language = normalize_language(language)
+    segments, texts, samples = [], [], 0
+
+    logger.info(
+        f"Starting windowed transcription with {engine.name}/{engine.model_size} "
+        f"({profile or settings.DECODING_PROFILE}, {window_seconds:.0f}s windows)"
+    )
+    blocks = stream_audio(file_path, min(_BLOCK_SECONDS, window_seconds), sample_rate)
+    try:
+        for first, window in split_windows(blocks, window_seconds, sample_rate):
+            if language is None:
+                language = engine.detect_language(window)
+            result = engine.transcribe(
+                window, language=language, **decoding_options, **({"initial_prompt": prompt} if prompt else {})
+            )
+            language = language or result.get("language")
+
+            offset = first / sample_rate
+            for segment in result.get("segments", []):
+                shifted = {
+                    **segment,
+                    "id": len(segments),
+                    "start": segment["start"] + offset,
+                    "end": segment["end"] + offset,
+                }
+                if "seek" in segment:
+                    shifted["seek"] = segment["seek"] + int(offset * _MEL_FRAMES_PER_SECOND)
+                if segment.get("words"):
+                    shifted["words"] = [
+                        {**word, "start": word["start"] + offset, "end": word["end"] + offset}
+                        for word in segment["words"]
+                    ]
+                segments.append(shifted)
+            texts.append(result["text"])
+            if carry_prompt and result["text"].strip():
+                prompt = result["text"][-settings.DECODE_WINDOW_PROMPT_CHARS:]
+            samples = first + len(window)
+            logger.debug(f"Transcribed window at {offset:.1f}s ({len(window) / sample_rate:.1f}s)")
+            del window  # let it go before the next window is joined
+    finally:
+        blocks.close()  # stops ffmpeg if a window failed
+
+    return {
+        "text": "".join(texts),
+        "language": language,
+        "segments": segments,
+        "duration": samples / sample_rate,
+    }
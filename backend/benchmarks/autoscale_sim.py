@@ -0,0 +1,103 @@
+# backend/benchmarks/autoscale_sim.py
+"""Drive the autoscaler through a synthetic load curve without a broker or database.
+
+Uses fakeredis as the Redis stand-in (``pip install fakeredis``) and a stub
+Celery control that resizes simulated pools, so bounds, hysteresis and the
+memory cap can be checked offline:
+
+    cd backend
+    python -m benchmarks.autoscale_sim --ticks 60 --max 4 --headroom-mb 3000
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+from app.utils.autoscaler import AutoscaleController, WorkerState, report_worker_memory
+
+
+class SimulatedControl:
+    """Stands in for celery_app.control: applies grow/shrink to in-memory pools"""
+
+    def __init__(self, pools: Dict[str, int]):
+        self.pools = pools
+
+    def pool_grow(self, n: int, destination: List[str]):
+        for hostname in destination:
+            self.pools[hostname] += n
+
+    def pool_shrink(self, n: int, destination: List[str]):
+        for hostname in destination:
+            self.pools[hostname] = max(1, self.pools[hostname] - n)
+
+
+def load_curve(tick: int, peak_jobs: int) -> int:
+    """Idle, ramp to a peak, hold, then drain"""
+    if tick < 5:
+        return 0
+    if tick < 15:
+        return (tick - 5) * peak_jobs // 10
+    if tick < 30:
+        return peak_jobs
+    return max(0, peak_jobs - (tick - 30) * peak_jobs // 10)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import fakeredis
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--min", type=int, default=1)
+    parser.add_argument("--max", type=int, default=4)
+    parser.add_argument("--peak-jobs", type=int, default=40)
+    parser.add_argument("--job-seconds", type=float, default=120, help="processing seconds per queued job")
+    parser.add_argument("--target-drain", type=float, default=600)
+    parser.add_argument("--headroom-mb", type=float, default=4096, help="reported per-worker memory headroom")
+    parser.add_argument("--child-mb", type=float, default=900)
+    args = parser.parse_args(argv)
+
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    pools = {f"celery@worker{i}": args.min for i in range(args.workers)}
+    control = SimulatedControl(pools)
+    state = {"jobs": 0}
+
+    controller = AutoscaleController(
+        control=control,
+        redis_client=redis_client,
+        backlog_fn=lambda: {"jobs": state["jobs"], "seconds_p50": state["jobs"] * args.job_seconds},
+        workers_fn=lambda: [WorkerState(hostname, processes) for hostname, processes in pools.items()],
+        min_processes=args.min,
+        max_processes=args.max,
+        target_drain_seconds=args.target_drain,
+        memory_reserve_bytes=256 * 2**20,
+    )
+
+    timeline = []
+    for tick in range(args.ticks):
+        state["jobs"] = load_curve(tick, args.peak_jobs)
+        redis_client.delete("celery")
+        if state["jobs"]:
+            redis_client.rpush("celery", *range(state["jobs"]))
+        for hostname, processes in pools.items():
+            # Headroom shrinks as the pool grows, as a real worker would report
+            report_worker_memory(hostname, int(args.child_mb * 2**20), redis_client=redis_client)
+            redis_client.hset(f"autoscale:worker:{hostname}", "headroom_bytes",
+                              int((args.headroom_mb - processes * args.child_mb) * 2**20))
+        decisions = controller.run_once()
+        timeline.append({
+            "tick": tick,
+            "jobs": state["jobs"],
+            "pools": dict(pools),
+            "actions": [f"{d.hostname}:{d.action}/{d.reason}" for d in decisions if d.action != "hold"],
+        })
+
+    for row in timeline:
+        print(json.dumps(row))
+    peak = max(sum(row["pools"].values()) for row in timeline)
+    print(json.dumps({"peak_processes": peak, "final_processes": sum(pools.values())}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# backend/benchmarks/decoding_profiles.py
+"""RTF, fallback re-decode rate and accuracy per decoding profile.
+
+Transcribes the same files once per profile in settings.DECODING_PROFILES and
+reports, per profile:
+- RTF p50/p95;
+- the share of 30 s windows that needed a temperature-fallback re-decode;
+- word error rate against --references (a JSON {filename: text}), or
+  against the most accurate profile's output when no references are given.
+
+Real recordings give meaningful numbers (synthetic audio makes Whisper
+hallucinate and fall back far more than speech does):
+
+    cd backend
+    python -m benchmarks.decoding_profiles --engine whisper --model base --audio-dir ~/clips \\
+        --references ~/clips/references.json --output profiles.json
+    python -m benchmarks.decoding_profiles --jobs 4   # plumbing check with the fake engine
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .synthetic_audio import build_corpus
+
+AUDIO_SUFFIXES = (".wav", ".mp3", ".m4a", ".ogg", ".opus", ".flac", ".webm")
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance over the reference length"""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def collect_files(args: argparse.Namespace) -> List[Path]:
+    if args.audio_dir:
+        files = sorted(p for p in Path(args.audio_dir).expanduser().iterdir() if p.suffix.lower() in AUDIO_SUFFIXES)
+        return files[:args.jobs] if args.jobs else files
+    corpus = build_corpus(
+        Path(tempfile.mkdtemp(prefix="stt-profiles-")), args.jobs or 4, args.min_seconds, args.max_seconds,
+        ["wav16k"], 0.1, args.seed
+    )
+    return [Path(item["path"]) for item in corpus]
+
+
+def run_profile(profile: str, files: List[Path], audio: Dict[Path, np.ndarray], args: argparse.Namespace) -> Dict:
+    from app.config import settings
+    from app.utils.transcription import fallback_stats, transcribe_audio
+
+    rtfs, windows, fallbacks, texts = [], 0, 0, {}
+    for path in files:
+        samples = audio[path]
+        started = time.perf_counter()
+        result = transcribe_audio(samples, model_size=args.model, language=args.language, profile=profile)
+        elapsed = time.perf_counter() - started
+        rtfs.append(elapsed / max(len(samples) / settings.SAMPLE_RATE, 1e-6))
+        stats = fallback_stats(result["segments"])
+        windows += stats["windows"]
+        fallbacks += stats["fallbacks"]
+        texts[path.name] = result["text"]
+    return {
+        "profile": profile,
+        "files": len(files),
+        "rtf_p50": round(float(np.percentile(rtfs, 50)), 4),
+        "rtf_p95": round(float(np.percentile(rtfs, 95)), 4),
+        "windows": windows,
+        "fallback_windows": fallbacks,
+        "fallback_rate": round(fallbacks / windows, 4) if windows else 0.0,
+        "texts": texts,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", choices=("fake", "whisper", "faster-whisper"), default="fake")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--profiles", nargs="+", default=None, help="default: every configured profile")
+    parser.add_argument("--audio-dir", default=None, help="real recordings; synthetic clips otherwise")
+    parser.add_argument("--references", default=None, help="JSON mapping file name to reference transcript")
+    parser.add_argument("--jobs", type=int, default=0, help="number of files (0 = all in --audio-dir)")
+    parser.add_argument("--min-seconds", type=float, default=20)
+    parser.add_argument("--max-seconds", type=float, default=90)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    os.environ["TRANSCRIPTION_ENGINE"] = args.engine
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='stt-profiles-db-')}/bench.db")
+    from app.config import settings
+    from app.engines import get_engine
+    from app.utils.media import decode_audio
+
+    profiles = args.profiles or list(settings.DECODING_PROFILES)
+    files = collect_files(args)
+    audio = {path: decode_audio(str(path)) for path in files}
+    get_engine(args.model)  # load once, outside the timings
+
+    runs = [run_profile(profile, files, audio, args) for profile in profiles]
+
+    if args.references:
+        with open(args.references) as f:
+            references = json.load(f)
+        reference_source = "references"
+    else:
+        # Relative accuracy: how far each profile drifts from the most thorough one
+        references = runs[-1]["texts"]
+        reference_source = f"profile:{runs[-1]['profile']}"
+    for run in runs:
+        scored = [word_error_rate(references[name], text) for name, text in run["texts"].items() if name in references]
+        run["wer"] = round(float(np.mean(scored)), 4) if scored else None
+
+    print(json.dumps(
+        [{k: v for k, v in run.items() if k != "texts"} for run in runs] + [{"wer_against": reference_source}],
+        indent=2
+    ))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "benchmark": "decoding_profiles",
+                "config": vars(args),
+                "wer_against": reference_source,
+                "profiles": {name: settings.DECODING_PROFILES[name] for name in profiles},
+                "runs": runs,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
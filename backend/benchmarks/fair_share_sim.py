@@ -0,0 +1,161 @@
+# backend/benchmarks/fair_share_sim.py
+"""Latency of small users under a bulk upload: FIFO vs the fair-share scheduler.
+
+Event-driven simulation with no broker or database. A bulk client uploads
+--bulk-jobs long files at t=0 while --small-users each upload a few short
+files over the first hour; --workers processes run jobs at --rtf. FIFO
+dispatches in upload order (today's single Celery queue); "fair" asks
+app.utils.fair_share.DeficitRoundRobin which job gets each free worker.
+Checks the properties the dispatcher relies on and exits non-zero, listing
+the failures, unless all hold:
+- every job finishes under both policies (nobody is starved);
+- fair share's small-user p99 is within --max-small-p99 seconds and below FIFO's;
+- without --owner-cap, fair share keeps workers busy: its makespan is within
+  --max-makespan-ratio of FIFO's (a cap deliberately idles workers);
+- with --owner-cap, no owner ever runs more jobs at once than the cap.
+
+    cd backend
+    python -m benchmarks.fair_share_sim
+    python -m benchmarks.fair_share_sim --bulk-jobs 2000 --owner-cap 2 --output fair.json
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+os.environ.setdefault("DATABASE_URL", "sqlite:////tmp/fair_share_sim.db")  # scheduler is DB-free; app import needs one
+from app.utils.fair_share import DeficitRoundRobin, QueuedJob
+
+
+def build_workload(args: argparse.Namespace) -> List[Dict]:
+    rng = np.random.default_rng(args.seed)
+    jobs = [
+        {"owner": "client:bulk", "arrival": 0.0, "cost": float(rng.uniform(60, args.bulk_max_seconds))}
+        for _ in range(args.bulk_jobs)
+    ]
+    for user in range(args.small_users):
+        for arrival in np.sort(rng.uniform(0, args.small_window, rng.integers(1, 4))):
+            jobs.append({"owner": f"ip:10.0.0.{user}", "arrival": float(arrival), "cost": float(rng.uniform(30, 300))})
+    jobs.sort(key=lambda job: job["arrival"])
+    for index, job in enumerate(jobs):
+        job["id"] = index
+    return jobs
+
+
+def simulate(jobs: List[Dict], policy: str, args: argparse.Namespace) -> Tuple[Dict[int, float], int]:
+    """Completion time per job id, and the most jobs one owner ever ran at once"""
+    scheduler = DeficitRoundRobin(quantum=args.quantum, weights={}, owner_cap=args.owner_cap, owner_caps={})
+    waiting: Dict[str, List[QueuedJob]] = defaultdict(list)
+    fifo: List[QueuedJob] = []
+    running: Dict[str, int] = defaultdict(int)
+    events = [(job["arrival"], 1, job["id"]) for job in jobs]  # (time, kind 0=finish 1=arrive, id)
+    heapq.heapify(events)
+    free, finished, peak = args.workers, {}, 0
+
+    while events:
+        now, kind, job_id = heapq.heappop(events)
+        job = jobs[job_id]
+        if kind == 0:
+            free += 1
+            running[job["owner"]] -= 1
+            finished[job_id] = now
+        else:
+            queued = QueuedJob(job_id, job["owner"], job["cost"])
+            waiting[job["owner"]].append(queued)
+            fifo.append(queued)
+        if free <= 0:
+            continue
+
+        if policy == "fifo":
+            picked = fifo[:free]
+        else:
+            picked = scheduler.select({o: q for o, q in waiting.items() if q}, dict(running), free)
+        for queued in picked:
+            fifo.remove(queued)
+            waiting[queued.owner].remove(queued)
+            running[queued.owner] += 1
+            peak = max(peak, running[queued.owner])
+            free -= 1
+            heapq.heappush(events, (now + queued.cost * args.rtf, 0, queued.id))
+    return finished, peak
+
+
+def summarize(jobs: List[Dict], finished: Dict[int, float]) -> Dict[str, Dict[str, float]]:
+    groups: Dict[str, List[float]] = defaultdict(list)
+    for job in jobs:
+        group = "bulk" if job["owner"] == "client:bulk" else "small"
+        groups[group].append(finished[job["id"]] - job["arrival"])
+    return {
+        group: {
+            "jobs": len(latencies),
+            "p50": round(float(np.percentile(latencies, 50)), 1),
+            "p95": round(float(np.percentile(latencies, 95)), 1),
+            "p99": round(float(np.percentile(latencies, 99)), 1),
+            "max": round(float(np.max(latencies)), 1),
+        }
+        for group, latencies in sorted(groups.items())
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rtf", type=float, default=0.25, help="processing seconds per audio second")
+    parser.add_argument("--bulk-jobs", type=int, default=500)
+    parser.add_argument("--bulk-max-seconds", type=float, default=1800, help="longest bulk file (audio s)")
+    parser.add_argument("--small-users", type=int, default=30)
+    parser.add_argument("--small-window", type=float, default=3600, help="small uploads arrive within (s)")
+    parser.add_argument("--quantum", type=float, default=300)
+    parser.add_argument("--owner-cap", type=int, default=0)
+    parser.add_argument("--max-small-p99", type=float, default=900)
+    parser.add_argument("--max-makespan-ratio", type=float, default=1.05, help="fair vs FIFO total time")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    jobs = build_workload(args)
+    runs = {policy: simulate(jobs, policy, args) for policy in ("fifo", "fair")}
+    failures = [
+        f"{policy}: {len(jobs) - len(done)} of {len(jobs)} jobs never finished"
+        for policy, (done, _) in runs.items() if len(done) != len(jobs)
+    ]
+    if failures:
+        print(json.dumps({"failures": failures}, indent=2))
+        return 1
+
+    results = {policy: summarize(jobs, done) for policy, (done, _) in runs.items()}
+    makespan = {policy: round(max(done.values()), 1) for policy, (done, _) in runs.items()}
+    small_p99 = {policy: results[policy]["small"]["p99"] for policy in results}
+    if small_p99["fair"] > args.max_small_p99:
+        failures.append(f"fair small-user p99 {small_p99['fair']}s exceeds {args.max_small_p99:g}s")
+    if small_p99["fair"] >= small_p99["fifo"]:
+        failures.append(f"fair small-user p99 {small_p99['fair']}s is no better than FIFO's {small_p99['fifo']}s")
+    if not args.owner_cap and makespan["fair"] > makespan["fifo"] * args.max_makespan_ratio:
+        failures.append(
+            f"fair makespan {makespan['fair']}s exceeds FIFO's {makespan['fifo']}s "
+            f"by more than {args.max_makespan_ratio:g}x; workers sat idle"
+        )
+    peak = runs["fair"][1]
+    if args.owner_cap and peak > args.owner_cap:
+        failures.append(f"an owner ran {peak} jobs at once, over --owner-cap {args.owner_cap}")
+
+    report = {
+        "latency_seconds": results,
+        "makespan_seconds": makespan,
+        "peak_jobs_per_owner": peak,
+        "failures": failures,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "fair_share_sim", "config": vars(args), **report}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
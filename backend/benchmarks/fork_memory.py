@@ -0,0 +1,115 @@
+# backend/benchmarks/fork_memory.py
+"""Per-child memory of forked workers, with and without weights preloaded in the parent.
+
+Mimics the Celery prefork pool: a parent optionally preloads the model (as
+PRELOAD_MODELS does), forks N children, and each child transcribes a clip
+and reports RSS/PSS/shared/private from /proc/self/smaps_rollup while all
+children are alive. With preloading, the weights show up as shared and the
+summed PSS grows by activations per child rather than by a model copy:
+
+    cd backend
+    python -m benchmarks.fork_memory --children 2 4 --weights-mb 300
+    python -m benchmarks.fork_memory --engine whisper --model tiny --children 2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def child(model: str, seconds: float, barrier, results) -> None:
+    from app.engines import get_engine
+    from app.utils.metrics import memory_breakdown
+    from .synthetic_audio import speech_like
+
+    engine = get_engine(model)  # cached when the parent preloaded it
+    audio = speech_like(seconds, 16000, np.random.default_rng(os.getpid()))
+    engine.transcribe(audio, language="en")
+    barrier.wait()  # measure while every sibling is alive, so PSS is divided fairly
+    results.put({"pid": os.getpid(), **memory_breakdown()})
+    barrier.wait()
+
+
+def run_mode(model: str, children: int, seconds: float, preload: bool) -> Dict:
+    """One measurement; runs inside a fresh interpreter (see main)"""
+    import gc
+    from app.engines import preload_engines
+    from app.utils.metrics import memory_breakdown
+
+    if preload:
+        preload_engines([model])
+        gc.collect()
+        gc.freeze()
+    parent = memory_breakdown()
+
+    context = get_context("fork")
+    barrier = context.Barrier(children)
+    results = context.Queue()
+    processes = [context.Process(target=child, args=(model, seconds, barrier, results)) for _ in range(children)]
+    for process in processes:
+        process.start()
+    samples = [results.get(timeout=600) for _ in processes]
+    for process in processes:
+        process.join()
+
+    def total(kind: str) -> int:
+        return sum(sample.get(kind, 0) for sample in samples)
+
+    return {
+        "preload": preload,
+        "children": children,
+        "parent": parent,
+        "per_child": samples,
+        "child_pss_total_mib": round(total("pss") / 2**20, 1),
+        "child_rss_total_mib": round(total("rss") / 2**20, 1),
+        "child_private_mean_mib": round(total("private") / len(samples) / 2**20, 1),
+        "child_shared_mean_mib": round(total("shared") / len(samples) / 2**20, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", choices=("fake", "whisper"), default="fake")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--children", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=10, help="audio per child")
+    parser.add_argument("--weights-mb", type=float, default=256, help="fake engine weight size")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--run-mode", choices=("preload", "lazy"), default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_mode:
+        result = run_mode(args.model, args.children[0], args.seconds, args.run_mode == "preload")
+        print(json.dumps(result))
+        return 0
+
+    env = {**os.environ, "TRANSCRIPTION_ENGINE": args.engine, "FAKE_ENGINE_WEIGHTS_MB": str(args.weights_mb)}
+    runs = []
+    for children in args.children:
+        for mode in ("lazy", "preload"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.fork_memory", "--run-mode", mode, "--model", args.model,
+                 "--children", str(children), "--seconds", str(args.seconds)],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout
+            runs.append(json.loads(out.strip().splitlines()[-1]))
+
+    table = [
+        {k: run[k] for k in ("preload", "children", "child_pss_total_mib", "child_private_mean_mib",
+                             "child_shared_mean_mib")}
+        for run in runs
+    ]
+    print(json.dumps(table, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "fork_memory", "config": vars(args), "runs": runs}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
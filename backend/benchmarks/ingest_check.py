@@ -0,0 +1,137 @@
+# backend/benchmarks/ingest_check.py
+"""Ingest of video uploads: what is stored, and what the worker saves.
+
+Builds one video per container (mp4 with AAC, mov with PCM, avi with MP3)
+with --seconds of test pattern over the synthetic speech track. It uploads
+each through the API and, for each, reports:
+- the upload bytes, the stored bytes and the ingest action (copy or
+  transcode);
+- the upload request time;
+- the worker's decode time for the original file and for the stored audio.
+
+It also checks that:
+- every stored object is audio only, with the source's duration;
+- a video without audio is rejected;
+- a non-media file renamed to .mp4 is rejected.
+
+Exits non-zero on any failed check:
+
+    cd backend
+    python -m benchmarks.ingest_check
+    python -m benchmarks.ingest_check --seconds 600 --output ingest.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from .synthetic_audio import build_corpus
+
+# Container, video codec and audio codec arguments per test file
+VIDEOS = {
+    "mp4": ["-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", "-b:a", "128k"],
+    "mov": ["-c:v", "mjpeg", "-c:a", "pcm_s16le"],
+    "avi": ["-c:v", "mpeg4", "-c:a", "libmp3lame", "-b:a", "128k"],
+}
+
+
+def make_video(audio: Path, target: Path, seconds: float, codec_args: List[str]) -> None:
+    subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc=size=640x360:rate=25:duration={seconds}",
+            "-i", str(audio), *codec_args, "-shortest", str(target)
+        ],
+        check=True
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="stt-ingest-"))
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ["UPLOAD_DIR"] = str(workdir / "uploads")
+    os.environ["ADMISSION_CONTROL_ENABLED"] = "false"
+    os.environ["FAIR_SHARE_ENABLED"] = "true"  # jobs stay queued; only ingest is measured
+    os.environ["MAX_FILE_SIZE"] = str(10 ** 10)
+    from fastapi.testclient import TestClient
+    from app.database import SessionLocal, init_db
+    from app.main import app
+    from app.models import Transcription
+    from app.storage import get_storage
+    from app.utils.media import decode_audio, probe_media
+
+    init_db()
+    speech = Path(build_corpus(workdir / "corpus", 1, args.seconds, args.seconds, ["wav44k_stereo"], 0.1, args.seed)[0]["path"])
+    failures, rows = [], {}
+
+    with TestClient(app) as client:
+        for container, codec_args in VIDEOS.items():
+            video = workdir / f"video.{container}"
+            make_video(speech, video, args.seconds, codec_args)
+            started = time.perf_counter()
+            with open(video, "rb") as f:
+                response = client.post("/transcription/upload", files={"file": (video.name, f)})
+            upload_seconds = time.perf_counter() - started
+            if response.status_code != 202:
+                failures.append(f"{container}: upload returned {response.status_code} {response.text}")
+                continue
+            body = response.json()
+
+            db = SessionLocal()
+            try:
+                stored = db.get(Transcription, body["id"])
+                stored_path = str(get_storage().local_path(stored.filename))
+            finally:
+                db.close()
+            info = probe_media(stored_path)
+            if info.has_video:
+                failures.append(f"{container}: stored object still has video")
+            if info.duration is None or abs(info.duration - args.seconds) > 0.2:
+                failures.append(f"{container}: stored duration {info.duration}, expected {args.seconds}")
+
+            decode = {}
+            for name, path in (("original", str(video)), ("stored", stored_path)):
+                started = time.perf_counter()
+                decode_audio(path)
+                decode[name] = round(time.perf_counter() - started, 3)
+            rows[container] = {
+                "upload_bytes": video.stat().st_size,
+                "stored_bytes": os.path.getsize(stored_path),
+                "reduction": round(video.stat().st_size / max(os.path.getsize(stored_path), 1), 1),
+                "audio_codec": body["audio_codec"],
+                "upload_seconds": round(upload_seconds, 3),
+                "decode_seconds": decode,
+            }
+
+        silent = workdir / "silent.mp4"
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-y", "-loglevel", "error", "-f", "lavfi",
+             "-i", "testsrc=size=160x120:duration=2", "-c:v", "libx264", str(silent)],
+            check=True
+        )
+        for name, payload in (("silent.mp4", silent.read_bytes()), ("notes.mp4", b"not a media file" * 64)):
+            response = client.post("/transcription/upload", files={"file": (name, payload)})
+            if response.status_code != 400:
+                failures.append(f"{name}: expected 400, got {response.status_code}")
+
+    report = {"seconds": args.seconds, "containers": rows, "failures": failures}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "ingest_check", "config": vars(args), **report}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+# backend/benchmarks/pipeline.py
+"""End-to-end throughput benchmark: upload -> queue -> worker -> completion.
+
+Runs the real FastAPI app and Celery tasks in-process against SQLite (or any
+DATABASE_URL), with either the deterministic fake engine or real Whisper when
+its weights are already cached locally. Results are written as JSON so runs
+can be compared:
+
+    cd backend
+    python -m benchmarks.pipeline --jobs 40 --concurrency 4 --output bench.json
+    python -m benchmarks.pipeline --engine whisper --model tiny --baseline bench.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .synthetic_audio import FORMATS, build_corpus
+
+COMPARE_KEYS = (
+    "jobs_per_second",
+    "audio_seconds_per_second",
+    "latency_p50",
+    "latency_p95",
+    "rtf_p50",
+    "rtf_p95",
+    "peak_rss_bytes",
+)
+
+
+def configure_environment(workdir: Path, args: argparse.Namespace) -> None:
+    """Point the app at throwaway storage and an in-memory broker (must run before importing app)"""
+    os.environ.setdefault("DATABASE_URL", args.database_url or f"sqlite:///{workdir / 'bench.db'}")
+    os.environ["UPLOAD_DIR"] = str(workdir / "uploads")
+    os.environ["RECORDINGS_DIR"] = str(workdir / "uploads" / "recordings")
+    os.environ["TRANSCRIPTION_ENGINE"] = args.engine
+    os.environ["FAKE_ENGINE_RTF"] = str(args.fake_rtf)
+    os.environ["CELERY_BROKER_URL"] = "memory://"
+    os.environ["CELERY_RESULT_BACKEND"] = "cache+memory://"
+    os.environ["CELERY_WORKER_CONCURRENCY"] = str(args.concurrency)
+    os.environ["ADMISSION_CONTROL_ENABLED"] = "false"
+    os.environ["WORKER_METRICS_PORT"] = "0"
+    os.environ.setdefault("REDIS_URL", args.redis_url)
+    os.environ["MAX_FILE_SIZE"] = str(10 ** 10)
+
+
+def whisper_weights_present(model: str) -> bool:
+    cache = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "whisper"
+    return any(cache.glob(f"{model}*.pt"))
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    return round(float(np.percentile(values, q)), 4) if values else None
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_dispatcher(stop: threading.Event) -> None:
+    """The outbox dispatcher loop, in-process: uploads only stage their task messages"""
+    from app.utils.outbox import OutboxDispatcher
+
+    dispatcher = OutboxDispatcher()
+    while not stop.is_set():
+        if not any(dispatcher.run_once().values()):
+            stop.wait(0.02)
+
+
+def run_job(client, item: Dict[str, Any], model: str, language: str, poll_interval: float, timeout: float) -> Dict:
+    """Upload one file and poll until it reaches a terminal state"""
+    submitted = time.perf_counter()
+    with open(item["path"], "rb") as f:
+        response = client.post(
+            "/transcription/upload",
+            params={"model_size": model, "language": language},
+            files={"file": (Path(item["path"]).name, f)},
+        )
+    uploaded = time.perf_counter()
+    if response.status_code != 202:
+        return {**item, "status": "rejected", "http_status": response.status_code,
+                "upload_seconds": uploaded - submitted}
+
+    transcription_id = response.json()["id"]
+    deadline = submitted + timeout
+    status = "pending"
+    while time.perf_counter() < deadline:
+        status = client.get(f"/transcription/{transcription_id}").json()["status"]
+        if status in ("completed", "failed"):
+            break
+        time.sleep(poll_interval)
+
+    return {
+        **item,
+        "id": transcription_id,
+        "status": status,
+        "upload_seconds": uploaded - submitted,
+        "latency_seconds": time.perf_counter() - submitted,
+    }
+
+
+def summarize(jobs: List[Dict], wall_seconds: float) -> Dict[str, Any]:
+    """Aggregate per-job timings with what the worker recorded in the database"""
+    from app.database import SessionLocal
+    from app.models import Transcription
+    from app.utils.metrics import current_rss_bytes
+
+    db = SessionLocal()
+    try:
+        rows = {
+            row.id: row for row in db.query(
+                Transcription.id, Transcription.audio_duration,
+                Transcription.processing_time, Transcription.stage_timings
+            ).filter(Transcription.id.in_([j["id"] for j in jobs if "id" in j]))
+        }
+    finally:
+        db.close()
+
+    completed = [j for j in jobs if j["status"] == "completed"]
+    latencies = [j["latency_seconds"] for j in completed]
+    rtfs = [
+        rows[j["id"]].processing_time / rows[j["id"]].audio_duration
+        for j in completed if rows[j["id"]].audio_duration
+    ]
+    audio_seconds = sum(rows[j["id"]].audio_duration or 0 for j in completed)
+
+    stages: Dict[str, List[float]] = {}
+    for j in completed:
+        for name, seconds in (rows[j["id"]].stage_timings or {}).items():
+            stages.setdefault(name, []).append(seconds)
+
+    return {
+        "jobs": len(jobs),
+        "completed": len(completed),
+        "failed": sum(1 for j in jobs if j["status"] == "failed"),
+        "rejected": sum(1 for j in jobs if j["status"] == "rejected"),
+        "timed_out": sum(1 for j in jobs if j["status"] in ("pending", "processing")),
+        "wall_seconds": round(wall_seconds, 3),
+        "jobs_per_second": round(len(completed) / wall_seconds, 4) if wall_seconds else None,
+        "audio_seconds_per_second": round(audio_seconds / wall_seconds, 3) if wall_seconds else None,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_max": round(max(latencies), 4) if latencies else None,
+        "upload_p50": percentile([j["upload_seconds"] for j in jobs], 50),
+        "upload_p95": percentile([j["upload_seconds"] for j in jobs], 95),
+        "rtf_p50": percentile(rtfs, 50),
+        "rtf_p95": percentile(rtfs, 95),
+        "stage_seconds_p50": {name: percentile(values, 50) for name, values in sorted(stages.items())},
+        "rss_bytes": current_rss_bytes(),
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+
+
+def compare(current: Dict[str, Any], baseline_path: Path) -> Dict[str, Any]:
+    """Relative change of the headline metrics against an earlier run"""
+    baseline = json.loads(baseline_path.read_text())["summary"]
+    deltas = {}
+    for key in COMPARE_KEYS:
+        old, new = baseline.get(key), current.get(key)
+        if old and new is not None:
+            deltas[key] = {"baseline": old, "current": new, "change": round((new - old) / old, 4)}
+    return deltas
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=2, help="worker threads")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent uploading clients")
+    parser.add_argument("--engine", choices=("fake", "whisper", "faster-whisper"), default="fake")
+    parser.add_argument("--fake-rtf", type=float, default=0.05, help="CPU seconds per audio second")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--min-seconds", type=float, default=5)
+    parser.add_argument("--max-seconds", type=float, default=60)
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument("--silence-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", choices=("worker", "eager"), default="worker",
+                        help="in-process thread worker, or eager (synchronous) task execution")
+    parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    parser.add_argument("--redis-url", default="redis://127.0.0.1:6379/15")
+    parser.add_argument("--poll-interval", type=float, default=0.25)
+    parser.add_argument("--timeout", type=float, default=1800)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None, help="earlier result JSON to compare with")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.engine == "whisper" and not whisper_weights_present(args.model):
+        print(f"Whisper weights for '{args.model}' are not cached locally; use --engine fake", file=sys.stderr)
+        return 2
+
+    workdir = Path(tempfile.mkdtemp(prefix="stt-bench-"))
+    configure_environment(workdir, args)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    if not args.verbose:
+        logging.getLogger("app").setLevel(logging.CRITICAL)
+
+    corpus = build_corpus(
+        workdir / "corpus", args.jobs, args.min_seconds, args.max_seconds,
+        args.formats, args.silence_ratio, args.seed
+    )
+
+    from fastapi.testclient import TestClient
+    from app.celery import celery_app
+    from app.database import init_db
+    from app.main import app
+
+    init_db()
+
+    if args.mode == "eager":
+        celery_app.conf.task_always_eager = True
+        worker_context = None
+    else:
+        from celery.contrib.testing.worker import start_worker
+        # The in-memory transport polls once a second by default, which would dominate latency
+        celery_app.conf.broker_transport_options = {"polling_interval": 0.01}
+        worker_context = start_worker(
+            celery_app, pool="threads", concurrency=args.concurrency,
+            perform_ping_check=False, loglevel="WARNING"
+        )
+
+    stop = threading.Event()
+    dispatcher = threading.Thread(target=run_dispatcher, args=(stop,), daemon=True)
+    with TestClient(app) as client:
+        if worker_context is not None:
+            worker_context.__enter__()
+        dispatcher.start()
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.clients) as pool:
+                jobs = list(pool.map(
+                    lambda item: run_job(client, item, args.model, args.language, args.poll_interval, args.timeout),
+                    corpus
+                ))
+            wall_seconds = time.perf_counter() - started
+        finally:
+            stop.set()
+            dispatcher.join()
+            if worker_context is not None:
+                worker_context.__exit__(None, None, None)
+
+    summary = summarize(jobs, wall_seconds)
+    result = {
+        "benchmark": "pipeline",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_revision": git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "database": os.environ["DATABASE_URL"].split("://")[0],
+        },
+        "config": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        "summary": summary,
+        "jobs": jobs,
+    }
+    if args.baseline:
+        result["comparison"] = compare(summary, args.baseline)
+
+    print(json.dumps({"summary": summary, **({"comparison": result["comparison"]} if args.baseline else {})}, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2, default=str))
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# backend/benchmarks/startup.py
+"""Import time and memory of an API worker, guarding the thin-API boundary.
+
+Each run imports ``app.main`` in a fresh interpreter (as every uvicorn worker
+does) and reports wall time, RSS/PSS and which heavy modules got loaded.
+Exits non-zero when the median import exceeds --max-seconds, RSS exceeds
+--max-rss-mb, or any worker-only module (torch, whisper, the task modules)
+was imported:
+
+    cd backend
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --max-seconds 1.0 --max-rss-mb 150 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Only workers may load these; any of them in an API process is a regression
+FORBIDDEN_MODULES = (
+    "torch", "whisper", "faster_whisper", "ctranslate2",
+    "app.celery.tasks", "app.celery.preload", "app.celery.monitoring",
+)
+# Reported for context, not failed on
+TRACKED_MODULES = ("numpy", "app.engines", "app.utils.media", "celery")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+from app.utils.metrics import memory_breakdown
+print(json.dumps({
+    "import_seconds": elapsed,
+    "memory": memory_breakdown(),
+    "loaded": [m for m in %r if m in sys.modules],
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def probe(env: Dict[str, str]) -> Dict:
+    code = _PROBE % (FORBIDDEN_MODULES + TRACKED_MODULES,)
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", code],
+        cwd=Path(__file__).resolve().parent.parent, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=1.0, help="median import time budget")
+    parser.add_argument("--max-rss-mb", type=float, default=200, help="RSS budget per API worker")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="stt-startup-"))
+    env = {**os.environ, "DATABASE_URL": os.environ.get("DATABASE_URL", f"sqlite:///{workdir / 'startup.db'}")}
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)  # single-process metrics, no shared directory needed
+    probe(env)  # warm the bytecode and filesystem caches
+    runs = [probe(env) for _ in range(args.runs)]
+
+    seconds = [run["import_seconds"] for run in runs]
+    rss_mb = max(run["memory"].get("rss", 0) for run in runs) / 2**20
+    loaded = sorted({module for run in runs for module in run["loaded"]})
+    forbidden = [module for module in loaded if module in FORBIDDEN_MODULES]
+    summary = {
+        "import_seconds_median": round(statistics.median(seconds), 3),
+        "import_seconds_max": round(max(seconds), 3),
+        "rss_mib": round(rss_mb, 1),
+        "pss_mib": round(statistics.median(run["memory"].get("pss", 0) for run in runs) / 2**20, 1),
+        "modules": runs[-1]["modules"],
+        "loaded": loaded,
+        "forbidden_loaded": forbidden,
+    }
+    failures = []
+    if summary["import_seconds_median"] > args.max_seconds:
+        failures.append(f"median import {summary['import_seconds_median']}s > {args.max_seconds}s")
+    if rss_mb > args.max_rss_mb:
+        failures.append(f"RSS {rss_mb:.0f} MiB > {args.max_rss_mb:.0f} MiB")
+    if forbidden:
+        failures.append(f"worker-only modules imported: {', '.join(forbidden)}")
+    summary["failures"] = failures
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "startup", "config": vars(args), "summary": summary, "runs": runs}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+# backend/benchmarks/storage_check.py
+"""Round-trip check and throughput of the configured storage backend.
+
+Streams a random object of --size-mb through put_stream (a multipart upload
+on S3), then verifies size, --ranges random ranged reads against the source
+bytes, two local_path() fetches (the second should be a worker-cache hit on
+remote backends), put_file and delete. Reports MB/s per operation and exits
+non-zero on any mismatch. Runs against a temp directory by default, or
+against MinIO:
+
+    cd backend
+    python -m benchmarks.storage_check
+    docker compose --profile s3 up -d minio
+    STORAGE_BACKEND=s3 S3_ENDPOINT_URL=http://localhost:9000 \\
+        S3_ACCESS_KEY_ID=minioadmin S3_SECRET_ACCESS_KEY=minioadmin \\
+        python -m benchmarks.storage_check --size-mb 64 --output storage.json
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def timed(results: Dict, name: str, size: int, func, *args):
+    started = time.perf_counter()
+    value = func(*args)
+    elapsed = time.perf_counter() - started
+    results[name] = {"seconds": round(elapsed, 4), "mb_per_s": round(size / 1e6 / max(elapsed, 1e-9), 1)}
+    return value
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=32)
+    parser.add_argument("--ranges", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="stt-storage-"))
+    os.environ.setdefault("UPLOAD_DIR", str(workdir / "uploads"))
+    os.environ.setdefault("STORAGE_CACHE_DIR", str(workdir / "cache"))
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    from app.storage import get_storage, new_object_key
+
+    storage = get_storage()
+    storage.prepare()
+    rng = np.random.default_rng(args.seed)
+    size = int(args.size_mb * 1024 * 1024)
+    payload = rng.integers(0, 256, size, dtype=np.uint8).tobytes()
+    key = new_object_key("check.wav")
+    failures, results = [], {}
+
+    written = timed(results, "put_stream", size, storage.put_stream, key, io.BytesIO(payload), "audio/wav")
+    if written != size or storage.size(key) != size:
+        failures.append(f"size after put_stream: wrote {written}, stored {storage.size(key)}, expected {size}")
+
+    started = time.perf_counter()
+    for _ in range(args.ranges):
+        start = int(rng.integers(0, size))
+        end = min(size - 1, start + int(rng.integers(0, 256 * 1024)))
+        data = b"".join(storage.read_range(key, start, end))
+        if data != payload[start:end + 1]:
+            failures.append(f"ranged read {start}-{end} returned {len(data)} mismatching bytes")
+    results["read_range"] = {"count": args.ranges, "seconds": round(time.perf_counter() - started, 4)}
+    if b"".join(storage.read_range(key, size - 10)) != payload[-10:]:
+        failures.append("open-ended ranged read mismatch")
+
+    first = timed(results, "local_path_cold", size, storage.local_path, key)
+    second = timed(results, "local_path_warm", size, storage.local_path, key)
+    if first.read_bytes() != payload or first != second:
+        failures.append("local_path content or cache path mismatch")
+
+    copy = workdir / "copy.bin"
+    copy.write_bytes(payload)
+    copy_key = new_object_key("copy.opus")
+    timed(results, "put_file", size, storage.put_file, copy_key, copy)
+    if storage.size(copy_key) != size or copy.exists():
+        failures.append("put_file did not store and consume the local file")
+
+    for name in (key, copy_key):
+        if storage.delete(name) != size or storage.exists(name):
+            failures.append(f"delete of {name} failed")
+    if storage.delete(key) != 0:
+        failures.append("deleting a missing object should free nothing")
+    try:
+        storage.local_path(key)
+        failures.append("local_path of a deleted object should raise FileNotFoundError")
+    except FileNotFoundError:
+        pass
+
+    report = {"backend": storage.name, "size_bytes": size, "operations": results, "failures": failures}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "storage_check", "config": vars(args), **report}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
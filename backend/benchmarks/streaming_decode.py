@@ -0,0 +1,139 @@
+# backend/benchmarks/streaming_decode.py
+"""Peak worker memory against input length, whole-file decode vs windowed decode.
+
+Encodes --minutes of synthetic speech (a tone in 5 s bursts with 2 s pauses)
+to Opus for each length. Each file is transcribed with the fake engine
+(FAKE_ENGINE_RTF=0) in a fresh interpreter, once per mode:
+- whole: decode_audio() and one engine.transcribe() call, as short inputs use;
+- windowed: transcribe_windowed(), as inputs over DECODE_WINDOW_MIN_SECONDS use.
+
+Reports each run's peak RSS (ru_maxrss) and wall time. Exits non-zero if the
+windowed peak grows by more than --tolerance-mb between the lengths of at
+least two windows, or the windowed pass reads a different duration:
+
+    cd backend
+    python -m benchmarks.streaming_decode
+    python -m benchmarks.streaming_decode --minutes 20 60 180 --output streaming.json
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def make_audio(target: Path, seconds: float) -> None:
+    subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"aevalsrc=0.3*sin(2*PI*220*t)*lt(mod(t\\,7)\\,5):s=16000:d={seconds}",
+            "-c:a", "libopus", "-b:a", "24k", str(target)
+        ],
+        check=True
+    )
+
+
+def run_mode(mode: str, path: str) -> Dict:
+    """One measurement; runs inside a fresh interpreter (see main)"""
+    from app.config import settings
+    from app.engines import get_engine
+    from app.utils.media import decode_audio
+    from app.utils.windowed import transcribe_windowed
+
+    engine = get_engine("base")
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    if mode == "whole":
+        audio = decode_audio(path)
+        result = engine.transcribe(audio, language="en")
+        duration = len(audio) / settings.SAMPLE_RATE
+    else:
+        result = transcribe_windowed(engine, path, language="en")
+        duration = result["duration"]
+    return {
+        "mode": mode,
+        "seconds": round(time.perf_counter() - started, 2),
+        "audio_seconds": round(duration, 2),
+        "segments": len(result["segments"]),
+        # ru_maxrss is in KiB on Linux
+        "baseline_rss_mib": round(baseline / 1024, 1),
+        "peak_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[20, 40, 80])
+    parser.add_argument("--window-seconds", type=float, default=None, help="DECODE_WINDOW_SECONDS override")
+    parser.add_argument("--tolerance-mb", type=float, default=32)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--run-mode", choices=("whole", "windowed"), default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--path", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_mode:
+        print(json.dumps(run_mode(args.run_mode, args.path)))
+        return 0
+
+    from app.config import settings
+
+    workdir = Path(tempfile.mkdtemp(prefix="stt-stream-"))
+    env = {**os.environ, "TRANSCRIPTION_ENGINE": "fake", "FAKE_ENGINE_RTF": "0"}
+    if args.window_seconds:
+        env["DECODE_WINDOW_SECONDS"] = str(args.window_seconds)
+
+    runs, failures = [], []
+    for minutes in sorted(args.minutes):
+        path = workdir / f"{minutes:g}min.opus"
+        make_audio(path, minutes * 60)
+        row = {"minutes": minutes, "file_bytes": path.stat().st_size}
+        for mode in ("whole", "windowed"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.streaming_decode", "--run-mode", mode, "--path", str(path)],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout
+            row[mode] = json.loads(out.strip().splitlines()[-1])
+        if abs(row["windowed"]["audio_seconds"] - row["whole"]["audio_seconds"]) > 0.1:
+            failures.append(
+                f"{minutes:g} min: windowed read {row['windowed']['audio_seconds']}s, "
+                f"whole read {row['whole']['audio_seconds']}s"
+            )
+        runs.append(row)
+        path.unlink()
+
+    # Inputs shorter than two windows haven't reached the steady state yet
+    window_seconds = args.window_seconds or settings.DECODE_WINDOW_SECONDS
+    steady = [row for row in runs if row["minutes"] * 60 >= 2 * window_seconds]
+    growth = steady[-1]["windowed"]["peak_rss_mib"] - steady[0]["windowed"]["peak_rss_mib"] if steady else 0.0
+    if len(steady) < 2:
+        failures.append(f"need two lengths of at least {2 * window_seconds / 60:g} min to compare")
+    elif growth > args.tolerance_mb:
+        failures.append(
+            f"windowed peak RSS grew {growth:.1f} MiB from {steady[0]['minutes']:g} "
+            f"to {steady[-1]['minutes']:g} min (tolerance {args.tolerance_mb:g})"
+        )
+
+    report = {
+        "peak_rss_mib": [
+            {"minutes": row["minutes"], "whole": row["whole"]["peak_rss_mib"],
+             "windowed": row["windowed"]["peak_rss_mib"]}
+            for row in runs
+        ],
+        "windowed_growth_mib": round(growth, 1),
+        "runs": runs,
+        "failures": failures,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "streaming_decode", "config": vars(args), **report}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
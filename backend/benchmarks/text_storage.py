@@ -0,0 +1,150 @@
+# backend/benchmarks/text_storage.py
+"""Transcript storage size and status-poll payload, before and after compression.
+
+Builds a synthetic transcript of --hours of speech (about 150 words a minute,
+Zipf-distributed vocabulary) and reports:
+- for each codec: the compression ratio, compress and decompress time;
+- the status poll payload, by default and with include_text=true;
+- the bytes /{id}/text sends, encoded and as plain text.
+
+Exits non-zero if a default status poll grows with the transcript length or
+the stored text is not smaller than the raw text:
+
+    cd backend
+    python -m benchmarks.text_storage
+    python -m benchmarks.text_storage --hours 4 --output text.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+WORDS_PER_MINUTE = 150
+
+
+def synthetic_transcript(hours: float, seed: int) -> str:
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("etaoinshrdlucmfwypvbgkjqxz"))
+    vocabulary = [
+        "".join(rng.choice(letters, size=int(rng.integers(2, 9))))
+        for _ in range(5000)
+    ]
+    ranks = np.minimum(rng.zipf(1.3, size=int(hours * 60 * WORDS_PER_MINUTE)), len(vocabulary)) - 1
+    words = [vocabulary[rank] for rank in ranks]
+    # Sentences of 8-20 words, as Whisper segments read
+    sentences, start = [], 0
+    while start < len(words):
+        end = start + int(rng.integers(8, 21))
+        sentences.append(" ".join(words[start:end]).capitalize() + ".")
+        start = end
+    return " ".join(sentences)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="stt-text-"))
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("ADMISSION_CONTROL_ENABLED", "false")
+    from fastapi.testclient import TestClient
+    from app.config import settings
+    from app.database import SessionLocal, init_db
+    from app.main import app
+    from app.models import Transcription
+    from app.utils import transcript_text
+    from app.utils.transcript_text import CONTENT_ENCODINGS, save_text, text_summary
+
+    text = synthetic_transcript(args.hours, args.seed)
+    raw_size = len(text.encode("utf-8"))
+    failures = []
+
+    codecs = {}
+    configured = settings.TEXT_COMPRESSION
+    for codec in ("zstd", "zlib"):
+        settings.TEXT_COMPRESSION = codec
+        if codec == "zstd" and transcript_text._zstd() is None:
+            codecs[codec] = "zstandard not installed"
+            continue
+        started = time.perf_counter()
+        name, data = transcript_text.compress_text(text)
+        compress_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        restored = transcript_text.decompress_text(name, data)
+        decompress_seconds = time.perf_counter() - started
+        if restored != text:
+            failures.append(f"{codec} round trip changed the text")
+        if len(data) >= raw_size:
+            failures.append(f"{codec}: {len(data)} stored bytes for {raw_size} bytes of text")
+        codecs[codec] = {
+            "bytes": len(data),
+            "ratio": round(raw_size / len(data), 2),
+            "compress_ms": round(compress_seconds * 1000, 2),
+            "decompress_ms": round(decompress_seconds * 1000, 2),
+        }
+    settings.TEXT_COMPRESSION = configured
+
+    init_db()
+    db = SessionLocal()
+    try:
+        transcription = Transcription(
+            filename="bench.wav", original_filename="bench.wav",
+            status="completed", quality="final", **text_summary(text)
+        )
+        db.add(transcription)
+        db.flush()
+        stored = save_text(db, transcription.id, text)
+        db.commit()
+        transcription_id, codec = transcription.id, stored.codec
+    finally:
+        db.close()
+
+    with TestClient(app) as client:
+        poll = client.get(f"/transcription/{transcription_id}")
+        poll_with_text = client.get(f"/transcription/{transcription_id}", params={"include_text": True})
+        encoded = client.get(
+            f"/transcription/{transcription_id}/text",
+            headers={"Accept-Encoding": CONTENT_ENCODINGS[codec]}
+        )
+        plain = client.get(f"/transcription/{transcription_id}/text", headers={"Accept-Encoding": "identity"})
+
+    # The preview is capped at TEXT_PREVIEW_CHARS; allow for JSON escaping and the other fields
+    poll_budget = 4 * settings.TEXT_PREVIEW_CHARS + 2048
+    if len(poll.content) > poll_budget:
+        failures.append(f"status poll is {len(poll.content)} bytes, budget {poll_budget}")
+    if encoded.text != text or plain.text != text:
+        failures.append("/text did not return the stored transcript")
+
+    report = {
+        "hours": args.hours,
+        "text_bytes": raw_size,
+        "text_chars": len(text),
+        "codecs": codecs,
+        "stored_codec": codec,
+        "status_poll_bytes": len(poll.content),
+        "status_poll_with_text_bytes": len(poll_with_text.content),
+        "text_endpoint": {
+            "content_encoding": encoded.headers.get("content-encoding"),
+            "encoded_bytes": int(encoded.headers.get("content-length", 0)),
+            "plain_bytes": len(plain.content),
+        },
+        "failures": failures,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "text_storage", "config": vars(args), **report}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
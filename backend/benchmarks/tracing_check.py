@@ -0,0 +1,127 @@
+# backend/benchmarks/tracing_check.py
+"""Check that every job yields one connected trace, from upload to result.
+
+Runs the pipeline benchmark (fake engine, in-process worker) with tracing on,
+sample rate 1 and the file exporter. It then groups the exported spans by
+trace id. Each upload's trace must:
+- contain the REQUIRED_SPANS;
+- form a single tree, with every parent present in the trace.
+
+It reports each span name's mean and p95 duration, the slice of a job a
+trace is meant to explain, and exits non-zero on any broken trace:
+
+    cd backend
+    python -m benchmarks.tracing_check
+    python -m benchmarks.tracing_check --jobs 20 --output tracing.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import pipeline
+from .pipeline import percentile
+
+UPLOAD_SPAN = "POST /transcription/upload"
+REQUIRED_SPANS = (
+    UPLOAD_SPAN, "db.commit", "storage.write", "enqueue", "outbox.publish",
+    "transcribe", "queue_wait", "fetch", "decode", "inference", "db_write",
+)
+
+
+def load_spans(path: Path) -> Dict[str, List[Dict]]:
+    traces: Dict[str, List[Dict]] = defaultdict(list)
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces[span["context"]["trace_id"]].append(span)
+    return traces
+
+
+def check_trace(spans: List[Dict]) -> List[str]:
+    problems = []
+    names = {span["name"] for span in spans}
+    missing = [name for name in REQUIRED_SPANS if name not in names]
+    if missing:
+        problems.append(f"missing spans {missing}")
+    ids = {span["context"]["span_id"] for span in spans}
+    roots = [span for span in spans if not span.get("parent_id")]
+    orphans = [span["name"] for span in spans if span.get("parent_id") and span["parent_id"] not in ids]
+    if len(roots) != 1:
+        problems.append(f"{len(roots)} root spans")
+    if orphans:
+        problems.append(f"spans with a parent outside the trace: {orphans}")
+    return problems
+
+
+def seconds(span: Dict) -> float:
+    start = datetime.fromisoformat(span["start_time"].replace("Z", "+00:00"))
+    end = datetime.fromisoformat(span["end_time"].replace("Z", "+00:00"))
+    return (end - start).total_seconds()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=6)
+    parser.add_argument("--max-seconds", type=float, default=15)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="stt-tracing-"))
+    trace_file = workdir / "traces.jsonl"
+    os.environ["TRACING_ENABLED"] = "true"
+    os.environ["TRACING_SAMPLE_RATE"] = "1"
+    os.environ["TRACING_EXPORTER"] = "file"
+    os.environ["TRACING_FILE"] = str(trace_file)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+
+    code = pipeline.main([
+        "--engine", "fake", "--jobs", str(args.jobs), "--min-seconds", "5",
+        "--max-seconds", str(args.max_seconds), "--poll-interval", "0.1",
+    ])
+    # Imported only now: app.config must see the environment pipeline.main sets up
+    from app.core import tracing
+    if not tracing.enabled():
+        print("Tracing did not start; is opentelemetry-sdk installed?", file=sys.stderr)
+        return 2
+    tracing.shutdown_tracing()
+
+    traces = load_spans(trace_file)
+    uploads = {
+        trace: spans for trace, spans in traces.items()
+        if any(span["name"] == UPLOAD_SPAN for span in spans)
+    }
+    failures = [] if code == 0 else [f"pipeline benchmark exited {code}"]
+    if len(uploads) != args.jobs:
+        failures.append(f"{len(uploads)} upload traces for {args.jobs} jobs")
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for trace, spans in uploads.items():
+        failures.extend(f"trace {trace}: {problem}" for problem in check_trace(spans))
+        for span in spans:
+            durations[span["name"]].append(seconds(span))
+
+    report = {
+        "traces": len(uploads),
+        "spans_per_trace": round(sum(len(spans) for spans in uploads.values()) / max(len(uploads), 1), 1),
+        "span_seconds": {
+            name: {"count": len(values), "mean": round(sum(values) / len(values), 4),
+                   "p95": percentile(values, 95)}
+            for name, values in sorted(durations.items())
+        },
+        "failures": failures,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "tracing_check", "config": vars(args), **report}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
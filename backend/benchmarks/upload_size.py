@@ -0,0 +1,92 @@
+# backend/benchmarks/upload_size.py
+"""Upload bytes and time with and without browser-side preprocessing.
+
+The browser pipeline (frontend/src/services/audioPreprocess.ts) resamples
+to 16 kHz mono and encodes 24 kbps Ogg Opus, or 16-bit WAV where WebCodecs
+is missing. This reproduces both outputs with ffmpeg for each source format
+and reports, per format:
+- bytes per audio second;
+- the size reduction;
+- upload seconds at --uplink-mbps;
+- the longest recording that fits under MAX_FILE_SIZE.
+
+It also checks that the byte rates in settings.CLIENT_PREPROCESSING, which
+the API uses to estimate duration, stay within --max-estimate-error:
+
+    cd backend
+    python -m benchmarks.upload_size
+    python -m benchmarks.upload_size --seconds 600 --uplink-mbps 5 --output upload.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .synthetic_audio import FORMATS, build_corpus
+
+# Client-side outputs, as ffmpeg arguments
+CLIENT_ENCODINGS = {
+    "wav16k": ("wav", ["-ar", "16000", "-ac", "1", "-c:a", "pcm_s16le"]),
+    "opus16k": ("ogg", ["-ar", "16000", "-ac", "1", "-c:a", "libopus", "-b:a", "24k", "-frame_duration", "20"]),
+}
+
+
+def encode(source: Path, target: Path, arguments: List[str]) -> int:
+    subprocess.run(
+        ["ffmpeg", "-nostdin", "-y", "-loglevel", "error", "-i", str(source), "-vn", *arguments, str(target)],
+        check=True
+    )
+    return target.stat().st_size
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=120)
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS))
+    parser.add_argument("--uplink-mbps", type=float, default=10)
+    parser.add_argument("--max-estimate-error", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="stt-upload-size-"))
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    from app.config import settings
+
+    rows: Dict[str, Dict] = {}
+    failures = []
+    for fmt in args.formats:
+        source = Path(build_corpus(workdir / fmt, 1, args.seconds, args.seconds, [fmt], 0.1, args.seed)[0]["path"])
+        variants = {"original": source.stat().st_size}
+        for name, (extension, arguments) in CLIENT_ENCODINGS.items():
+            variants[name] = encode(source, workdir / f"{fmt}.{name}.{extension}", arguments)
+
+        rows[fmt] = {}
+        for name, size in variants.items():
+            rate = size / args.seconds
+            rows[fmt][name] = {
+                "bytes_per_second": round(rate),
+                "reduction": round(variants["original"] / size, 1),
+                "upload_seconds": round(size * 8 / (args.uplink_mbps * 1e6), 2),
+                "max_minutes_under_limit": round(settings.MAX_FILE_SIZE / rate / 60, 1),
+            }
+            if name in settings.CLIENT_PREPROCESSING:
+                error = abs(settings.CLIENT_PREPROCESSING[name] - rate) / rate
+                rows[fmt][name]["duration_estimate_error"] = round(error, 3)
+                if error > args.max_estimate_error:
+                    failures.append(f"{fmt}/{name}: configured {settings.CLIENT_PREPROCESSING[name]} B/s, measured {rate:.0f}")
+
+    report = {"audio_seconds": args.seconds, "uplink_mbps": args.uplink_mbps, "formats": rows, "failures": failures}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "upload_size", "config": vars(args), **report}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,9 +11,22 @@ import {
   Icon,
   Container,
   Heading,
+  FormControl,
+  FormLabel,
+  FormHelperText,
+  Switch,
 } from '@chakra-ui/react';
 import { FiUploadCloud } from 'react-icons/fi';
 import axios from 'axios';
+import { transcriptionApi } from '../services/api';
+import {
+  isPreprocessingSupported,
+  preprocessAudio,
+  PreprocessFormat,
+  PreprocessStage,
+} from '../services/audioPreprocess';
+
+const formatMegabytes = (bytes: number) => `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
 
 const TranscriptionUpload: React.FC = () => {
   const [selectedFile, setSelectedFile] = useState<File | null>(null);
@@ -22,6 +35,8 @@ const TranscriptionUpload: React.FC = () => {
   const [isProcessing, setIsProcessing] = useState(false);
   const [language, setLanguage] = useState('en');
   const [model, setModel] = useState('base');
+  const [compressBeforeUpload, setCompressBeforeUpload] = useState(false);
+  const [preparing, setPreparing] = useState<{ stage: PreprocessStage; progress: number } | null>(null);
   const toast = useToast();
 
   const handleFileSelect = (event: React.ChangeEvent<HTMLInputElement>) => {
@@ -39,7 +54,8 @@ const TranscriptionUpload: React.FC = () => {
       );
       
       if (response.data.status === 'completed') {
-        setTranscriptionText(response.data.text);
+        const text = await transcriptionApi.getText(transcriptionId);
+        setTranscriptionText(text.data);
         setIsProcessing(false);
         toast({
           title: 'Transcription completed',
@@ -74,26 +90,51 @@ const TranscriptionUpload: React.FC = () => {
 
     setIsProcessing(true);
     setUploadProgress(0);
-    const formData = new FormData();
-    formData.append('file', selectedFile);
-    formData.append('language', language);
-    formData.append('model_size', model);
 
-    try {
-      const response = await axios.post(
-        `${process.env.REACT_APP_API_URL}/transcription/upload`,
-        formData,
-        {
-          onUploadProgress: (progressEvent: any) => {
-            if (progressEvent.total) {
-              const progress = Math.round(
-                (progressEvent.loaded * 100) / progressEvent.total
-              );
-              setUploadProgress(progress);
-            }
-          },
+    let fileToUpload: File = selectedFile;
+    let preprocessing: PreprocessFormat | undefined;
+    if (compressBeforeUpload) {
+      try {
+        setPreparing({ stage: 'decoding', progress: 0 });
+        const result = await preprocessAudio(selectedFile, (stage, value) =>
+          setPreparing({ stage, progress: Math.round(value * 100) })
+        );
+        if (result) {
+          fileToUpload = result.file;
+          preprocessing = result.format;
+          toast({
+            title: 'Audio compressed',
+            description: `${formatMegabytes(result.originalBytes)} → ${formatMegabytes(result.bytes)}`,
+            status: 'info',
+            duration: 3000,
+          });
         }
-      );
+      } catch (error) {
+        // Formats the browser can't decode still upload as-is
+        console.error('Error preprocessing audio:', error);
+        toast({
+          title: 'Could not compress in the browser',
+          description: 'Uploading the original file instead',
+          status: 'warning',
+          duration: 3000,
+        });
+      } finally {
+        setPreparing(null);
+      }
+    }
+
+    try {
+      const response = await transcriptionApi.upload(fileToUpload, language, model, {
+        preprocessing,
+        onUploadProgress: (progressEvent) => {
+          if (progressEvent.total) {
+            const progress = Math.round(
+              (progressEvent.loaded * 100) / progressEvent.total
+            );
+            setUploadProgress(progress);
+          }
+        },
+      });
 
       toast({
         title: 'File uploaded successfully',
@@ -182,6 +223,25 @@ const TranscriptionUpload: React.FC = () => {
           <option value="large">Large (Most Accurate)</option>
         </Select>
 
+        {/* Client-side Preprocessing */}
+        <FormControl display="flex" flexDirection="column" isDisabled={isProcessing || !isPreprocessingSupported()}>
+          <Box display="flex" alignItems="center">
+            <Switch
+              id="compress-before-upload"
+              isChecked={compressBeforeUpload}
+              onChange={(e) => setCompressBeforeUpload(e.target.checked)}
+              mr={3}
+            />
+            <FormLabel htmlFor="compress-before-upload" mb={0}>
+              Compress audio before uploading
+            </FormLabel>
+          </Box>
+          <FormHelperText>
+            Converts to 16 kHz mono speech audio in your browser, usually a fraction of the
+            original size. Large recordings and videos upload much faster.
+          </FormHelperText>
+        </FormControl>
+
         {/* Upload Button */}
         <Button
           colorScheme="blue"
@@ -198,14 +258,16 @@ const TranscriptionUpload: React.FC = () => {
         {(uploadProgress > 0 || isProcessing) && (
           <Box>
             <Progress
-              value={uploadProgress}
+              value={preparing ? preparing.progress : uploadProgress}
               size="md"
               colorScheme="blue"
               hasStripe
               isAnimated
             />
             <Text mt={2} textAlign="center">
-              {uploadProgress === 100 && isProcessing
+              {preparing
+                ? `${preparing.stage === 'decoding' ? 'Decoding' : 'Compressing'} audio: ${preparing.progress}%`
+                : uploadProgress === 100 && isProcessing
                 ? 'Transcribing...'
                 : `Uploading: ${uploadProgress}%`}
             </Text>
@@ -1,5 +1,7 @@
 // frontend/src/services/api.ts
-import axios from 'axios';
+import axios, { AxiosProgressEvent } from 'axios';
+import { TranscriptionResponse, UploadResponse } from '../types';
+import { PreprocessFormat } from './audioPreprocess';
 
 const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
 
@@ -7,22 +9,38 @@ const api = axios.create({
     baseURL: API_URL,
 });
 
+export interface UploadOptions {
+    // Set when the file was produced by services/audioPreprocess
+    preprocessing?: PreprocessFormat;
+    onUploadProgress?: (progressEvent: AxiosProgressEvent) => void;
+}
+
 export const transcriptionApi = {
-    upload: async (file: File, language: string, model: string) => {
+    upload: async (file: File, language: string, model: string, options: UploadOptions = {}) => {
         const formData = new FormData();
         formData.append('file', file);
-        formData.append('language', language);
-        formData.append('model_size', model);
         
-        return api.post('/transcription/upload', formData, {
+        // The upload endpoint reads these as query parameters, not form fields
+        return api.post<UploadResponse>('/transcription/upload', formData, {
+            params: {
+                language,
+                model_size: model,
+                preprocessing: options.preprocessing,
+            },
             headers: {
                 'Content-Type': 'multipart/form-data',
             },
+            onUploadProgress: options.onUploadProgress,
         });
     },
 
     getStatus: async (id: number) => {
-        return api.get(`/transcription/${id}`);
+        return api.get<TranscriptionResponse>(`/transcription/${id}`);
+    },
+
+    // Full transcript; the browser negotiates the compressed encoding and inflates it
+    getText: async (id: number) => {
+        return api.get<string>(`/transcription/${id}/text`, { responseType: 'text' });
     },
 };
 
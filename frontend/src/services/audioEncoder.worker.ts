@@ -0,0 +1,258 @@
+// frontend/src/services/audioEncoder.worker.ts
+// Encodes 16 kHz mono PCM off the main thread: Ogg Opus through WebCodecs
+// when the browser has it, 16-bit WAV otherwise.
+/* eslint-disable no-restricted-globals */
+import type { EncodeMessage, EncodeRequest, PreprocessFormat } from './audioPreprocess';
+
+const ctx: any = self;
+
+const post = (message: EncodeMessage, transfer: Transferable[] = []) => ctx.postMessage(message, transfer);
+
+// ---- WAV ----
+
+const encodeWav = (samples: Float32Array, sampleRate: number): ArrayBuffer => {
+  const buffer = new ArrayBuffer(44 + samples.length * 2);
+  const view = new DataView(buffer);
+  const writeString = (offset: number, value: string) => {
+    for (let i = 0; i < value.length; i++) {
+      view.setUint8(offset + i, value.charCodeAt(i));
+    }
+  };
+
+  writeString(0, 'RIFF');
+  view.setUint32(4, 36 + samples.length * 2, true);
+  writeString(8, 'WAVE');
+  writeString(12, 'fmt ');
+  view.setUint32(16, 16, true); // fmt chunk size
+  view.setUint16(20, 1, true); // PCM
+  view.setUint16(22, 1, true); // mono
+  view.setUint32(24, sampleRate, true);
+  view.setUint32(28, sampleRate * 2, true); // byte rate
+  view.setUint16(32, 2, true); // block align
+  view.setUint16(34, 16, true); // bits per sample
+  writeString(36, 'data');
+  view.setUint32(40, samples.length * 2, true);
+
+  const step = Math.max(1, Math.floor(samples.length / 20));
+  for (let i = 0; i < samples.length; i++) {
+    const sample = Math.max(-1, Math.min(1, samples[i]));
+    view.setInt16(44 + i * 2, sample < 0 ? sample * 0x8000 : sample * 0x7fff, true);
+    if (i % step === 0) {
+      post({ type: 'progress', value: i / samples.length });
+    }
+  }
+  return buffer;
+};
+
+// ---- Ogg Opus (RFC 7845) ----
+
+const OPUS_GRANULE_RATE = 48000; // Ogg Opus granule positions always count 48 kHz samples
+const DEFAULT_PRE_SKIP = 312; // libopus encoder lookahead at 48 kHz
+const PACKETS_PER_PAGE = 50; // about one second of 20 ms packets
+
+const CRC_TABLE = (() => {
+  const table = new Uint32Array(256);
+  for (let i = 0; i < 256; i++) {
+    let crc = i << 24;
+    for (let bit = 0; bit < 8; bit++) {
+      crc = crc & 0x80000000 ? (crc << 1) ^ 0x04c11db7 : crc << 1;
+    }
+    table[i] = crc >>> 0;
+  }
+  return table;
+})();
+
+const oggCrc = (data: Uint8Array): number => {
+  let crc = 0;
+  for (let i = 0; i < data.length; i++) {
+    crc = ((crc << 8) ^ CRC_TABLE[((crc >>> 24) ^ data[i]) & 0xff]) >>> 0;
+  }
+  return crc;
+};
+
+class OggWriter {
+  private pages: Uint8Array[] = [];
+  private sequence = 0;
+  private serial = (Math.random() * 0xffffffff) >>> 0;
+
+  writePage(packets: Uint8Array[], granule: number, flags: number) {
+    const lacing: number[] = [];
+    packets.forEach((packet) => {
+      let remaining = packet.length;
+      while (remaining >= 255) {
+        lacing.push(255);
+        remaining -= 255;
+      }
+      lacing.push(remaining);
+    });
+    const bodyLength = packets.reduce((sum, packet) => sum + packet.length, 0);
+    const page = new Uint8Array(27 + lacing.length + bodyLength);
+    const view = new DataView(page.buffer);
+
+    page.set([0x4f, 0x67, 0x67, 0x53]); // "OggS"
+    view.setUint8(4, 0); // version
+    view.setUint8(5, flags);
+    view.setUint32(6, granule % 0x100000000, true);
+    view.setUint32(10, Math.floor(granule / 0x100000000), true);
+    view.setUint32(14, this.serial, true);
+    view.setUint32(18, this.sequence++, true);
+    view.setUint8(26, lacing.length);
+    page.set(lacing, 27);
+    let offset = 27 + lacing.length;
+    packets.forEach((packet) => {
+      page.set(packet, offset);
+      offset += packet.length;
+    });
+    view.setUint32(22, oggCrc(page), true); // computed with the CRC field still zero
+    this.pages.push(page);
+  }
+
+  toArrayBuffer(): ArrayBuffer {
+    const total = this.pages.reduce((sum, page) => sum + page.length, 0);
+    const out = new Uint8Array(total);
+    let offset = 0;
+    this.pages.forEach((page) => {
+      out.set(page, offset);
+      offset += page.length;
+    });
+    return out.buffer;
+  }
+}
+
+const opusHead = (sampleRate: number, preSkip: number): Uint8Array => {
+  const head = new Uint8Array(19);
+  const view = new DataView(head.buffer);
+  head.set(Array.from('OpusHead', (c) => c.charCodeAt(0)));
+  view.setUint8(8, 1); // version
+  view.setUint8(9, 1); // channels
+  view.setUint16(10, preSkip, true);
+  view.setUint32(12, sampleRate, true); // original input rate, informational
+  view.setInt16(16, 0, true); // output gain
+  view.setUint8(18, 0); // channel mapping family
+  return head;
+};
+
+const opusTags = (): Uint8Array => {
+  const vendor = Array.from('speechtotext', (c) => c.charCodeAt(0));
+  const tags = new Uint8Array(8 + 4 + vendor.length + 4);
+  const view = new DataView(tags.buffer);
+  tags.set(Array.from('OpusTags', (c) => c.charCodeAt(0)));
+  view.setUint32(8, vendor.length, true);
+  tags.set(vendor, 12);
+  view.setUint32(12 + vendor.length, 0, true); // no user comments
+  return tags;
+};
+
+const opusConfig = (sampleRate: number, bitrate: number) => ({
+  codec: 'opus',
+  sampleRate,
+  numberOfChannels: 1,
+  bitrate,
+});
+
+const canEncodeOpus = async (sampleRate: number, bitrate: number): Promise<boolean> => {
+  if (typeof ctx.AudioEncoder === 'undefined' || typeof ctx.AudioData === 'undefined') {
+    return false;
+  }
+  try {
+    const support = await ctx.AudioEncoder.isConfigSupported(opusConfig(sampleRate, bitrate));
+    return Boolean(support.supported);
+  } catch {
+    return false;
+  }
+};
+
+const encodeOpus = async (samples: Float32Array, sampleRate: number, bitrate: number): Promise<ArrayBuffer> => {
+  const packets: Uint8Array[] = [];
+  const durations: number[] = [];
+  let preSkip = DEFAULT_PRE_SKIP;
+  let failure: Error | null = null;
+
+  const encoder = new ctx.AudioEncoder({
+    output: (chunk: any, metadata: any) => {
+      const packet = new Uint8Array(chunk.byteLength);
+      chunk.copyTo(packet);
+      packets.push(packet);
+      durations.push(Math.round(((chunk.duration || 20000) * OPUS_GRANULE_RATE) / 1e6));
+      const description = metadata?.decoderConfig?.description;
+      if (description && description.byteLength >= 19) {
+        // Some encoders report their own OpusHead; trust its pre-skip
+        const head = ArrayBuffer.isView(description)
+          ? new DataView(description.buffer, description.byteOffset, description.byteLength)
+          : new DataView(description);
+        if (head.getUint32(0) === 0x4f707573) { // "Opus"
+          preSkip = head.getUint16(10, true);
+        }
+      }
+    },
+    error: (error: Error) => {
+      failure = error;
+    },
+  });
+  encoder.configure(opusConfig(sampleRate, bitrate));
+
+  for (let offset = 0; offset < samples.length && !failure; offset += sampleRate) {
+    const frame = samples.subarray(offset, Math.min(samples.length, offset + sampleRate));
+    const data = new ctx.AudioData({
+      format: 'f32-planar',
+      sampleRate,
+      numberOfFrames: frame.length,
+      numberOfChannels: 1,
+      timestamp: Math.round((offset * 1e6) / sampleRate),
+      data: frame,
+    });
+    encoder.encode(data);
+    data.close();
+    // Bound the queue so a long file isn't copied into the encoder all at once
+    while (encoder.encodeQueueSize > 8) {
+      await new Promise((resolve) => setTimeout(resolve, 1));
+    }
+    post({ type: 'progress', value: offset / samples.length });
+  }
+  await encoder.flush();
+  encoder.close();
+  if (failure) {
+    throw failure;
+  }
+
+  const ogg = new OggWriter();
+  ogg.writePage([opusHead(sampleRate, preSkip)], 0, 0x02); // beginning of stream
+  ogg.writePage([opusTags()], 0, 0);
+  // The last page's granule trims the encoder's padding back to the input length
+  const finalGranule = preSkip + Math.round((samples.length * OPUS_GRANULE_RATE) / sampleRate);
+  if (packets.length === 0) {
+    ogg.writePage([], finalGranule, 0x04);
+  }
+  let granule = 0;
+  for (let first = 0; first < packets.length; first += PACKETS_PER_PAGE) {
+    const page = packets.slice(first, first + PACKETS_PER_PAGE);
+    granule += durations.slice(first, first + PACKETS_PER_PAGE).reduce((sum, value) => sum + value, 0);
+    const last = first + PACKETS_PER_PAGE >= packets.length;
+    ogg.writePage(page, last ? Math.min(granule, finalGranule) : granule, last ? 0x04 : 0);
+  }
+  return ogg.toArrayBuffer();
+};
+
+ctx.onmessage = async (event: MessageEvent<EncodeRequest>) => {
+  const { samples, sampleRate, bitrate, preferOpus } = event.data;
+  try {
+    let data: ArrayBuffer;
+    let format: PreprocessFormat;
+    let mimeType: string;
+    if (preferOpus && (await canEncodeOpus(sampleRate, bitrate))) {
+      data = await encodeOpus(samples, sampleRate, bitrate);
+      format = 'opus16k';
+      mimeType = 'audio/ogg';
+    } else {
+      data = encodeWav(samples, sampleRate);
+      format = 'wav16k';
+      mimeType = 'audio/wav';
+    }
+    post({ type: 'progress', value: 1 });
+    post({ type: 'done', data, format, mimeType }, [data]);
+  } catch (error: any) {
+    post({ type: 'error', message: error?.message || String(error) });
+  }
+};
+
+export {};
@@ -0,0 +1,120 @@
+// frontend/src/services/audioPreprocess.ts
+// Opt-in browser pipeline: decode, resample to 16 kHz, downmix to mono and
+// compress before upload. Whisper resamples everything to 16 kHz mono anyway,
+// so this only drops bytes the server would throw away.
+
+export const TARGET_SAMPLE_RATE = 16000;
+export const OPUS_BITRATE = 24000;
+
+// Values of the backend's settings.CLIENT_PREPROCESSING
+export type PreprocessFormat = 'opus16k' | 'wav16k';
+
+export type PreprocessStage = 'decoding' | 'encoding';
+
+export interface PreprocessResult {
+  file: File;
+  format: PreprocessFormat;
+  duration: number;
+  originalBytes: number;
+  bytes: number;
+}
+
+// Messages exchanged with audioEncoder.worker.ts
+export interface EncodeRequest {
+  samples: Float32Array;
+  sampleRate: number;
+  bitrate: number;
+  preferOpus: boolean;
+}
+
+export type EncodeMessage =
+  | { type: 'progress'; value: number }
+  | { type: 'done'; data: ArrayBuffer; format: PreprocessFormat; mimeType: string }
+  | { type: 'error'; message: string };
+
+export const isPreprocessingSupported = (): boolean =>
+  typeof window !== 'undefined' &&
+  typeof window.OfflineAudioContext !== 'undefined' &&
+  typeof window.Worker !== 'undefined';
+
+const decodeToMono = async (file: File): Promise<Float32Array> => {
+  // Decoding through a 16 kHz context makes the browser resample during decode,
+  // so the original-rate PCM (6x larger for 48 kHz stereo) is never materialized
+  const context = new OfflineAudioContext(1, 1, TARGET_SAMPLE_RATE);
+  const decoded = await context.decodeAudioData(await file.arrayBuffer());
+
+  const mono = new Float32Array(decoded.length);
+  const channels = decoded.numberOfChannels;
+  for (let channel = 0; channel < channels; channel++) {
+    const data = decoded.getChannelData(channel);
+    for (let i = 0; i < data.length; i++) {
+      mono[i] += data[i] / channels;
+    }
+  }
+  return mono;
+};
+
+const encodeInWorker = (
+  samples: Float32Array,
+  onProgress?: (value: number) => void
+): Promise<Extract<EncodeMessage, { type: 'done' }>> =>
+  new Promise((resolve, reject) => {
+    const worker = new Worker(new URL('./audioEncoder.worker.ts', import.meta.url));
+    worker.onmessage = (event: MessageEvent<EncodeMessage>) => {
+      const message = event.data;
+      if (message.type === 'progress') {
+        onProgress?.(message.value);
+        return;
+      }
+      worker.terminate();
+      if (message.type === 'done') {
+        resolve(message);
+      } else {
+        reject(new Error(message.message));
+      }
+    };
+    worker.onerror = (event) => {
+      worker.terminate();
+      reject(new Error(event.message || 'Audio encoder failed'));
+    };
+    const request: EncodeRequest = {
+      samples,
+      sampleRate: TARGET_SAMPLE_RATE,
+      bitrate: OPUS_BITRATE,
+      preferOpus: true,
+    };
+    worker.postMessage(request, [samples.buffer]);
+  });
+
+/**
+ * Compressed 16 kHz mono copy of an audio or video file, or null when the
+ * browser can't decode it or the result wouldn't be smaller than the original.
+ */
+export const preprocessAudio = async (
+  file: File,
+  onProgress?: (stage: PreprocessStage, value: number) => void
+): Promise<PreprocessResult | null> => {
+  if (!isPreprocessingSupported()) {
+    return null;
+  }
+
+  onProgress?.('decoding', 0);
+  const samples = await decodeToMono(file);
+  const duration = samples.length / TARGET_SAMPLE_RATE;
+  onProgress?.('decoding', 1);
+
+  const encoded = await encodeInWorker(samples, (value) => onProgress?.('encoding', value));
+  if (encoded.data.byteLength >= file.size) {
+    return null;
+  }
+
+  const extension = encoded.format === 'opus16k' ? 'ogg' : 'wav';
+  const baseName = file.name.replace(/\.[^.]*$/, '') || 'audio';
+  return {
+    file: new File([encoded.data], `${baseName}.${extension}`, { type: encoded.mimeType }),
+    format: encoded.format,
+    duration,
+    originalBytes: file.size,
+    bytes: encoded.data.byteLength,
+  };
+};
@@ -2,6 +2,9 @@
 export interface TranscriptionResponse {
   id: number;
   status: 'pending' | 'processing' | 'completed' | 'failed';
+  // Status polls carry only the start of the transcript; fetch the rest with getText
+  text_preview?: string | null;
+  text_length?: number | null;
   text?: string;
   error?: string;
 }
@@ -9,4 +12,6 @@ export interface TranscriptionResponse {
 export interface UploadResponse {
   id: number;
   message: string;
+  file_size?: number;
+  preprocessing?: string | null;
 }
\ No newline at end of file